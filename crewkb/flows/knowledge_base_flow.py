@@ -22,6 +22,18 @@ from crewkb.crews.review_crew import ReviewCrew
 from crewkb.models.article import Article
 from crewkb.storage.storage_manager import StorageManager
 from crewkb.utils.metrics_collector import MetricsCollector
+from crewkb.utils.section_index import get_section_indexer
+
+# Article sections and the words that introduce them, in the order they are checked
+ARTICLE_SECTION_MARKERS = {
+    "overview": ["overview", "introduction"],
+    "causes": ["causes", "etiology"],
+    "symptoms": ["symptoms", "signs"],
+    "diagnosis": ["diagnosis", "testing"],
+    "treatment": ["treatment", "management"],
+    "prevention": ["prevention"],
+    "prognosis": ["prognosis", "outlook"]
+}
 
 
 class ArticleState(BaseModel):
@@ -438,57 +450,10 @@ class KnowledgeBaseFlow(Flow[ArticleState]):
         prevention = Prevention(content="")
         prognosis = Prognosis(content="")
         
-        # Parse content by looking for section headers
-        lines = content.split("\n")
-        current_section = None
-        section_content = []
-        
-        for line in lines:
-            # Check for section headers
-            lower_line = line.lower()
-            if "overview" in lower_line or "introduction" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "overview"
-                section_content = []
-            elif "causes" in lower_line or "etiology" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "causes"
-                section_content = []
-            elif "symptoms" in lower_line or "signs" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "symptoms"
-                section_content = []
-            elif "diagnosis" in lower_line or "testing" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "diagnosis"
-                section_content = []
-            elif "treatment" in lower_line or "management" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "treatment"
-                section_content = []
-            elif "prevention" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "prevention"
-                section_content = []
-            elif "prognosis" in lower_line or "outlook" in lower_line:
-                if current_section:
-                    self._set_section_content(current_section, section_content)
-                current_section = "prognosis"
-                section_content = []
-            else:
-                # Add line to current section
-                if current_section:
-                    section_content.append(line)
-        
-        # Set content for the last section
-        if current_section:
-            self._set_section_content(current_section, section_content)
+        # Parse content by looking for lines that mention a section
+        indexer = get_section_indexer(ARTICLE_SECTION_MARKERS, heading_pattern=None)
+        for span in indexer.index(content):
+            self._set_section_content(span.name, content[span.body_start:span.end])
         
         # Create article with parsed sections
         article = Article(
@@ -511,22 +476,22 @@ class KnowledgeBaseFlow(Flow[ArticleState]):
         
         return article
     
-    def _set_section_content(self, section_name: str, lines: List[str]):
+    def _set_section_content(self, section_name: str, content: str):
         """Set content for a specific section."""
         if section_name == "overview":
-            self.overview = "\n".join(lines)
+            self.overview = content
         elif section_name == "causes":
-            self.causes = "\n".join(lines)
+            self.causes = content
         elif section_name == "symptoms":
-            self.symptoms = "\n".join(lines)
+            self.symptoms = content
         elif section_name == "diagnosis":
-            self.diagnosis = "\n".join(lines)
+            self.diagnosis = content
         elif section_name == "treatment":
-            self.treatment = "\n".join(lines)
+            self.treatment = content
         elif section_name == "prevention":
-            self.prevention = "\n".join(lines)
+            self.prevention = content
         elif section_name == "prognosis":
-            self.prognosis = "\n".join(lines)
+            self.prognosis = content
 
 
 def kickoff():
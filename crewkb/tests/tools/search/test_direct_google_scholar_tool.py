@@ -99,41 +99,45 @@ class TestDirectGoogleScholarTool(unittest.TestCase):
             
         self.assertEqual(result, "test result")
 
-    @patch("crewkb.tools.search.direct_google_scholar_tool.AsyncWebCrawler")
-    @patch("crewkb.tools.search.direct_google_scholar_tool.BeautifulSoup")
+    @patch("crewkb.tools.search.direct_google_scholar_tool.get_browser_pool")
     @patch.object(DirectGoogleScholarTool, "_check_cache")
     @patch.object(DirectGoogleScholarTool, "_cache_result")
     @patch.object(DirectGoogleScholarTool, "_save_results_to_file")
     def test_async_run_with_successful_extraction(
-        self, mock_save, mock_cache, mock_check_cache, mock_bs, mock_crawler_class
+        self, mock_save, mock_cache, mock_check_cache, mock_get_pool
     ):
         """Test _async_run method with successful extraction."""
         # Configure the mocks
         mock_check_cache.return_value = None  # No cached result
-        mock_crawler = AsyncMock()
-        mock_crawler_class.return_value.__aenter__.return_value = mock_crawler
-        mock_crawler.arun.return_value = self.mock_result
+        mock_pool = AsyncMock()
+        mock_get_pool.return_value = mock_pool
+        mock_pool.arun.return_value = self.mock_result
 
         # Mock the extraction methods
-        self.tool._extract_pdf_links = AsyncMock(return_value=[
+        self.tool._extract_pdf_links = MagicMock(return_value=[
             {"pdfUrl": "https://example.com/article1.pdf"},
             {"pdfUrl": "https://example.com/article2.pdf"}
         ])
-        self.tool._extract_related_searches = AsyncMock(return_value=[
+        self.tool._extract_related_searches = MagicMock(return_value=[
             "AI in healthcare", "AI ethics"
         ])
-        self.tool._extract_pagination_info = AsyncMock(return_value={
+        self.tool._extract_pagination_info = MagicMock(return_value={
             "current_page": 0,
             "next_page_url": "https://scholar.google.com/scholar?start=10",
             "total_pages": 10
         })
-        self.tool._extract_total_results_count = AsyncMock(return_value="About 1,000,000 results")
+        self.tool._extract_total_results_count = MagicMock(return_value="About 1,000,000 results")
 
         # Call the method
         result = asyncio.run(self.tool._async_run("AI", None, False, 10, 0, 1.0, 3, True, False))
 
         # Verify the crawler was called with the correct URL
-        mock_crawler.arun.assert_called()
+        mock_pool.arun.assert_called()
+
+        # Verify a user agent is drawn for every request on the warm browsers
+        run_config = mock_pool.arun.call_args.kwargs["config"]
+        self.assertEqual(run_config.user_agent_mode, "random")
+        self.assertTrue(run_config.magic)
 
         # Verify the extraction methods were called
         self.tool._extract_pdf_links.assert_called_once()
@@ -148,6 +152,52 @@ class TestDirectGoogleScholarTool(unittest.TestCase):
         self.assertIn("related_searches", result_obj)
         self.assertIn("pagination", result_obj)
 
+    @patch("crewkb.tools.search.direct_google_scholar_tool.get_browser_pool")
+    @patch.object(DirectGoogleScholarTool, "_check_cache")
+    @patch.object(DirectGoogleScholarTool, "_cache_result")
+    def test_async_run_fetches_page_once(
+        self, mock_cache, mock_check_cache, mock_get_pool
+    ):
+        """Test that every extraction runs against a single page fetch."""
+        # Configure the mocks
+        mock_check_cache.return_value = None  # No cached result
+        mock_pool = AsyncMock()
+        mock_get_pool.return_value = mock_pool
+        self.mock_result.html = (
+            "<html><body>"
+            "<div id='gs_ab_md'>About 1,000 results</div>"
+            "<div class='gs_or_ggsm'>"
+            "<a href='https://example.com/article1.pdf'>[PDF] example.com</a>"
+            "</div>"
+            "<div class='gs_qsuggest_wrap'><a>AI in healthcare</a></div>"
+            "<div id='gs_n'><a href='/scholar?start=10'>2</a>"
+            "<a href='/scholar?start=20'>3</a></div>"
+            "</body></html>"
+        )
+        mock_pool.arun.return_value = self.mock_result
+
+        # Call the method
+        result = asyncio.run(
+            self.tool._async_run("AI", None, False, 10, 0, 0.0, 3, True, False)
+        )
+
+        # Verify the page was fetched exactly once for the query
+        self.assertEqual(mock_pool.arun.call_count, 1)
+
+        # Verify every extraction was served from that snapshot
+        result_obj = json.loads(result)
+        self.assertEqual(result_obj["total_results_count"], "About 1,000 results")
+        self.assertEqual(result_obj["related_searches"], ["AI in healthcare"])
+        self.assertEqual(result_obj["pagination"]["total_pages"], 3)
+        self.assertEqual(
+            result_obj["pagination"]["next_page_url"],
+            "https://scholar.google.com/scholar?start=10"
+        )
+        self.assertEqual(
+            result_obj["results"][0]["pdfUrl"],
+            "https://example.com/article1.pdf"
+        )
+
     def test_build_google_scholar_url(self):
         """Test _build_google_scholar_url method."""
         # Test with basic query
@@ -77,6 +77,37 @@ class TestSerperGoogleScholarTool(unittest.TestCase):
         self.assertIn("2023", result)
         self.assertIn("Cited by: 42", result)
     
+    @patch.dict(os.environ, {"SERPER_API_KEY": "test_api_key"})
+    @patch("requests.request")
+    def test_search_papers_returns_structured_results(self, mock_request):
+        """Test search_papers method with a valid API response."""
+        # Configure the mock
+        mock_response = MagicMock()
+        mock_response.json.return_value = self.sample_response
+        mock_response.raise_for_status.return_value = None
+        mock_request.return_value = mock_response
+        
+        # Call the method
+        papers = self.tool.search_papers("ChatGPT", 2)
+        
+        # Check the fields use PaperSource's names and types
+        self.assertEqual(len(papers), 2)
+        self.assertEqual(papers[0]["title"], "Role of ChatGPT in public health")
+        self.assertEqual(papers[0]["authors"], ["A Smith", "B Jones", "C Wilson"])
+        self.assertEqual(papers[0]["year"], 2023)
+        self.assertEqual(papers[0]["journal"], "Journal of Medical Systems")
+        self.assertEqual(papers[0]["citation_count"], 42)
+        self.assertEqual(
+            papers[0]["url"],
+            "https://link.springer.com/article/10.1007/s10439-023-03172-7"
+        )
+    
+    def test_search_papers_without_api_key(self):
+        """Test search_papers method without an API key."""
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(RuntimeError):
+                self.tool.search_papers("ChatGPT", 2)
+    
     def test_run_without_api_key(self):
         """Test _run method without an API key."""
         # Temporarily remove API key from environment
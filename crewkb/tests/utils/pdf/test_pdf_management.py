@@ -6,17 +6,81 @@ classes.
 """
 
 import os
+import re
+import json
+import time
 import asyncio
+import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from pathlib import Path
 
 import pytest
+from aiohttp import web
+from PIL import Image as PILImage
+from aiohttp.test_utils import TestServer
 
-from crewkb.utils.pdf import PDFDownloadManager, MarkerWrapper, PDFProcessor
+from crewkb.utils.pdf import PDFDownloadManager, MarkerWrapper, PDFProcessor, PDFParsePool, PDFBlobStore, ImageHandle
+from crewkb.utils.pdf import marker_wrapper as marker_wrapper_module
+from crewkb.utils.pdf import parse_pool as parse_pool_module
+from crewkb.utils.pdf import text_layer
+from crewkb.utils.pdf.pdf_processor import SECTIONS_CACHE_VERSION
+from crewkb.utils.pdf.failure_ledger import FailureLedger
+from crewkb.utils.pdf import download_priority
+from crewkb.utils.pdf.download_priority import PrioritySemaphore, get_paper_priority
+from crewkb.utils.search.retry import RetryStrategy
 from crewkb.models.knowledge.paper import PaperSource
 
 
+def make_text_pdf(path, pages):
+    """
+    Write a minimal PDF with a text layer.
+    
+    Args:
+        path: The path to write the PDF to.
+        pages: A list of pages, each a list of text lines.
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for lines in pages:
+        commands = ["BT", "/F1 10 Tf", "12 TL", "50 780 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            commands.append(f"({escaped}) Tj T*")
+        commands.append("ET")
+        stream = "\n".join(commands)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {len(objects)} 0 R >>"
+        )
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>"
+    
+    body = b"%PDF-1.4\n"
+    offsets = []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(body))
+        body += f"{number} 0 obj\n{obj}\nendobj\n".encode("latin-1")
+    xref = len(body)
+    body += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        body += f"{offset:010d} 00000 n \n".encode()
+    body += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode()
+    
+    with open(path, "wb") as f:
+        f.write(body)
+
+
+PAPER_PAGES = [
+    ["Abstract", "We study glucose control in adults with type 2 diabetes. " * 2]
+    + ["1 Introduction"] + ["Diabetes is a chronic metabolic disease affecting many adults."] * 20,
+    ["2 Methods"] + ["Participants were randomized to treatment or placebo for twelve weeks."] * 20,
+    ["3 Results"] + ["HbA1c fell by a mean of 0.8 percentage points in the treatment arm."] * 20
+    + ["REFERENCES", "Smith J. Diabetes care. 2020."],
+]
+
+
 class TestPDFDownloadManager(unittest.TestCase):
     """Tests for the PDFDownloadManager class."""
     
@@ -47,7 +111,7 @@ class TestPDFDownloadManager(unittest.TestCase):
         # Mock the context manager
         mock_context = MagicMock()
         mock_context.__aenter__.return_value = mock_response
-        mock_session.return_value.__aenter__.return_value.get.return_value = mock_context
+        mock_session.return_value.get.return_value = mock_context
         
         # Download the PDF
         pdf_url = "https://example.com/test.pdf"
@@ -74,7 +138,7 @@ class TestPDFDownloadManager(unittest.TestCase):
         # Mock the context manager
         mock_context = MagicMock()
         mock_context.__aenter__.return_value = mock_response
-        mock_session.return_value.__aenter__.return_value.get.return_value = mock_context
+        mock_session.return_value.get.return_value = mock_context
         
         # Download the PDFs
         pdf_urls = [
@@ -95,6 +159,606 @@ class TestPDFDownloadManager(unittest.TestCase):
             self.assertEqual(content, b"PDF content")
 
 
+class TestPDFDownloadManagerStreaming(unittest.IsolatedAsyncioTestCase):
+    """Tests for streaming PDF downloads against a local HTTP server."""
+    
+    PDF_BODY = b"%PDF-1.4\n" + b"0" * 200_000
+    
+    async def asyncSetUp(self):
+        """Start a local server and create a download manager."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.temp_dir.name, "cache")
+        self.download_manager = PDFDownloadManager(
+            cache_dir=self.cache_dir,
+            retry_strategy=RetryStrategy(max_retries=0),
+            max_file_size=1024 * 1024,
+            chunk_size=8 * 1024
+        )
+        
+        async def paper(request):
+            return web.Response(body=self.PDF_BODY, content_type="application/pdf")
+        
+        async def not_a_pdf(request):
+            return web.Response(body=b"<html>Access denied</html>", content_type="application/pdf")
+        
+        async def huge(request):
+            # No Content-Length, so the cap must be enforced while streaming
+            response = web.StreamResponse(headers={"Content-Type": "application/pdf"})
+            await response.prepare(request)
+            await response.write(b"%PDF-1.4\n")
+            for _ in range(32):
+                await response.write(b"0" * 64 * 1024)
+            return response
+        
+        async def truncated(request):
+            response = web.StreamResponse(headers={
+                "Content-Type": "application/pdf",
+                "Content-Length": str(len(self.PDF_BODY))
+            })
+            await response.prepare(request)
+            await response.write(self.PDF_BODY[:50_000])
+            request.transport.close()
+            return response
+        
+        self.gone_requests = 0
+        self.gone_restored = False
+        
+        async def gone(request):
+            self.gone_requests += 1
+            if self.gone_restored:
+                return web.Response(body=self.PDF_BODY, content_type="application/pdf")
+            return web.Response(status=404)
+        
+        self.ranked_requests = []
+        
+        async def ranked(request):
+            self.ranked_requests.append(request.match_info["name"])
+            await asyncio.sleep(0.05)
+            return web.Response(
+                body=self.PDF_BODY + request.match_info["name"].encode(),
+                content_type="application/pdf"
+            )
+        
+        app = web.Application()
+        app.router.add_get("/paper.pdf", paper)
+        app.router.add_get("/ranked/{name}.pdf", ranked)
+        app.router.add_get("/gone.pdf", gone)
+        app.router.add_get("/mirror/paper.pdf", paper)
+        app.router.add_get("/not-a-pdf.pdf", not_a_pdf)
+        app.router.add_get("/huge.pdf", huge)
+        app.router.add_get("/truncated.pdf", truncated)
+        
+        self.server = TestServer(app)
+        await self.server.start_server()
+    
+    async def asyncTearDown(self):
+        """Stop the server and remove the cache."""
+        await self.download_manager.close()
+        await self.server.close()
+        self.temp_dir.cleanup()
+    
+    def _cache_files(self):
+        """List the files in the download cache's blob store."""
+        return sorted(
+            name
+            for _, _, names in os.walk(os.path.join(self.cache_dir, "blobs"))
+            for name in names
+        )
+    
+    async def test_streams_pdf_into_cache(self):
+        """Test that a PDF is streamed to disk and committed to the cache."""
+        pdf_path = await self.download_manager.download(
+            str(self.server.make_url("/paper.pdf"))
+        )
+        
+        self.assertIsNotNone(pdf_path)
+        with open(pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.PDF_BODY)
+        
+        # No temporary files are left behind
+        self.assertEqual(len(self._cache_files()), 1)
+        self.assertFalse(self._cache_files()[0].endswith(".part"))
+    
+    async def test_rejects_non_pdf_body(self):
+        """Test that a body without the PDF magic bytes is not cached."""
+        url = str(self.server.make_url("/not-a-pdf.pdf"))
+        
+        self.assertIsNone(await self.download_manager.download(url))
+        self.assertEqual(self._cache_files(), [])
+        self.assertIn(url, self.download_manager.get_failed_downloads())
+    
+    async def test_failed_url_is_skipped_across_runs(self):
+        """Test that a failed URL is skipped by a new manager until it is retried."""
+        url = str(self.server.make_url("/gone.pdf"))
+        self.assertIsNone(await self.download_manager.download(url))
+        
+        # A new run reads the ledger and does not contact the server again
+        download_manager = PDFDownloadManager(
+            cache_dir=self.cache_dir,
+            retry_strategy=RetryStrategy(max_retries=0)
+        )
+        self.addAsyncCleanup(download_manager.close)
+        
+        self.assertIsNone(await download_manager.download(url))
+        self.assertEqual(self.gone_requests, 1)
+        entry = download_manager.failures.get(url)
+        self.assertEqual(entry["attempts"], 1)
+        self.assertIn("404", entry["reason"])
+        
+        # Entries within their backoff window are only retried on request
+        self.assertEqual(await download_manager.retry_failed(), {})
+        
+        self.gone_restored = True
+        results = await download_manager.retry_failed(due_only=False)
+        
+        self.assertIsNotNone(results[url])
+        self.assertEqual(self.gone_requests, 2)
+        self.assertNotIn(url, download_manager.failures)
+    
+    async def test_downloads_valuable_papers_first_within_budget(self):
+        """Test that papers are downloaded by priority and the budget cancels queued ones."""
+        download_manager = PDFDownloadManager(
+            cache_dir=self.cache_dir,
+            max_concurrent_downloads=1,
+            retry_strategy=RetryStrategy(max_retries=0)
+        )
+        self.addAsyncCleanup(download_manager.close)
+        
+        def make_paper(name, **fields):
+            return PaperSource(
+                title=fields.pop("title", name),
+                pdf_url=str(self.server.make_url(f"/ranked/{name}.pdf")),
+                source_tool="test_tool",
+                search_term="test search",
+                **fields
+            )
+        
+        papers = [
+            make_paper("obscure", citation_count=2),
+            make_paper("review", title="A systematic review of biomarkers", citation_count=40),
+            make_paper("cited", citation_count=500),
+            make_paper("middling", citation_count=60),
+        ]
+        
+        results = await download_manager.download_papers(papers, max_downloads=3)
+        
+        self.assertEqual(self.ranked_requests, ["cited", "review", "middling"])
+        self.assertIsNone(results[papers[0].id])
+        self.assertTrue(all(results[paper.id] for paper in papers[1:]))
+        self.assertEqual(download_manager.get_cancelled_downloads(), {papers[0].pdf_url})
+        self.assertNotIn(papers[0].pdf_url, download_manager.failures)
+    
+    async def test_concurrent_downloads_of_a_url_share_one_request(self):
+        """Test that identical concurrent downloads are coalesced into one request."""
+        url = str(self.server.make_url("/ranked/shared.pdf"))
+        output_paths = [os.path.join(self.temp_dir.name, f"copy{index}.pdf") for index in range(2)]
+        
+        paths = await asyncio.gather(
+            self.download_manager.download(url),
+            self.download_manager.download(url, output_paths[0]),
+            self.download_manager.download(url, output_paths[1])
+        )
+        
+        self.assertEqual(self.ranked_requests, ["shared"])
+        self.assertEqual(paths[1:], output_paths)
+        for path in paths:
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), self.PDF_BODY + b"shared")
+        self.assertEqual(self.download_manager._in_flight, {})
+    
+    async def test_enforces_max_file_size(self):
+        """Test that a download is aborted once it exceeds the size limit."""
+        url = str(self.server.make_url("/huge.pdf"))
+        
+        self.assertIsNone(await self.download_manager.download(url))
+        self.assertEqual(self._cache_files(), [])
+    
+    async def test_interrupted_download_is_not_cached(self):
+        """Test that a connection dropped mid-body leaves no cached file."""
+        url = str(self.server.make_url("/truncated.pdf"))
+        
+        self.assertIsNone(await self.download_manager.download(url))
+        self.assertEqual(self._cache_files(), [])
+        # Without a validator the partial download cannot be resumed safely
+        self.assertEqual(os.listdir(self.download_manager.partial_dir), [])
+    
+    async def _start_flaky_server(self, etag='"v1"', accept_ranges=True):
+        """
+        Start a server that drops the first connection halfway through the body.
+        
+        Args:
+            etag: The ETag the server sends with the PDF.
+            accept_ranges: Whether the server honours Range requests.
+            
+        Returns:
+            A tuple containing the server and the list of received request headers.
+        """
+        requests = []
+        
+        async def flaky(request):
+            requests.append(dict(request.headers))
+            headers = {"Content-Type": "application/pdf", "ETag": etag}
+            if accept_ranges:
+                headers["Accept-Ranges"] = "bytes"
+            
+            range_header = request.headers.get("Range")
+            if accept_ranges and range_header and request.headers.get("If-Range") == etag:
+                start = int(range_header[len("bytes="):-1])
+                headers["Content-Range"] = f"bytes {start}-{len(self.PDF_BODY) - 1}/{len(self.PDF_BODY)}"
+                return web.Response(status=206, body=self.PDF_BODY[start:], headers=headers)
+            
+            if len(requests) > 1:
+                return web.Response(body=self.PDF_BODY, headers=headers)
+            
+            headers["Content-Length"] = str(len(self.PDF_BODY))
+            response = web.StreamResponse(headers=headers)
+            await response.prepare(request)
+            await response.write(self.PDF_BODY[:100_000])
+            # Give the client time to read what was sent before the drop
+            await asyncio.sleep(0.2)
+            request.transport.close()
+            return response
+        
+        app = web.Application()
+        app.router.add_get("/flaky.pdf", flaky)
+        server = TestServer(app)
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        
+        self.download_manager.retry_strategy = RetryStrategy(max_retries=1, max_backoff=0.01)
+        return server, requests
+    
+    async def test_resumes_interrupted_download(self):
+        """Test that a retry resumes a dropped download with a Range request."""
+        server, requests = await self._start_flaky_server()
+        
+        pdf_path = await self.download_manager.download(str(server.make_url("/flaky.pdf")))
+        
+        self.assertIsNotNone(pdf_path)
+        with open(pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.PDF_BODY)
+        self.assertEqual(len(requests), 2)
+        self.assertEqual(requests[1]["Range"], "bytes=100000-")
+        self.assertEqual(requests[1]["If-Range"], '"v1"')
+        self.assertEqual(os.listdir(self.download_manager.partial_dir), [])
+    
+    async def test_falls_back_to_full_fetch_without_range_support(self):
+        """Test that a server that ignores Range requests gets a full refetch."""
+        server, requests = await self._start_flaky_server(accept_ranges=False)
+        
+        pdf_path = await self.download_manager.download(str(server.make_url("/flaky.pdf")))
+        
+        self.assertIsNotNone(pdf_path)
+        with open(pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.PDF_BODY)
+        self.assertNotIn("Range", requests[1])
+    
+    async def test_weak_etag_is_not_used_to_resume(self):
+        """Test that a partial download with only a weak ETag is refetched in full."""
+        server, requests = await self._start_flaky_server(etag='W/"v1"')
+        
+        pdf_path = await self.download_manager.download(str(server.make_url("/flaky.pdf")))
+        
+        self.assertIsNotNone(pdf_path)
+        with open(pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.PDF_BODY)
+        self.assertNotIn("Range", requests[1])
+    
+    async def test_identical_pdfs_are_stored_once(self):
+        """Test that the same PDF reached through two URLs is stored once."""
+        first = await self.download_manager.download(str(self.server.make_url("/paper.pdf")))
+        second = await self.download_manager.download(
+            str(self.server.make_url("/mirror/paper.pdf"))
+        )
+        
+        self.assertEqual(first, second)
+        self.assertEqual(len(self._cache_files()), 1)
+        
+        stats = self.download_manager.get_dedup_stats()
+        self.assertEqual(stats["urls"], 2)
+        self.assertEqual(stats["blobs"], 1)
+        self.assertEqual(stats["dedup_ratio"], 2.0)
+        self.assertEqual(stats["bytes_saved"], len(self.PDF_BODY))
+    
+    async def test_output_path_is_hardlinked(self):
+        """Test that output paths are hardlinks to the cached blob."""
+        url = str(self.server.make_url("/paper.pdf"))
+        output_dir = os.path.join(self.temp_dir.name, "out")
+        
+        first = await self.download_manager.download(url, os.path.join(output_dir, "a.pdf"))
+        # The second request is served from the cache
+        second = await self.download_manager.download(url, os.path.join(output_dir, "b.pdf"))
+        blob = await self.download_manager.download(url)
+        
+        self.assertTrue(os.path.samefile(first, blob))
+        self.assertTrue(os.path.samefile(second, blob))
+        self.assertEqual(len(self._cache_files()), 1)
+    
+    async def test_legacy_cache_is_moved_into_store(self):
+        """Test that a PDF cached under the URL-keyed layout is reused."""
+        url = "https://example.com/legacy.pdf"
+        legacy_path = self.download_manager._get_cache_path(url)
+        with open(legacy_path, "wb") as f:
+            f.write(self.PDF_BODY)
+        
+        pdf_path = await self.download_manager.download(url)
+        
+        self.assertFalse(legacy_path.exists())
+        with open(pdf_path, "rb") as f:
+            self.assertEqual(f.read(), self.PDF_BODY)
+        self.assertEqual(len(self._cache_files()), 1)
+    
+    async def test_session_is_shared_across_downloads(self):
+        """Test that downloads reuse one pooled session and its connections."""
+        await self.download_manager.download(str(self.server.make_url("/paper.pdf")))
+        session = self.download_manager._session
+        await self.download_manager.download(
+            str(self.server.make_url("/paper.pdf")) + "?v=2"
+        )
+        
+        self.assertIs(self.download_manager._session, session)
+        self.assertFalse(session.closed)
+        self.assertEqual(session.connector.limit, 100)
+        self.assertEqual(session.connector.limit_per_host, 2)
+    
+    async def test_context_manager_closes_session(self):
+        """Test that the async context manager closes the shared session."""
+        async with self.download_manager as manager:
+            await manager.download(str(self.server.make_url("/paper.pdf")))
+            session = manager._session
+        
+        self.assertTrue(session.closed)
+        self.assertIsNone(self.download_manager._session)
+    
+    async def test_limits_concurrent_downloads_per_host(self):
+        """Test that a batch never exceeds the per-host limit and spreads hosts."""
+        active = {}
+        peak = {}
+        
+        async def slow(request):
+            host = request.host
+            active[host] = active.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), active[host])
+            await asyncio.sleep(0.05)
+            active[host] -= 1
+            return web.Response(body=self.PDF_BODY, content_type="application/pdf")
+        
+        app = web.Application()
+        app.router.add_get("/{name}.pdf", slow)
+        server = TestServer(app, host="127.0.0.1")
+        await server.start_server()
+        self.addAsyncCleanup(server.close)
+        
+        manager = PDFDownloadManager(
+            cache_dir=self.cache_dir,
+            retry_strategy=RetryStrategy(max_retries=0),
+            max_concurrent_downloads=3,
+            max_downloads_per_host=1
+        )
+        self.addAsyncCleanup(manager.close)
+        
+        hosts = [f"127.0.0.1:{server.port}", f"localhost:{server.port}"]
+        urls = [f"http://{hosts[0]}/a{i}.pdf" for i in range(3)]
+        urls += [f"http://{hosts[1]}/b{i}.pdf" for i in range(3)]
+        
+        results = await manager.download_batch(urls)
+        
+        self.assertEqual(list(results), urls)
+        self.assertTrue(all(results.values()))
+        self.assertEqual(set(peak), set(hosts))
+        self.assertTrue(all(count == 1 for count in peak.values()))
+    
+    def test_interleave_by_host(self):
+        """Test that batch URLs are ordered round-robin by host."""
+        urls = [
+            "https://a.org/1.pdf",
+            "https://a.org/2.pdf",
+            "https://a.org/3.pdf",
+            "https://b.org/1.pdf",
+        ]
+        
+        self.assertEqual(
+            PDFDownloadManager._interleave_by_host(urls),
+            [
+                "https://a.org/1.pdf",
+                "https://b.org/1.pdf",
+                "https://a.org/2.pdf",
+                "https://a.org/3.pdf",
+            ]
+        )
+
+
+class TestDownloadPriority(unittest.IsolatedAsyncioTestCase):
+    """Tests for download prioritization."""
+    
+    async def test_semaphore_serves_highest_priority_first(self):
+        """Test that freed slots go to the highest-priority waiter and queued waiters can be cancelled."""
+        semaphore = PrioritySemaphore(1)
+        self.assertTrue(await semaphore.acquire())
+        
+        order = []
+        
+        async def wait(name, priority):
+            if await semaphore.acquire(priority, owner=name):
+                order.append(name)
+                await asyncio.sleep(0)
+                semaphore.release()
+            else:
+                order.append(f"{name} cancelled")
+        
+        waiters = [
+            asyncio.create_task(wait(name, priority))
+            for name, priority in [("low", 1), ("high", 3), ("mid", 2), ("lowest", 0)]
+        ]
+        await asyncio.sleep(0)
+        self.assertEqual(semaphore.waiting, 4)
+        
+        self.assertEqual(semaphore.cancel_waiting(lambda priority, owner: priority < 1), 1)
+        semaphore.release()
+        await asyncio.gather(*waiters)
+        
+        self.assertEqual(order, ["lowest cancelled", "high", "mid", "low"])
+    
+    def test_paper_priority(self):
+        """Test that reviews, citations and direct PDF links raise a paper's priority."""
+        def make_paper(**fields):
+            return PaperSource(source_tool="test_tool", search_term="test search", **fields)
+        
+        primary = make_paper(title="A cohort study", citation_count=100)
+        review = make_paper(title="Biomarkers: a review", citation_count=100)
+        open_access = make_paper(title="A cohort study", citation_count=100, pdf_url="https://a.org/1.pdf")
+        
+        self.assertTrue(download_priority.is_review(review))
+        self.assertGreater(get_paper_priority(review), get_paper_priority(primary))
+        self.assertGreater(get_paper_priority(open_access), get_paper_priority(primary))
+        self.assertGreater(
+            get_paper_priority(make_paper(title="Cited", citation_count=1000)),
+            get_paper_priority(make_paper(title="Cited", citation_count=10))
+        )
+
+
+class TestFailureLedger(unittest.TestCase):
+    """Tests for the FailureLedger class."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.path = os.path.join(self.temp_dir.name, "failures.json")
+        self.ledger = FailureLedger(self.path, base_backoff=60, backoff_factor=2, max_backoff=200)
+    
+    def test_backoff_grows_with_attempts(self):
+        """Test that each failure pushes the next attempt further out, up to the cap."""
+        for attempts, backoff in [(1, 60), (2, 120), (3, 200), (4, 200)]:
+            entry = self.ledger.record_failure("url", f"attempt {attempts}")
+            self.assertEqual(entry["attempts"], attempts)
+            self.assertAlmostEqual(entry["next_eligible"] - entry["last_failed"], backoff)
+        
+        self.assertTrue(self.ledger.is_blocked("url"))
+        self.assertFalse(self.ledger.is_blocked("url", now=entry["next_eligible"]))
+        self.assertEqual(self.ledger.keys(due_only=True), [])
+    
+    def test_entries_persist_and_merge(self):
+        """Test that entries survive a restart and concurrent writers don't drop each other's."""
+        other = FailureLedger(self.path)
+        self.ledger.record_failure("a", "timeout", {"output_path": None})
+        other.record_failure("b", "404")
+        
+        ledger = FailureLedger(self.path)
+        self.assertEqual(ledger.keys(), ["a", "b"])
+        self.assertEqual(ledger.get("a")["context"], {"output_path": None})
+        
+        ledger.record_success("a")
+        self.assertEqual(FailureLedger(self.path).keys(), ["b"])
+
+
+class TestPDFBlobStore(unittest.TestCase):
+    """Tests for the PDFBlobStore class."""
+    
+    def setUp(self):
+        """Create a store with one blob."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.store = PDFBlobStore(os.path.join(self.temp_dir.name, "store"))
+        
+        source = Path(self.temp_dir.name) / "paper.pdf"
+        source.write_bytes(b"%PDF-1.4 content")
+        self.blob = self.store.add_file(source, "https://example.com/paper.pdf")
+    
+    def test_index_is_persisted(self):
+        """Test that the URL index survives a new store instance."""
+        store = PDFBlobStore(str(self.store.store_dir))
+        
+        self.assertEqual(store.lookup("https://example.com/paper.pdf"), self.blob)
+        self.assertIsNone(store.lookup("https://example.com/other.pdf"))
+    
+    def test_stores_on_one_directory_share_the_index(self):
+        """Test that stores sharing a directory see and keep each other's URLs."""
+        other = PDFBlobStore(str(self.store.store_dir))
+        
+        source = Path(self.temp_dir.name) / "other.pdf"
+        source.write_bytes(b"%PDF-1.4 other content")
+        other_blob = other.add_file(source, "https://example.com/other.pdf")
+        
+        # A lookup miss re-reads the index written by the other store
+        self.assertEqual(self.store.lookup("https://example.com/other.pdf"), other_blob)
+        
+        # Saving merges with the index on disk instead of overwriting it
+        source.write_bytes(b"%PDF-1.4 third content")
+        self.store.add_file(source, "https://example.com/third.pdf")
+        source.write_bytes(b"%PDF-1.4 fourth content")
+        other.add_file(source, "https://example.com/fourth.pdf")
+        
+        store = PDFBlobStore(str(self.store.store_dir))
+        for name in ["paper", "other", "third", "fourth"]:
+            self.assertIsNotNone(store.lookup(f"https://example.com/{name}.pdf"), name)
+        self.assertEqual(store.get_stats()["urls"], 4)
+    
+    def test_materialize_falls_back_to_copy(self):
+        """Test that a copy is made when hardlinks and reflinks are unavailable."""
+        destination = Path(self.temp_dir.name) / "out" / "paper.pdf"
+        
+        with patch("os.link", side_effect=OSError("cross-device link")), \
+             patch.object(self.store, "_reflink", side_effect=OSError("unsupported")):
+            method = self.store.materialize(self.blob, destination)
+        
+        self.assertEqual(method, "copy")
+        self.assertEqual(destination.read_bytes(), b"%PDF-1.4 content")
+        self.assertFalse(os.path.samefile(destination, self.blob))
+    
+    def test_materialize_replaces_existing_file(self):
+        """Test that an existing destination is replaced by a hardlink."""
+        destination = Path(self.temp_dir.name) / "paper_copy.pdf"
+        destination.write_bytes(b"stale")
+        
+        self.assertEqual(self.store.materialize(self.blob, destination), "hardlink")
+        self.assertTrue(os.path.samefile(destination, self.blob))
+
+
+@unittest.skipIf(text_layer.pdfium is None, "pypdfium2 is not installed")
+class TestTextLayer(unittest.TestCase):
+    """Tests for the text layer parse tier."""
+    
+    def setUp(self):
+        """Create a born-digital test paper."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.temp_dir.cleanup)
+        self.pdf_path = os.path.join(self.temp_dir.name, "paper.pdf")
+        make_text_pdf(self.pdf_path, PAPER_PAGES)
+    
+    def test_extracts_text_and_headings(self):
+        """Test that the text layer is extracted with markdown headings."""
+        markdown, metadata = text_layer.extract_text_layer(self.pdf_path)
+        
+        self.assertEqual(metadata["page_count"], 3)
+        self.assertIn("# Abstract", markdown)
+        self.assertIn("# 2 Methods", markdown)
+        self.assertIn("# REFERENCES", markdown)
+        self.assertIn("HbA1c fell", markdown)
+    
+    def test_page_range(self):
+        """Test that only the requested pages are extracted."""
+        markdown, metadata = text_layer.extract_text_layer(self.pdf_path, page_range="1-2")
+        
+        self.assertEqual(metadata["page_count"], 2)
+        self.assertNotIn("Abstract", markdown)
+        self.assertEqual(text_layer.parse_page_range("0,2-3,9", 5), [0, 2, 3])
+    
+    def test_quality_score(self):
+        """Test that clean text scores high and garbled or empty text scores low."""
+        markdown, metadata = text_layer.extract_text_layer(self.pdf_path)
+        clean = text_layer.score_text_layer(markdown, metadata["page_count"])
+        
+        self.assertGreaterEqual(clean["score"], text_layer.DEFAULT_MIN_QUALITY)
+        self.assertEqual(clean["sections"], ["abstract", "introduction", "methods", "references", "results"])
+        
+        garbled = text_layer.score_text_layer("\ufffd\ue000 " * 1000, 1)
+        self.assertLess(garbled["score"], text_layer.DEFAULT_MIN_QUALITY)
+        
+        scanned = text_layer.score_text_layer("Page 1\n", 10)
+        self.assertLess(scanned["score"], text_layer.DEFAULT_MIN_QUALITY)
+
+
 class TestMarkerWrapper(unittest.TestCase):
     """Tests for the MarkerWrapper class."""
     
@@ -113,6 +777,10 @@ class TestMarkerWrapper(unittest.TestCase):
         self.test_pdf_path = os.path.join(self.test_cache_dir, "test.pdf")
         with open(self.test_pdf_path, "wb") as f:
             f.write(b"PDF content")
+        
+        # Reset the process-wide model and converter registry
+        marker_wrapper_module._artifact_dict = None
+        marker_wrapper_module._converters.clear()
     
     def tearDown(self):
         """Clean up the test environment."""
@@ -121,8 +789,9 @@ class TestMarkerWrapper(unittest.TestCase):
         if os.path.exists(self.test_cache_dir):
             shutil.rmtree(self.test_cache_dir)
     
-    @patch("marker.converters.pdf.PdfConverter")
-    def test_parse_pdf(self, mock_converter):
+    @patch("crewkb.utils.pdf.marker_wrapper.create_model_dict")
+    @patch("crewkb.utils.pdf.marker_wrapper.PdfConverter")
+    def test_parse_pdf(self, mock_converter, mock_create_model_dict):
         """Test parsing a PDF."""
         # Mock the converter
         mock_instance = mock_converter.return_value
@@ -145,9 +814,207 @@ class TestMarkerWrapper(unittest.TestCase):
                 
                 # Check that the PDF was parsed
                 self.assertEqual(markdown, "Markdown content")
-                self.assertEqual(metadata, {})
+                self.assertEqual(metadata, {"parse_tier": "marker"})
                 self.assertEqual(images, [])
     
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.ConfigParser")
+    @patch("crewkb.utils.pdf.marker_wrapper.create_model_dict")
+    @patch("crewkb.utils.pdf.marker_wrapper.PdfConverter")
+    def test_models_and_converters_are_reused(
+        self, mock_converter, mock_create_model_dict, mock_config_parser, mock_text_from_rendered
+    ):
+        """Test that models load once per process and converters are cached by config."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [])
+        
+        # Create a second PDF so both parses miss the parse cache
+        other_pdf_path = os.path.join(self.test_cache_dir, "other.pdf")
+        with open(other_pdf_path, "wb") as f:
+            f.write(b"Other PDF content")
+        
+        # Warm up, then parse two PDFs with the same config
+        self.marker_wrapper.warmup()
+        self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        self.marker_wrapper.parse_pdf(other_pdf_path)
+        
+        # The models were loaded and the converter built only once
+        mock_create_model_dict.assert_called_once()
+        mock_converter.assert_called_once()
+        self.assertEqual(mock_converter.return_value.call_count, 2)
+        
+        # A different config gets its own converter on the shared models
+        self.marker_wrapper.parse_pdf(self.test_pdf_path, force_ocr=True)
+        mock_create_model_dict.assert_called_once()
+        self.assertEqual(mock_converter.call_count, 2)
+    
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_parse_cache_is_keyed_by_content(self, mock_get_converter, mock_text_from_rendered):
+        """Test that the parse cache follows PDF content rather than file names."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [])
+        converter = mock_get_converter.return_value
+        
+        # The same PDF under another name is served from the cache
+        renamed_path = os.path.join(self.test_cache_dir, "fulltext.pdf")
+        with open(renamed_path, "wb") as f:
+            f.write(b"PDF content")
+        
+        self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        markdown, _, _ = self.marker_wrapper.parse_pdf(renamed_path)
+        
+        self.assertEqual(markdown, "Markdown content")
+        self.assertEqual(converter.call_count, 1)
+        
+        # A different PDF with an already used name is parsed again
+        other_dir = os.path.join(self.test_cache_dir, "other")
+        os.makedirs(other_dir)
+        same_name_path = os.path.join(other_dir, "test.pdf")
+        with open(same_name_path, "wb") as f:
+            f.write(b"Different PDF content")
+        
+        self.marker_wrapper.parse_pdf(same_name_path)
+        
+        self.assertEqual(converter.call_count, 2)
+    
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_equivalent_configs_share_cache(self, mock_get_converter, mock_text_from_rendered):
+        """Test that configs differing only in defaults share a cache entry."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [])
+        
+        self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        markdown, _, _ = self.marker_wrapper.parse_pdf_with_custom_config(
+            self.test_pdf_path,
+            {"output_format": "markdown", "use_llm": False, "page_range": None}
+        )
+        
+        self.assertEqual(markdown, "Markdown content")
+        self.assertEqual(mock_get_converter.return_value.call_count, 1)
+    
+    @unittest.skipIf(text_layer.pdfium is None, "pypdfium2 is not installed")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_auto_tier_uses_clean_text_layer(self, mock_get_converter):
+        """Test that a born-digital PDF is served by the text layer without Marker."""
+        make_text_pdf(self.test_pdf_path, PAPER_PAGES)
+        
+        markdown, metadata, images = self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        
+        self.assertIn("# 2 Methods", markdown)
+        self.assertEqual(metadata["parse_tier"], "fast")
+        self.assertIsNone(images)
+        mock_get_converter.assert_not_called()
+    
+    @unittest.skipIf(text_layer.pdfium is None, "pypdfium2 is not installed")
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_auto_tier_escalates_low_quality_text(self, mock_get_converter, mock_text_from_rendered):
+        """Test that a PDF with little text is escalated to Marker."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [])
+        make_text_pdf(self.test_pdf_path, [["Scanned page"]] * 4)
+        
+        markdown, metadata, _ = self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        
+        self.assertEqual(markdown, "Markdown content")
+        self.assertEqual(metadata["parse_tier"], "marker")
+        mock_get_converter.return_value.assert_called_once()
+        
+        # The low score is cached, so the next call goes straight to Marker's cache
+        with patch("crewkb.utils.pdf.marker_wrapper.extract_text_layer") as mock_extract:
+            self.marker_wrapper.parse_pdf(self.test_pdf_path)
+        mock_extract.assert_not_called()
+        mock_get_converter.return_value.assert_called_once()
+    
+    @unittest.skipIf(text_layer.pdfium is None, "pypdfium2 is not installed")
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_tier_is_selectable_per_call(self, mock_get_converter, mock_text_from_rendered):
+        """Test that the fast and marker tiers can be forced per call."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [])
+        make_text_pdf(self.test_pdf_path, [["Scanned page"]])
+        
+        _, metadata, _ = self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="fast")
+        self.assertEqual(metadata["parse_tier"], "fast")
+        mock_get_converter.assert_not_called()
+        
+        _, metadata, _ = self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        self.assertEqual(metadata["parse_tier"], "marker")
+        
+        with self.assertRaises(ValueError):
+            self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="gpu")
+    
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_cache_hits_return_lazy_image_handles(self, mock_get_converter, mock_text_from_rendered):
+        """Test that cached images are returned as handles and read on demand."""
+        mock_text_from_rendered.return_value = (
+            "Markdown content",
+            {},
+            [b"image %d" % i for i in range(12)]
+        )
+        self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        
+        with patch("crewkb.utils.pdf.marker_wrapper.open", wraps=open) as mock_open:
+            markdown, _, images = self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        
+        # Only the text and metadata were read
+        self.assertEqual(mock_open.call_count, 2)
+        self.assertEqual(markdown, "Markdown content")
+        self.assertEqual(len(images), 12)
+        self.assertIsInstance(images[0], ImageHandle)
+        
+        # Images keep their extraction order and load lazily
+        self.assertTrue(images[11].path.endswith("image_11.png"))
+        self.assertEqual(images[11].size, len(b"image 11"))
+        self.assertEqual(images[11].read(), b"image 11")
+        self.assertEqual(images[2]["data"], b"image 2")
+    
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_images_are_saved_under_marker_names(self, mock_get_converter, mock_text_from_rendered):
+        """Test that Marker's images are saved under the names the markdown references."""
+        mock_text_from_rendered.return_value = (
+            "![](_page_0_Picture_2.jpeg)\n![](_page_10_Picture_0.jpeg)",
+            {},
+            {
+                "_page_0_Picture_2.jpeg": PILImage.new("RGB", (4, 4)),
+                "_page_10_Picture_0.jpeg": PILImage.new("RGB", (4, 4))
+            }
+        )
+        markdown, _, images = self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        
+        self.assertEqual(
+            [os.path.basename(image.path) for image in images],
+            ["_page_0_Picture_2.jpeg", "_page_10_Picture_0.jpeg"]
+        )
+        self.assertGreater(images[0].size, 0)
+        
+        # Cached images are listed in page order under the same names
+        _, _, cached_images = self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        self.assertEqual([image.path for image in cached_images], [image.path for image in images])
+    
+    @patch("crewkb.utils.pdf.marker_wrapper.text_from_rendered")
+    @patch("crewkb.utils.pdf.marker_wrapper.get_converter")
+    def test_image_enumeration_can_be_skipped(self, mock_get_converter, mock_text_from_rendered):
+        """Test that load_images=False skips listing the cached images."""
+        mock_text_from_rendered.return_value = ("Markdown content", {}, [b"image"])
+        self.marker_wrapper.parse_pdf(self.test_pdf_path, tier="marker")
+        
+        with patch.object(Path, "glob", side_effect=AssertionError("images were listed")):
+            markdown, _, images = self.marker_wrapper.parse_pdf(
+                self.test_pdf_path, tier="marker", load_images=False
+            )
+        
+        self.assertEqual(markdown, "Markdown content")
+        self.assertIsNone(images)
+    
+    def test_content_hashes_are_indexed(self):
+        """Test that content hashes are persisted and reused across instances."""
+        pdf_hash = self.marker_wrapper.get_pdf_hash(self.test_pdf_path)
+        
+        other_wrapper = MarkerWrapper(use_llm=False, cache_dir=self.test_cache_dir)
+        with patch("builtins.open", side_effect=AssertionError("file was re-read")):
+            self.assertEqual(other_wrapper.get_pdf_hash(self.test_pdf_path), pdf_hash)
+    
     def test_extract_sections(self):
         """Test extracting sections from markdown."""
         # Create a test markdown file
@@ -195,6 +1062,168 @@ This is the references section.
         self.assertIn("references", sections)
 
 
+class TestPDFParsePool(unittest.TestCase):
+    """Tests for the PDFParsePool class."""
+    
+    @patch("crewkb.utils.pdf.parse_pool.ProcessPoolExecutor")
+    def test_executor_configuration(self, mock_executor_class):
+        """Test that the pool is bounded and recycles its workers."""
+        pool = PDFParsePool(
+            max_workers=3,
+            max_tasks_per_worker=7,
+            use_llm=False,
+            cache_dir="test_cache/marker"
+        )
+        
+        executor = pool._get_executor()
+        
+        # The executor is created once and reused
+        self.assertIs(pool._get_executor(), executor)
+        mock_executor_class.assert_called_once()
+        
+        _, kwargs = mock_executor_class.call_args
+        self.assertEqual(kwargs["max_workers"], 3)
+        self.assertEqual(kwargs["initargs"][0]["use_llm"], False)
+        self.assertEqual(kwargs["initargs"][0]["cache_dir"], "test_cache/marker")
+        if pool._native_recycling:
+            self.assertEqual(kwargs["max_tasks_per_child"], 7)
+        
+        pool.shutdown()
+        executor.shutdown.assert_called_once_with(wait=True)
+    
+    @patch("crewkb.utils.pdf.parse_pool.ProcessPoolExecutor")
+    def test_pools_share_a_small_set_of_workers(self, mock_executor_class):
+        """Test that pools share one executor of DEFAULT_PARSE_WORKERS workers."""
+        pool = PDFParsePool(use_llm=False)
+        other = PDFParsePool(use_llm=True, max_workers=8)
+        self.addCleanup(pool.shutdown)
+        
+        executor = pool._get_executor()
+        self.assertIs(other._get_executor(), executor)
+        mock_executor_class.assert_called_once()
+        self.assertEqual(mock_executor_class.call_args.kwargs["max_workers"], parse_pool_module.DEFAULT_PARSE_WORKERS)
+    
+    @patch("crewkb.utils.pdf.parse_pool.MarkerWrapper")
+    def test_workers_keep_one_wrapper_per_configuration(self, mock_wrapper_class):
+        """Test that a worker parses each pool's jobs with a wrapper of that pool's configuration."""
+        mock_wrapper_class.return_value.parse_pdf.return_value = ("Text", {}, [])
+        self.addCleanup(parse_pool_module._worker_wrappers.clear)
+        
+        for use_llm in [False, True, False]:
+            parse_pool_module._parse_in_worker({"use_llm": use_llm}, "paper.pdf", {})
+        
+        self.assertEqual(
+            [call.kwargs for call in mock_wrapper_class.call_args_list],
+            [{"use_llm": False}, {"use_llm": True}]
+        )
+    
+    def _sharded_pool(self, results):
+        """
+        Create a pool whose workers return canned results per page range.
+        
+        Args:
+            results: A function mapping a page range to a shard result.
+            
+        Returns:
+            A tuple containing the pool and the list of submitted jobs.
+        """
+        pool = PDFParsePool(max_workers=4, use_llm=False, pages_per_shard=40)
+        calls = []
+        
+        async def run(func, pdf_path, parse_kwargs):
+            calls.append(dict(parse_kwargs))
+            if parse_kwargs.get("tier") == "fast":
+                return "thin text", {"parse_tier": "fast", "text_quality": {"score": 0.2}}
+            return results(parse_kwargs["page_range"])
+        
+        pool._run = run
+        return pool, calls
+    
+    @patch("crewkb.utils.pdf.parse_pool.get_page_count", return_value=100)
+    def test_long_pdf_is_parsed_in_shards(self, mock_page_count):
+        """Test that a long PDF is split into page ranges and stitched back."""
+        pool, calls = self._sharded_pool(lambda page_range: (
+            f"Pages {page_range} ![](image_0.png)",
+            {"table_of_contents": [{"title": page_range}]},
+            [f"cache/{page_range}/image_0.png"]
+        ))
+        
+        text, metadata = asyncio.run(pool.parse_sharded("long.pdf", use_llm=False))
+        
+        shard_calls = [call for call in calls if call["tier"] == "marker"]
+        self.assertEqual([call["page_range"] for call in shard_calls], ["0-39", "40-79", "80-99"])
+        self.assertEqual(metadata["shards"], ["0-39", "40-79", "80-99"])
+        self.assertEqual(
+            text,
+            "Pages 0-39 ![](shard_0_image_0.png)\n\n"
+            "Pages 40-79 ![](shard_1_image_0.png)\n\n"
+            "Pages 80-99 ![](shard_2_image_0.png)\n"
+        )
+        self.assertEqual(
+            [(image["name"], image["path"]) for image in metadata["images"]],
+            [
+                ("shard_0_image_0.png", "cache/0-39/image_0.png"),
+                ("shard_1_image_0.png", "cache/40-79/image_0.png"),
+                ("shard_2_image_0.png", "cache/80-99/image_0.png")
+            ]
+        )
+        self.assertEqual(len(metadata["table_of_contents"]), 3)
+    
+    @patch("crewkb.utils.pdf.parse_pool.get_page_count", return_value=100)
+    def test_shards_keep_marker_image_names(self, mock_page_count):
+        """Test that Marker's image names are prefixed per shard in the text and image list."""
+        shard_images = {
+            "0-39": ["_page_3_Picture_1.jpeg", "_page_3_Picture_11.jpeg"],
+            "40-79": ["_page_3_Picture_1.jpeg"],
+            "80-99": []
+        }
+        pool, _ = self._sharded_pool(lambda page_range: (
+            " ".join(f"![]({name})" for name in shard_images[page_range]) or "No figures",
+            {},
+            [f"cache/{page_range}.images/{name}" for name in shard_images[page_range]]
+        ))
+        
+        text, metadata = asyncio.run(pool.parse_sharded("long.pdf", use_llm=False))
+        
+        self.assertEqual(
+            text,
+            "![](shard_0__page_3_Picture_1.jpeg) ![](shard_0__page_3_Picture_11.jpeg)\n\n"
+            "![](shard_1__page_3_Picture_1.jpeg)\n\n"
+            "No figures\n"
+        )
+        self.assertEqual(
+            [(image["name"], image["path"], image["page_range"]) for image in metadata["images"]],
+            [
+                ("shard_0__page_3_Picture_1.jpeg", "cache/0-39.images/_page_3_Picture_1.jpeg", "0-39"),
+                ("shard_0__page_3_Picture_11.jpeg", "cache/0-39.images/_page_3_Picture_11.jpeg", "0-39"),
+                ("shard_1__page_3_Picture_1.jpeg", "cache/40-79.images/_page_3_Picture_1.jpeg", "40-79")
+            ]
+        )
+        
+        # Every image the stitched text references is listed
+        names = {image["name"] for image in metadata["images"]}
+        for reference in re.findall(r"!\[\]\(([^)]+)\)", text):
+            self.assertIn(reference, names)
+    
+    @patch("crewkb.utils.pdf.parse_pool.get_page_count", return_value=100)
+    def test_failed_shard_fails_the_parse(self, mock_page_count):
+        """Test that a failed shard fails the whole parse."""
+        pool, _ = self._sharded_pool(lambda page_range: (
+            (None, None, []) if page_range == "40-79" else ("Text", {}, [])
+        ))
+        
+        self.assertEqual(asyncio.run(pool.parse_sharded("long.pdf")), (None, None))
+    
+    @patch("crewkb.utils.pdf.parse_pool.get_page_count", return_value=10)
+    def test_short_pdf_is_parsed_whole(self, mock_page_count):
+        """Test that a PDF below the shard size is parsed in one job."""
+        pool = PDFParsePool(max_workers=2, pages_per_shard=40)
+        pool.parse = AsyncMock(return_value=("Text", {}))
+        
+        self.assertEqual(asyncio.run(pool.parse_sharded("short.pdf", use_llm=False)), ("Text", {}))
+        pool.parse.assert_awaited_once_with("short.pdf", use_llm=False)
+
+
 class TestPDFProcessor(unittest.TestCase):
     """Tests for the PDFProcessor class."""
     
@@ -204,8 +1233,7 @@ class TestPDFProcessor(unittest.TestCase):
         
         # Mock the download manager
         self.mock_download_manager = MagicMock()
-        self.mock_download_manager.download.return_value = asyncio.Future()
-        self.mock_download_manager.download.return_value.set_result("test.pdf")
+        self.mock_download_manager.download = AsyncMock(return_value="test.pdf")
         
         # Mock the marker wrapper
         self.mock_marker_wrapper = MagicMock()
@@ -269,12 +1297,167 @@ class TestPDFProcessor(unittest.TestCase):
         # Check that the marker wrapper was called
         self.mock_marker_wrapper.parse_pdf.assert_called_once_with(
             "test.pdf",
+            load_images=False,
             use_llm=None
         )
         self.mock_marker_wrapper.extract_sections.assert_called_once_with(
             "Markdown content"
         )
     
+    def test_process_paper_uses_parse_pool(self):
+        """Test that parsing is routed to the worker pool when one is configured."""
+        self.pdf_processor.parse_pool = MagicMock()
+        self.pdf_processor.parse_pool.parse_sharded = AsyncMock(
+            return_value=("Markdown content", {})
+        )
+        
+        markdown_path, sections = asyncio.run(
+            self.pdf_processor.process_paper(self.test_paper)
+        )
+        
+        self.assertIsNotNone(markdown_path)
+        self.pdf_processor.parse_pool.parse_sharded.assert_awaited_once_with(
+            "test.pdf",
+            use_llm=None
+        )
+        self.mock_marker_wrapper.parse_pdf.assert_not_called()
+    
+    def test_triage_parses_first_pages_only(self):
+        """Test that triage parses the leading pages and keeps the opening sections."""
+        self.mock_marker_wrapper.extract_sections.return_value = {
+            "abstract": "Abstract content",
+            "introduction": "Introduction content",
+            "methods": "Methods content"
+        }
+        
+        markdown_path, sections = asyncio.run(
+            self.pdf_processor.process_paper(self.test_paper, mode="triage")
+        )
+        
+        self.assertTrue(markdown_path.endswith(".triage.md"))
+        self.assertEqual(set(sections), {"abstract", "introduction"})
+        self.mock_marker_wrapper.parse_pdf.assert_called_once_with(
+            "test.pdf",
+            load_images=False,
+            use_llm=None,
+            page_range="0-2"
+        )
+        
+        # Triage results are cached apart from full parses
+        self.assertFalse(os.path.exists(os.path.join(self.test_cache_dir, f"{self.test_paper.id}.md")))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.pdf_processor.process_paper(self.test_paper, mode="skim"))
+    
+    def test_promotion_reuses_triaged_pdf(self):
+        """Test that promoting a triaged paper parses it fully without a new download."""
+        pdf_path = os.path.join(self.test_cache_dir, "downloaded.pdf")
+        with open(pdf_path, "wb") as f:
+            f.write(b"%PDF-1.4")
+        self.mock_download_manager.download.return_value = pdf_path
+        
+        asyncio.run(self.pdf_processor.process_paper(self.test_paper, mode="triage"))
+        markdown_path, sections = asyncio.run(self.pdf_processor.promote_triage(self.test_paper))
+        
+        self.assertTrue(markdown_path.endswith(f"{self.test_paper.id}.md"))
+        self.mock_download_manager.download.assert_awaited_once()
+        self.assertEqual(
+            self.mock_marker_wrapper.parse_pdf.call_args_list[1],
+            unittest.mock.call(pdf_path, load_images=False, use_llm=None)
+        )
+    
+    def test_cache_hit_reuses_persisted_sections(self):
+        """Test that a cache hit loads the stored sections and links the output."""
+        output_dir = os.path.join(self.test_cache_dir, "output")
+        asyncio.run(self.pdf_processor.process_paper(self.test_paper, output_dir=output_dir))
+        self.mock_marker_wrapper.extract_sections.reset_mock()
+        
+        markdown_path, sections = asyncio.run(
+            self.pdf_processor.process_paper(self.test_paper, output_dir=output_dir)
+        )
+        
+        self.assertEqual(sections, {
+            "abstract": "Abstract content",
+            "introduction": "Introduction content"
+        })
+        self.mock_marker_wrapper.extract_sections.assert_not_called()
+        self.assertTrue(os.path.samefile(markdown_path, os.path.join(output_dir, "test_paper.md")))
+    
+    def test_stale_sections_are_rebuilt(self):
+        """Test that sections files from another cache version are rebuilt."""
+        markdown_path, _ = asyncio.run(self.pdf_processor.process_paper(self.test_paper))
+        sections_path = Path(markdown_path).with_suffix(".sections.json")
+        
+        # Files written before versioning hold the bare sections dictionary
+        with open(sections_path, "w") as f:
+            json.dump({"abstract": "Old abstract"}, f)
+        self.mock_marker_wrapper.extract_sections.reset_mock()
+        
+        _, sections = asyncio.run(self.pdf_processor.process_paper(self.test_paper))
+        
+        self.assertEqual(sections["abstract"], "Abstract content")
+        self.mock_marker_wrapper.extract_sections.assert_called_once()
+        with open(sections_path, "r") as f:
+            self.assertEqual(json.load(f)["version"], SECTIONS_CACHE_VERSION)
+    
+    def test_failed_paper_is_skipped_until_retried(self):
+        """Test that a paper that failed is skipped and can be retried in a batch."""
+        self.mock_download_manager.download = AsyncMock(return_value=None)
+        
+        self.assertEqual(asyncio.run(self.pdf_processor.process_paper(self.test_paper)), (None, None))
+        self.assertEqual(asyncio.run(self.pdf_processor.process_paper(self.test_paper)), (None, None))
+        self.mock_download_manager.download.assert_awaited_once()
+        self.assertIn("download", self.pdf_processor.failures.get(self.test_paper.id)["reason"])
+        
+        # The retry bypasses the backoff of the paper and of its download
+        self.mock_download_manager.download = AsyncMock(return_value="test.pdf")
+        results = asyncio.run(self.pdf_processor.retry_failed(due_only=False))
+        
+        markdown_path, sections = results[self.test_paper.id]
+        self.assertIsNotNone(markdown_path)
+        self.mock_download_manager.download.assert_awaited_once_with(
+            "https://example.com/test.pdf", skip_failed=False
+        )
+        self.assertEqual(len(self.pdf_processor.failures), 0)
+    
+    def test_paper_without_url_is_skipped_without_ledger_entry(self):
+        """Test that a paper with no URL is skipped and not recorded for retries."""
+        paper = PaperSource(title="Paper Without URL", source_tool="test", search_term="test")
+        
+        async def run():
+            return [result async for result in self.pdf_processor.process_papers([paper])]
+        
+        self.assertEqual(asyncio.run(self.pdf_processor.process_paper(paper)), (None, None))
+        self.assertEqual(asyncio.run(run()), [(paper.id, (None, None))])
+        
+        self.mock_download_manager.download.assert_not_awaited()
+        self.assertIn(paper.id, self.pdf_processor.failed_processing)
+        self.assertEqual(len(self.pdf_processor.failures), 0)
+    
+    def test_parsing_does_not_block_event_loop(self):
+        """Test that in-process parsing runs off the event loop."""
+        def slow_parse(pdf_path, use_llm=None, load_images=True):
+            time.sleep(0.3)
+            return "Markdown content", {}, []
+        
+        self.mock_marker_wrapper.parse_pdf.side_effect = slow_parse
+        
+        async def run():
+            ticks = 0
+            
+            async def heartbeat():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+            
+            heartbeat_task = asyncio.create_task(heartbeat())
+            await self.pdf_processor.process_paper(self.test_paper)
+            heartbeat_task.cancel()
+            return ticks
+        
+        # The loop kept ticking while the parse was running
+        self.assertGreater(asyncio.run(run()), 10)
+    
     async def test_process_papers(self):
         """Test processing multiple papers."""
         # Create another test paper
@@ -292,7 +1475,12 @@ class TestPDFProcessor(unittest.TestCase):
         )
         
         # Process the papers
-        results = await self.pdf_processor.process_papers([self.test_paper, test_paper2])
+        results = {
+            paper_id: result
+            async for paper_id, result in self.pdf_processor.process_papers(
+                [self.test_paper, test_paper2]
+            )
+        }
         
         # Check that the papers were processed
         self.assertEqual(len(results), 2)
@@ -307,6 +1495,56 @@ class TestPDFProcessor(unittest.TestCase):
             self.assertIn("introduction", sections)
 
 
+    def test_process_papers_streams_results_as_they_finish(self):
+        """Test that the pipeline yields each paper as soon as it is done."""
+        slow_paper = PaperSource(
+            title="Slow Paper",
+            authors=["Test Author"],
+            pdf_url="https://example.com/slow.pdf",
+            source_tool="test_tool",
+            search_term="test search"
+        )
+        
+        async def download(url):
+            # The slow paper's download outlasts the other paper's whole pipeline
+            await asyncio.sleep(0.5 if "slow" in url else 0)
+            return url.rsplit("/", 1)[-1]
+        
+        self.mock_download_manager.download = AsyncMock(side_effect=download)
+        
+        async def run():
+            order = []
+            async for paper_id, (markdown_path, sections) in self.pdf_processor.process_papers(
+                [slow_paper, self.test_paper],
+                max_concurrent=2,
+                parse_concurrency=1
+            ):
+                self.assertIsNotNone(markdown_path)
+                order.append(paper_id)
+            return order
+        
+        order = asyncio.run(run())
+        
+        self.assertEqual(order, [self.test_paper.id, slow_paper.id])
+        self.assertEqual(self.mock_marker_wrapper.parse_pdf.call_count, 2)
+    
+    def test_process_papers_reports_failures(self):
+        """Test that failed downloads are yielded instead of stalling the pipeline."""
+        self.mock_download_manager.download = AsyncMock(return_value=None)
+        
+        async def run():
+            return [
+                result
+                async for result in self.pdf_processor.process_papers([self.test_paper])
+            ]
+        
+        results = asyncio.run(run())
+        
+        self.assertEqual(results, [(self.test_paper.id, (None, None))])
+        self.assertIn(self.test_paper.id, self.pdf_processor.get_failed_processing())
+        self.mock_marker_wrapper.parse_pdf.assert_not_called()
+
+
 # Run the tests
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,159 @@
+"""
+Tests for the SearchCache.
+"""
+
+import os
+import json
+import time
+import tempfile
+import unittest
+
+from crewkb.utils.search.cache import SearchCache
+from crewkb.utils.search.cache_store import DirectoryStore, SQLiteStore
+
+
+class TestSearchCache(unittest.TestCase):
+    """Tests for the SearchCache."""
+    
+    def setUp(self):
+        """Set up test fixtures."""
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = self.temp_dir.name
+    
+    def tearDown(self):
+        """Tear down test fixtures."""
+        self.temp_dir.cleanup()
+    
+    def test_memory_tier_evicts_least_recently_used(self):
+        """Test that the memory tier keeps only the most recently used entries."""
+        cache = SearchCache(self.cache_dir, max_memory_entries=2)
+        
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        
+        self.assertEqual(list(cache._memory_cache), ["a", "c"])
+        self.assertEqual(cache.get_stats()["memory_evictions"], 1)
+        
+        # Evicted entries are still served from disk
+        self.assertEqual(cache.get("b"), 2)
+        stats = cache.get_stats()
+        self.assertEqual((stats["memory_hits"], stats["disk_hits"]), (1, 1))
+    
+    def test_entries_expire_by_namespace(self):
+        """Test that entries expire after their namespace's TTL."""
+        cache = SearchCache(self.cache_dir, default_ttl=None, namespace_ttls={"search": 0})
+        
+        cache.set("stale", [1], namespace="search")
+        cache.set("fresh", [2])
+        
+        self.assertIsNone(cache.get("stale"))
+        self.assertEqual(cache.get("fresh"), [2])
+        self.assertEqual(cache.get_size(), 1)
+        
+        stats = cache.get_stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["expirations"]), (1, 1, 1))
+    
+    def test_disk_tier_evicts_by_size_and_age(self):
+        """Test that the disk tier drops old files, then least recently used ones."""
+        cache = SearchCache(self.cache_dir, max_memory_entries=0, max_disk_bytes=None, backend="directory")
+        for key in ["a", "b", "c"]:
+            cache.set(key, "x" * 1000)
+        
+        # Make "a" the least recently used entry
+        now = time.time()
+        os.utime(cache.store._get_path("a"), (now - 60, now - 60))
+        
+        cache.max_disk_bytes = 3000
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.get("b"), "x" * 1000)
+        
+        # Everything is older than max_disk_age a day from now
+        cache.max_disk_age = 3600
+        self.assertEqual(cache.evict(now=now + 86400), 2)
+        self.assertEqual(cache.get_size(), 0)
+        self.assertEqual(cache.get_stats()["disk_evictions"], 3)
+    
+    def test_reads_files_without_metadata(self):
+        """Test that cache files holding a bare value are still served."""
+        cache = SearchCache(self.cache_dir, backend="directory")
+        with open(cache.store._get_path("old"), "w") as f:
+            json.dump({"google_scholar": []}, f)
+        
+        self.assertEqual(cache.get("old"), {"google_scholar": []})
+
+    
+    def test_sqlite_backend(self):
+        """Test that the SQLite backend stores, expires and evicts entries."""
+        cache = SearchCache(self.cache_dir, max_memory_entries=0, backend="sqlite")
+        self.assertIsInstance(cache.store, SQLiteStore)
+        
+        cache.set("a", {"results": [1]})
+        cache.set("b", {"results": [2]}, ttl=0)
+        cache.set("c", {"results": [3]})
+        
+        self.assertEqual(cache.get("a"), {"results": [1]})
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get_size(), 2)
+        
+        # "c" was never read, so it is the least recently used entry
+        cache.store.touch("c", 0)
+        cache.max_disk_bytes = cache.store.total_bytes() - 1
+        self.assertEqual(cache.evict(), 1)
+        self.assertIsNone(cache.get("c"))
+        self.assertEqual(cache.get("a"), {"results": [1]})
+        
+        cache.clear()
+        self.assertEqual(cache.get_size(), 0)
+        self.assertEqual(cache.get_stats()["disk_bytes"], 0)
+        cache.close()
+    
+    def test_auto_backend_migrates_past_threshold(self):
+        """Test that the directory moves to SQLite once it holds enough entries."""
+        cache = SearchCache(self.cache_dir, sqlite_threshold=3)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        self.assertIsInstance(cache.store, DirectoryStore)
+        
+        cache.set("c", 3, namespace="search")
+        self.assertIsInstance(cache.store, SQLiteStore)
+        self.assertEqual(cache.get_size(), 3)
+        self.assertFalse([f for f in os.listdir(self.cache_dir) if f.endswith(".json")])
+        cache.close()
+        
+        # A new cache reopens the database and serves the migrated entries
+        cache = SearchCache(self.cache_dir, sqlite_threshold=3)
+        self.assertIsInstance(cache.store, SQLiteStore)
+        self.assertEqual([cache.get(key) for key in "abc"], [1, 2, 3])
+        cache.close()
+
+    
+    def test_finds_entries_by_term_and_age(self):
+        """Test that entries are found by search term and age in both stores."""
+        for backend in ("directory", "sqlite"):
+            with self.subTest(backend=backend):
+                cache = SearchCache(os.path.join(self.cache_dir, backend), backend=backend)
+                cache.set("a_10", 1, term="a", params={"max_results": 10})
+                cache.set("a_20", 2, term="a", params={"max_results": 20})
+                cache.set("b_10", 3, term="b")
+                cache.set("untagged", 4)
+                
+                self.assertEqual(sorted(cache.find(term="a")), ["a_10", "a_20"])
+                self.assertEqual(cache.get_record("a_20").params, {"max_results": 20})
+                self.assertEqual(len(cache.find()), 4)
+                self.assertEqual(cache.find(older_than=3600), [])
+                
+                cache.clear("a_10")
+                self.assertEqual(cache.find(term="a"), ["a_20"])
+                
+                # Replacing a value keeps its metadata
+                self.assertTrue(cache.replace("a_20", 5))
+                self.assertEqual(cache.get("a_20"), 5)
+                self.assertEqual(cache.find(term="a"), ["a_20"])
+                cache.close()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -4,15 +4,20 @@ Tests for the AsyncSearchCoordinator.
 
 import os
 import json
+import time
 import asyncio
 import tempfile
 import unittest
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 
 import pytest
+from aiohttp import web
+from aiohttp.test_utils import TestServer
 
 from crewkb.utils.search.coordinator import AsyncSearchCoordinator
 from crewkb.utils.search.cache import SearchCache
+from crewkb.utils.search.providers import SearchProvider
+from crewkb.utils.pdf import PDFProcessor
 from crewkb.models.knowledge.paper import PaperSource
 
 
@@ -79,6 +84,40 @@ class TestAsyncSearchCoordinator(unittest.TestCase):
         """Tear down test fixtures."""
         self.temp_dir.cleanup()
     
+    def _make_prefetch_processor(self, delay: float = 0.0) -> MagicMock:
+        """
+        Create a fake PDFProcessor that downloads 100-byte PDFs up to the count budget.
+        
+        Args:
+            delay: Number of seconds each download_papers call takes.
+            
+        Returns:
+            The fake processor.
+        """
+        pdf_processor = MagicMock()
+        
+        async def download_papers(papers, max_downloads=None, max_bytes=None):
+            await asyncio.sleep(delay)
+            paths = {}
+            for paper in papers:
+                if max_downloads is not None and len(paths) >= max_downloads:
+                    paths[paper.id] = None
+                    continue
+                path = os.path.join(self.cache_dir, f"{paper.id}.pdf")
+                with open(path, "wb") as f:
+                    f.write(b"x" * 100)
+                paths[paper.id] = path
+            return paths
+        
+        async def process_papers(papers, mode="full"):
+            for paper in papers:
+                self.assertEqual(mode, "triage")
+                yield paper.id, (f"{paper.id}.triage.md", {"abstract": ""})
+        
+        pdf_processor.download_manager.download_papers = AsyncMock(side_effect=download_papers)
+        pdf_processor.process_papers = process_papers
+        return pdf_processor
+    
     @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
     @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
     def test_init(self, mock_semantic_scholar, mock_google_scholar):
@@ -249,6 +288,239 @@ class TestAsyncSearchCoordinator(unittest.TestCase):
         cached_results = coordinator.cache.get(cache_key)
         self.assertIsNone(cached_results)
     
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_clear_cache_by_term_source_and_age(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that clearing finds cached searches with any parameters."""
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.return_value = self.google_scholar_results
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir)
+        
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(coordinator.search("test", max_results=7, min_citation_count=3))
+            loop.run_until_complete(coordinator.search("other", max_results=7))
+            
+            # Nothing is old enough
+            self.assertEqual(coordinator.clear_cache(older_than=3600), 0)
+            
+            # Clearing a source keeps the other source's results
+            self.assertEqual(coordinator.clear_cache("test", source="google_scholar"), 1)
+            cached_results = coordinator.cache.get("test_7_3_None")
+            self.assertEqual(list(cached_results), ["semantic_scholar"])
+            
+            # Only the cleared source is searched again
+            mock_google_scholar_instance.run.reset_mock()
+            mock_semantic_scholar_instance.run.reset_mock()
+            results = loop.run_until_complete(
+                coordinator.search("test", max_results=7, min_citation_count=3)
+            )
+            mock_google_scholar_instance.run.assert_called_once()
+            mock_semantic_scholar_instance.run.assert_not_called()
+            self.assertEqual(results["google_scholar"], self.google_scholar_results)
+            
+            # Clearing a term leaves the other terms alone
+            self.assertEqual(coordinator.clear_cache("test"), 1)
+            self.assertIsNone(coordinator.cache.get("test_7_3_None"))
+            self.assertIsNotNone(coordinator.cache.get("other_7_None_None"))
+        finally:
+            loop.close()
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_concurrent_identical_searches_share_one_call(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that concurrent searches for the same normalized term call each tool once."""
+        def slow_google_scholar(*args, **kwargs):
+            time.sleep(0.1)
+            return self.google_scholar_results
+        
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.side_effect = slow_google_scholar
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir)
+        
+        async def run():
+            return await asyncio.gather(
+                coordinator.search("test"),
+                coordinator.search("  Test "),
+                coordinator.search("TEST")
+            )
+        
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        
+        mock_google_scholar_instance.run.assert_called_once()
+        mock_semantic_scholar_instance.run.assert_called_once()
+        for result in results:
+            self.assertEqual(result["google_scholar"], self.google_scholar_results)
+        self.assertEqual(coordinator._in_flight, {})
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_search_stream_yields_sources_as_they_finish(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that streamed searches yield the fastest tool first and cache the combination."""
+        def slow_google_scholar(*args, **kwargs):
+            time.sleep(0.1)
+            return self.google_scholar_results
+        
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.side_effect = slow_google_scholar
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir)
+        
+        async def collect(stream):
+            return [item async for item in stream]
+        
+        loop = asyncio.new_event_loop()
+        try:
+            streamed = loop.run_until_complete(collect(coordinator.search_stream("test")))
+            self.assertEqual(
+                streamed,
+                [
+                    ("semantic_scholar", self.semantic_scholar_results),
+                    ("google_scholar", self.google_scholar_results)
+                ]
+            )
+            loop.run_until_complete(asyncio.sleep(0))
+            self.assertIsNotNone(coordinator.cache.get("test_10_None_None"))
+            self.assertEqual(coordinator._in_flight, {})
+            
+            # Cached results are yielded without searching again
+            papers = loop.run_until_complete(
+                collect(coordinator.search_and_create_papers_stream("test"))
+            )
+            self.assertEqual(
+                [paper.title for paper in papers],
+                ["Test Paper 1", "Test Paper 2", "Semantic Paper 1", "Semantic Paper 2"]
+            )
+            mock_google_scholar_instance.run.assert_called_once()
+            mock_semantic_scholar_instance.run.assert_called_once()
+        finally:
+            loop.close()
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_search_deadline_returns_partial_results(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that a search returns the results that arrived before its deadline."""
+        def slow_google_scholar(*args, **kwargs):
+            time.sleep(0.3)
+            return self.google_scholar_results
+        
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.side_effect = slow_google_scholar
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir, deadline=0.05)
+        
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(coordinator.search("test"))
+            self.assertEqual(results["semantic_scholar"], self.semantic_scholar_results)
+            self.assertEqual(results["google_scholar"], [])
+            self.assertEqual(
+                results.provenance,
+                {"google_scholar": "timeout", "semantic_scholar": "ok"}
+            )
+            self.assertEqual(results.timed_out, ["google_scholar"])
+            
+            # The slow provider finishes in the background and is cached
+            results = loop.run_until_complete(coordinator.search("test", deadline=5))
+            self.assertEqual(results["google_scholar"], self.google_scholar_results)
+            self.assertEqual(results.provenance["google_scholar"], "ok")
+            mock_google_scholar_instance.run.assert_called_once()
+            
+            results = loop.run_until_complete(coordinator.search("test"))
+            self.assertEqual(
+                results.provenance,
+                {"google_scholar": "cached", "semantic_scholar": "cached"}
+            )
+        finally:
+            loop.close()
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_provider_timeout_is_not_cached(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that a provider exceeding its timeout is searched again next time."""
+        def slow_google_scholar(*args, **kwargs):
+            time.sleep(0.2)
+            return self.google_scholar_results
+        
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.side_effect = slow_google_scholar
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir)
+        coordinator.providers.get("google_scholar").timeout = 0.05
+        
+        loop = asyncio.new_event_loop()
+        try:
+            results = loop.run_until_complete(coordinator.search("test"))
+            self.assertEqual(results.provenance["google_scholar"], "timeout")
+            self.assertEqual(
+                coordinator.cache.get("test_10_None_None"),
+                {"semantic_scholar": self.semantic_scholar_results}
+            )
+            
+            # Only the provider that timed out is searched again
+            coordinator.providers.get("google_scholar").timeout = None
+            results = loop.run_until_complete(coordinator.search("test"))
+            self.assertEqual(
+                results.provenance,
+                {"google_scholar": "ok", "semantic_scholar": "cached"}
+            )
+            self.assertEqual(mock_google_scholar_instance.run.call_count, 2)
+            mock_semantic_scholar_instance.run.assert_called_once()
+        finally:
+            loop.close()
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_registered_providers_are_searched_by_weight(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that enabled providers are searched and reported heaviest first."""
+        mock_google_scholar_instance = mock_google_scholar.return_value
+        mock_google_scholar_instance.run.return_value = self.google_scholar_results
+        
+        mock_semantic_scholar_instance = mock_semantic_scholar.return_value
+        mock_semantic_scholar_instance.run.return_value = self.semantic_scholar_results
+        
+        async def search_preprints(term, max_results, min_citation_count, year_range):
+            return [{"title": "Preprint 1", "authors": ["Author 9"], "year": 2024}]
+        
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir)
+        coordinator.providers.register(SearchProvider("preprints", search_preprints, weight=2.0))
+        coordinator.providers.disable("semantic_scholar")
+        
+        loop = asyncio.new_event_loop()
+        try:
+            papers = loop.run_until_complete(coordinator.search_and_create_papers("test"))
+        finally:
+            loop.close()
+        
+        self.assertEqual(list(papers), ["preprints", "google_scholar"])
+        self.assertEqual(papers["preprints"][0].title, "Preprint 1")
+        self.assertEqual(papers["preprints"][0].source_tool, "preprints")
+        mock_semantic_scholar_instance.run.assert_not_called()
+        
+        with self.assertRaises(ValueError):
+            coordinator.clear_cache(source="unknown")
+    
     @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
     @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
     def test_search_with_error(self, mock_semantic_scholar, mock_google_scholar):
@@ -270,3 +542,201 @@ class TestAsyncSearchCoordinator(unittest.TestCase):
         # Check that the results include the semantic scholar results but not google scholar
         self.assertEqual(len(results["google_scholar"]), 0)
         self.assertEqual(results["semantic_scholar"], self.semantic_scholar_results)
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_search_and_create_papers_prefetches_within_budget(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that found papers are prefetched and triaged in the background within the budget."""
+        mock_google_scholar.return_value.run.return_value = self.google_scholar_results
+        mock_semantic_scholar.return_value.run.return_value = self.semantic_scholar_results
+        
+        pdf_processor = self._make_prefetch_processor()
+        
+        coordinator = AsyncSearchCoordinator(
+            cache_dir=self.cache_dir,
+            prefetch=True,
+            prefetch_triage=True,
+            prefetch_max_downloads=3,
+            pdf_processor=pdf_processor
+        )
+        
+        async def run():
+            papers = await coordinator.search_and_create_papers("test")
+            self.assertTrue(await coordinator.wait_for_prefetch())
+            
+            # The budget is spent, so a repeated search prefetches nothing
+            await coordinator.search_and_create_papers("test")
+            self.assertFalse(coordinator.prefetch_tasks)
+            return papers
+        
+        loop = asyncio.new_event_loop()
+        try:
+            papers = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        
+        self.assertEqual(len(papers["google_scholar"]) + len(papers["semantic_scholar"]), 4)
+        pdf_processor.download_manager.download_papers.assert_awaited_once()
+        self.assertEqual(
+            pdf_processor.download_manager.download_papers.await_args.kwargs["max_downloads"], 3
+        )
+        self.assertEqual(coordinator.prefetch_stats, {"downloads": 3, "bytes": 300, "triaged": 3})
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_overlapping_prefetches_share_the_budget(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that overlapping prefetches never download more than the budget in total."""
+        pdf_processor = self._make_prefetch_processor(delay=0.05)
+        coordinator = AsyncSearchCoordinator(
+            cache_dir=self.cache_dir,
+            prefetch_max_downloads=3,
+            pdf_processor=pdf_processor
+        )
+        
+        papers = [
+            PaperSource(
+                title=f"Paper {i}",
+                pdf_url=f"https://example.com/{i}.pdf",
+                source_tool="test",
+                search_term="test"
+            )
+            for i in range(5)
+        ]
+        
+        async def run():
+            # The second prefetch starts while the first is still downloading
+            coordinator.start_prefetch(papers[:2])
+            coordinator.start_prefetch(papers[2:])
+            self.assertTrue(await coordinator.wait_for_prefetch())
+        
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(run())
+        finally:
+            loop.close()
+        
+        budgets = [
+            call.kwargs["max_downloads"]
+            for call in pdf_processor.download_manager.download_papers.await_args_list
+        ]
+        self.assertEqual(budgets, [3, 1])
+        self.assertEqual(coordinator.prefetch_stats["downloads"], 3)
+        self.assertEqual(coordinator.prefetch_stats["bytes"], 300)
+        
+        # Papers left over by the budget may be prefetched later
+        self.assertEqual(coordinator._prefetched_ids, {paper.id for paper in papers[:3]})
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_streamed_sources_share_the_prefetch_budget(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that prefetches started per streamed source stay within the budget in total."""
+        def slow_google_scholar(*args, **kwargs):
+            time.sleep(0.1)
+            return self.google_scholar_results
+        
+        mock_google_scholar.return_value.run.side_effect = slow_google_scholar
+        mock_semantic_scholar.return_value.run.return_value = self.semantic_scholar_results
+        
+        pdf_processor = self._make_prefetch_processor(delay=0.2)
+        coordinator = AsyncSearchCoordinator(
+            cache_dir=self.cache_dir,
+            prefetch=True,
+            prefetch_max_downloads=3,
+            pdf_processor=pdf_processor
+        )
+        
+        async def run():
+            papers = [
+                paper async for paper in coordinator.search_and_create_papers_stream("test")
+            ]
+            self.assertTrue(await coordinator.wait_for_prefetch())
+            return papers
+        
+        loop = asyncio.new_event_loop()
+        try:
+            papers = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        
+        # Each source started a prefetch while the first was still downloading
+        self.assertEqual(len(papers), 4)
+        budgets = [
+            call.kwargs["max_downloads"]
+            for call in pdf_processor.download_manager.download_papers.await_args_list
+        ]
+        self.assertEqual(budgets, [3, 1])
+        self.assertEqual(coordinator.prefetch_stats["downloads"], 3)
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_prefetched_pdfs_are_download_cache_hits_for_the_tool(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that a PDF prefetched by the coordinator is a cache hit for another processor on the same cache."""
+        mock_google_scholar.return_value.run.return_value = []
+        
+        pdf_cache_dir = os.path.join(self.cache_dir, "pdf_processor")
+        requests = []
+        
+        async def paper(request):
+            requests.append(request.path)
+            return web.Response(body=b"%PDF-1.4\n" + b"0" * 1000, content_type="application/pdf")
+        
+        async def run():
+            app = web.Application()
+            app.router.add_get("/paper.pdf", paper)
+            server = TestServer(app)
+            await server.start_server()
+            
+            # The tool's processor exists before the prefetch, as it does in a crew
+            tool_processor = PDFProcessor(cache_dir=pdf_cache_dir, marker_wrapper=MagicMock(), parse_workers=0)
+            prefetch_processor = PDFProcessor(cache_dir=pdf_cache_dir, marker_wrapper=MagicMock(), parse_workers=0)
+            
+            try:
+                url = str(server.make_url("/paper.pdf"))
+                mock_semantic_scholar.return_value.run.return_value = [
+                    dict(self.semantic_scholar_results[0], pdf_url=url)
+                ]
+                
+                coordinator = AsyncSearchCoordinator(
+                    cache_dir=self.cache_dir,
+                    prefetch=True,
+                    pdf_processor=prefetch_processor
+                )
+                await coordinator.search_and_create_papers("test")
+                self.assertTrue(await coordinator.wait_for_prefetch())
+                self.assertEqual(coordinator.prefetch_stats["downloads"], 1)
+                
+                path = await tool_processor.download_manager.download(url)
+            finally:
+                await tool_processor.download_manager.close()
+                await prefetch_processor.download_manager.close()
+                await server.close()
+            
+            return path
+        
+        loop = asyncio.new_event_loop()
+        try:
+            path = loop.run_until_complete(run())
+        finally:
+            loop.close()
+        
+        self.assertTrue(path and os.path.exists(path))
+        self.assertEqual(requests, ["/paper.pdf"])
+    
+    @patch('crewkb.utils.search.coordinator.DirectGoogleScholarTool')
+    @patch('crewkb.utils.search.coordinator.SemanticScholarTool')
+    def test_search_and_create_papers_does_not_prefetch_by_default(self, mock_semantic_scholar, mock_google_scholar):
+        """Test that prefetching is opt-in."""
+        mock_google_scholar.return_value.run.return_value = self.google_scholar_results
+        mock_semantic_scholar.return_value.run.return_value = self.semantic_scholar_results
+        
+        pdf_processor = MagicMock()
+        coordinator = AsyncSearchCoordinator(cache_dir=self.cache_dir, pdf_processor=pdf_processor)
+        
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(coordinator.search_and_create_papers("test"))
+        finally:
+            loop.close()
+        
+        self.assertFalse(coordinator.prefetch_tasks)
+        pdf_processor.download_manager.download_papers.assert_not_called()
@@ -0,0 +1,152 @@
+"""
+Tests for the BrowserPool.
+
+This module contains tests for the process-wide pool of warm headless browsers
+shared by the crawl4ai-based tools.
+"""
+
+import asyncio
+import unittest
+from unittest.mock import patch, MagicMock, AsyncMock
+
+from crawl4ai.async_configs import BrowserConfig
+
+from crewkb.utils.browser_pool import BrowserPool, get_browser_pool, _pools
+
+
+def _make_crawler():
+    """Create a mock AsyncWebCrawler instance."""
+    crawler = MagicMock()
+    crawler.start = AsyncMock()
+    crawler.close = AsyncMock()
+    crawler.arun = AsyncMock(return_value=MagicMock(success=True))
+    return crawler
+
+
+class TestBrowserPool(unittest.TestCase):
+    """Tests for the BrowserPool class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        patcher = patch("crewkb.utils.browser_pool.AsyncWebCrawler")
+        self.mock_crawler_class = patcher.start()
+        self.mock_crawler_class.side_effect = lambda **kwargs: _make_crawler()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_warm_browser_across_calls(self):
+        """Test that sequential calls from separate event loops share a browser."""
+        pool = BrowserPool(size=1, max_pages_per_browser=10)
+        self.addCleanup(pool.close)
+
+        # Each tool call runs in its own asyncio.run loop
+        for _ in range(3):
+            result = asyncio.run(pool.arun("https://example.com"))
+            self.assertTrue(result.success)
+
+        stats = pool.get_stats()
+        self.assertEqual(stats["launches"], 1)
+        self.assertEqual(stats["pages"], 3)
+        self.assertEqual(self.mock_crawler_class.call_count, 1)
+
+    def test_recycles_after_max_pages(self):
+        """Test that a browser is replaced after serving max_pages_per_browser."""
+        pool = BrowserPool(size=1, max_pages_per_browser=2)
+        self.addCleanup(pool.close)
+
+        for _ in range(5):
+            asyncio.run(pool.arun("https://example.com"))
+
+        stats = pool.get_stats()
+        self.assertEqual(stats["launches"], 3)
+        self.assertEqual(stats["recycled"], 2)
+
+    def test_retires_browser_on_crash(self):
+        """Test that a browser that raises is closed and replaced."""
+        crashed = _make_crawler()
+        crashed.arun.side_effect = Exception("Target closed")
+        healthy = _make_crawler()
+        self.mock_crawler_class.side_effect = [crashed, healthy]
+
+        pool = BrowserPool(size=1)
+        self.addCleanup(pool.close)
+
+        with self.assertRaises(Exception):
+            asyncio.run(pool.arun("https://example.com"))
+        crashed.close.assert_awaited_once()
+
+        result = asyncio.run(pool.arun("https://example.com"))
+        self.assertTrue(result.success)
+        self.assertEqual(pool.get_stats()["crashes"], 1)
+
+    def test_limits_concurrent_leases_to_pool_size(self):
+        """Test that concurrent calls never launch more browsers than the pool size."""
+        pool = BrowserPool(size=2)
+        self.addCleanup(pool.close)
+
+        async def run_many():
+            return await asyncio.gather(
+                *(pool.arun(f"https://example.com/{i}") for i in range(6))
+            )
+
+        results = asyncio.run(run_many())
+
+        self.assertEqual(len(results), 6)
+        self.assertLessEqual(pool.get_stats()["launches"], 2)
+
+    def test_warmup_and_close(self):
+        """Test that warmup launches every slot and close shuts them down."""
+        pool = BrowserPool(size=2)
+        pool.warmup()
+
+        stats = pool.get_stats()
+        self.assertEqual(stats["launches"], 2)
+        self.assertEqual(stats["idle_browsers"], 2)
+
+        pool.close()
+
+        self.assertTrue(pool.closed)
+        self.assertEqual(pool.get_stats()["live_browsers"], 0)
+        with self.assertRaises(RuntimeError):
+            asyncio.run(pool.arun("https://example.com"))
+
+
+class TestGetBrowserPool(unittest.TestCase):
+    """Tests for the get_browser_pool function."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.name = "test_get_browser_pool"
+        self.addCleanup(lambda: _pools.pop(self.name, None))
+
+    def test_returns_existing_pool(self):
+        """Test that the same pool is returned for an equal configuration."""
+        pool = get_browser_pool(
+            self.name, browser_config=BrowserConfig(headless=True, user_agent_mode="random")
+        )
+
+        with self.assertNoLogs("crewkb.utils.browser_pool", level="WARNING"):
+            same_pool = get_browser_pool(
+                self.name, browser_config=BrowserConfig(headless=True, user_agent_mode="random")
+            )
+
+        self.assertIs(same_pool, pool)
+
+    def test_warns_on_differing_configuration(self):
+        """Test that a differing configuration for an existing pool is reported."""
+        pool = get_browser_pool(self.name, browser_config=BrowserConfig(headless=True))
+
+        with self.assertLogs("crewkb.utils.browser_pool", level="WARNING") as logs:
+            same_pool = get_browser_pool(
+                self.name,
+                browser_config=BrowserConfig(headless=False),
+                max_pages_per_browser=5
+            )
+
+        self.assertIs(same_pool, pool)
+        self.assertIn("browser_config", logs.output[0])
+        self.assertIn("max_pages_per_browser=5", logs.output[0])
+        self.assertTrue(pool.browser_config.headless)
+
+
+if __name__ == "__main__":
+    unittest.main()
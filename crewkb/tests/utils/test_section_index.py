@@ -0,0 +1,145 @@
+"""
+Tests for the SectionIndexer.
+
+This module contains tests for the single-pass engine that splits markdown
+into sections for the PDF, content and flow code.
+"""
+
+import random
+import unittest
+
+from crewkb.utils.section_index import (
+    PAPER_SECTION_MARKERS,
+    TOP_HEADING_PATTERN,
+    SectionIndexer,
+    get_section_indexer
+)
+
+
+def _line_by_line_sections(markdown, section_markers):
+    """Split markdown the way MarkerWrapper.extract_sections used to."""
+    sections = {}
+    current_section = None
+    current_content = []
+
+    for line in markdown.split("\n"):
+        matched_section = None
+        if line.startswith("#"):
+            heading_text = line.lstrip("#").strip().lower()
+            for section, markers in section_markers.items():
+                if any(marker in heading_text for marker in markers):
+                    matched_section = section
+                    break
+
+        if matched_section:
+            if current_section:
+                sections[current_section] = "\n".join(current_content)
+            current_section = matched_section
+            current_content = [line]
+        elif current_section:
+            current_content.append(line)
+
+    if current_section:
+        sections[current_section] = "\n".join(current_content)
+
+    return sections
+
+
+class TestSectionIndexer(unittest.TestCase):
+    """Tests for the SectionIndexer class."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.markdown = "\n".join([
+            "# A Study",
+            "Preamble",
+            "## Abstract",
+            "We studied things.",
+            "## 1 Introduction",
+            "Background text.",
+            "### Prior work",
+            "More background.",
+            "## Results and Discussion",
+            "It worked.",
+            "## References",
+            "[1] A paper."
+        ])
+
+    def test_extracts_paper_sections(self):
+        """Test that matched headings start sections and others stay in their section."""
+        sections = get_section_indexer(PAPER_SECTION_MARKERS).extract(self.markdown)
+
+        self.assertEqual(list(sections), ["abstract", "introduction", "results", "references"])
+        self.assertEqual(sections["abstract"], "## Abstract\nWe studied things.")
+        self.assertEqual(
+            sections["introduction"],
+            "## 1 Introduction\nBackground text.\n### Prior work\nMore background."
+        )
+        self.assertEqual(sections["references"], "## References\n[1] A paper.")
+
+    def test_returns_offsets(self):
+        """Test that sections are located by offsets into the text."""
+        spans = get_section_indexer(PAPER_SECTION_MARKERS).index(self.markdown)
+
+        abstract = spans[0]
+        self.assertEqual(abstract.name, "abstract")
+        self.assertEqual(self.markdown[abstract.start:abstract.body_start], "## Abstract\n")
+        self.assertEqual(self.markdown[abstract.body_start:abstract.end], "We studied things.")
+
+    def test_higher_priority_marker_wins(self):
+        """Test that a heading matching several sections belongs to the first one listed."""
+        indexer = SectionIndexer({"first": ["ab"], "second": ["xa"]})
+
+        self.assertEqual(list(indexer.extract("# xab\ntext")), ["first"])
+
+    def test_matches_line_by_line_extraction(self):
+        """Test that the engine agrees with line-by-line extraction on random documents."""
+        rng = random.Random(0)
+        vocabulary = [
+            "# Abstract", "## Methods", "### Materials and Methods", "# Summary of Findings",
+            "#Results", "## Discussion", "# Other", "text", "more text", "", "results here",
+            "## CONCLUSIONS", "# Background and methods"
+        ]
+        indexer = get_section_indexer(PAPER_SECTION_MARKERS)
+
+        for _ in range(200):
+            markdown = "\n".join(rng.choice(vocabulary) for _ in range(rng.randint(0, 30)))
+            self.assertEqual(
+                indexer.extract(markdown),
+                _line_by_line_sections(markdown, PAPER_SECTION_MARKERS)
+            )
+
+    def test_every_heading_starts_a_section(self):
+        """Test that without markers every heading is a section named after its text."""
+        content = "# Overview\nAbout it.\n  ## Key Facts\nFact.\n### Detail\nMore.\n## FAQs\n"
+        indexer = get_section_indexer(heading_pattern=TOP_HEADING_PATTERN)
+
+        self.assertEqual(indexer.extract(content, include_heading=False), {
+            "Overview": "About it.",
+            "Key Facts": "Fact.\n### Detail\nMore.",
+            "FAQs": ""
+        })
+
+    def test_lines_mentioning_markers_start_sections(self):
+        """Test that without a heading pattern any line containing a marker is a heading."""
+        content = "Title\nOverview of the disease\nIt is common.\nCommon signs and symptoms\nFever."
+        indexer = get_section_indexer(
+            {"overview": ["overview"], "symptoms": ["symptoms", "signs"]},
+            heading_pattern=None
+        )
+
+        self.assertEqual(indexer.extract(content, include_heading=False), {
+            "overview": "It is common.",
+            "symptoms": "Fever."
+        })
+
+    def test_reuses_compiled_indexers(self):
+        """Test that indexers are compiled once per set of settings."""
+        self.assertIs(
+            get_section_indexer(PAPER_SECTION_MARKERS),
+            get_section_indexer(dict(PAPER_SECTION_MARKERS))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
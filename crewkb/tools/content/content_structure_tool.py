@@ -9,6 +9,8 @@ from typing import Dict, List
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from crewkb.utils.section_index import TOP_HEADING_PATTERN, get_section_indexer
+
 
 class ContentStructureToolInput(BaseModel):
     """Input schema for ContentStructureTool."""
@@ -123,34 +125,9 @@ class ContentStructureTool(BaseTool):
         Returns:
             A dictionary mapping section names to section content.
         """
-        sections = {}
-        lines = content.split("\n")
-        
-        current_section = None
-        current_content = []
-        
-        for line in lines:
-            # Check if this line is a section heading
-            if (line.strip().startswith("# ") or 
-                line.strip().startswith("## ")):
-                # If we were already processing a section, save it
-                if current_section:
-                    sections[current_section] = "\n".join(current_content)
-                
-                # Start a new section
-                # Extract section name
-                section_line = line.strip()
-                current_section = section_line.replace("# ", "").replace("## ", "")
-                current_content = []
-            elif current_section:
-                # Add this line to the current section
-                current_content.append(line)
-        
-        # Save the last section
-        if current_section:
-            sections[current_section] = "\n".join(current_content)
-        
-        return sections
+        # Every level 1 or 2 heading starts a section named after its text
+        indexer = get_section_indexer(heading_pattern=TOP_HEADING_PATTERN)
+        return indexer.extract(content, include_heading=False)
     
     def _validate_structure(
         self, 
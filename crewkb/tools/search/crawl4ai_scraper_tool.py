@@ -16,9 +16,10 @@ from urllib.parse import urlparse
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from crawl4ai import AsyncWebCrawler
 from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig, CacheMode
 
+from crewkb.utils.browser_pool import get_browser_pool
+
 
 class Crawl4AIScraperToolInput(BaseModel):
     """Input schema for Crawl4AIScraperTool."""
@@ -131,54 +132,58 @@ class Crawl4AIScraperTool(BaseTool):
             cache_mode=CacheMode.ENABLED if use_cache else CacheMode.DISABLED
         )
         
+        # Browsers are shared across calls and retries via a process-wide pool
+        browser_pool = get_browser_pool(
+            "crawl4ai_scraper", browser_config=browser_config
+        )
+        
         # Implement retry logic with exponential backoff
         retry_count = 0
         base_delay = 1.0
         
         while retry_count <= max_retries:
             try:
-                # Create and run the crawler
-                async with AsyncWebCrawler(config=browser_config) as crawler:
-                    result = await crawler.arun(url=url, config=run_config)
-                    
-                    if not result.success:
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            delay = base_delay * (2 ** (retry_count - 1))
-                            print(
-                                f"Retry {retry_count}/{max_retries} "
-                                f"after {delay}s delay..."
-                            )
-                            await asyncio.sleep(delay)
-                            continue
-                        else:
-                            return (
-                                f"Error scraping webpage after {max_retries} "
-                                f"retries: {result.error_message}"
-                            )
-                    
-                    # Save the markdown to a file
-                    filename = self._get_filename_from_url(url)
-                    file_path = Path("data/crawl4ai") / filename
-                    file_path.parent.mkdir(exist_ok=True, parents=True)
-                    
-                    # Extract the markdown content
-                    if hasattr(result.markdown, 'raw_markdown'):
-                        markdown_content = result.markdown.raw_markdown
+                # Lease a warm browser from the shared pool and run the crawl
+                result = await browser_pool.arun(url=url, config=run_config)
+                
+                if not result.success:
+                    if retry_count < max_retries:
+                        retry_count += 1
+                        delay = base_delay * (2 ** (retry_count - 1))
+                        print(
+                            f"Retry {retry_count}/{max_retries} "
+                            f"after {delay}s delay..."
+                        )
+                        await asyncio.sleep(delay)
+                        continue
                     else:
-                        markdown_content = str(result.markdown)
-                    
-                    # Save to file
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        f.write(markdown_content)
-                    
-                    # Cache the result
-                    if use_cache:
-                        self._cache_result(url, markdown_content, file_path)
-                    
-                    # Format and return the result
-                    return self._format_result(result, url, str(file_path))
-                    
+                        return (
+                            f"Error scraping webpage after {max_retries} "
+                            f"retries: {result.error_message}"
+                        )
+                
+                # Save the markdown to a file
+                filename = self._get_filename_from_url(url)
+                file_path = Path("data/crawl4ai") / filename
+                file_path.parent.mkdir(exist_ok=True, parents=True)
+                
+                # Extract the markdown content
+                if hasattr(result.markdown, 'raw_markdown'):
+                    markdown_content = result.markdown.raw_markdown
+                else:
+                    markdown_content = str(result.markdown)
+                
+                # Save to file
+                with open(file_path, "w", encoding="utf-8") as f:
+                    f.write(markdown_content)
+                
+                # Cache the result
+                if use_cache:
+                    self._cache_result(url, markdown_content, file_path)
+                
+                # Format and return the result
+                return self._format_result(result, url, str(file_path))
+                
             except Exception as e:
                 if retry_count < max_retries:
                     retry_count += 1
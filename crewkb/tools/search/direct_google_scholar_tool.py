@@ -18,10 +18,11 @@ from bs4 import BeautifulSoup
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
-from crawl4ai import AsyncWebCrawler
 from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig, CacheMode
 from crawl4ai.extraction_strategy import JsonCssExtractionStrategy
 
+from crewkb.utils.browser_pool import get_browser_pool
+
 
 class DirectGoogleScholarToolInput(BaseModel):
     """Input schema for DirectGoogleScholarTool."""
@@ -269,102 +270,116 @@ class DirectGoogleScholarTool(BaseTool):
             cache_mode=CacheMode.ENABLED if use_cache else CacheMode.DISABLED,
             wait_for=".gs_ri",  # Wait for search results to load
             page_timeout=30000,  # 30 seconds timeout
+            # Pooled browsers are warm for many pages, so draw a fresh user
+            # agent (and sec-ch-ua header) for every request rather than
+            # once per browser launch
+            user_agent_mode="random",
+            magic=True,  # Enhanced anti-detection
             # TODO: Consider adding simulate_user=True if supported and beneficial
         )
 
+        # Browsers are shared across calls and retries via a process-wide pool
+        browser_pool = get_browser_pool(
+            "google_scholar", browser_config=browser_config
+        )
+
         # Implement retry logic with exponential backoff
         retry_count = 0
         base_delay = 1.0
 
         while retry_count <= max_retries:
             try:
-                # Create and run the crawler
-                async with AsyncWebCrawler(config=browser_config) as crawler:
-                    # Pass magic=True to arun for enhanced anti-detection
-                    result = await crawler.arun(url=url, config=run_config, magic=True)
-
-                    if not result.success:
-                        if retry_count < max_retries:
-                            retry_count += 1
-                            delay = base_delay * (2 ** (retry_count - 1))
-                            print(
-                                f"Retry {retry_count}/{max_retries} "
-                                f"after {delay}s delay..."
+                # Lease a warm browser from the shared pool and run the crawl
+                result = await browser_pool.arun(url=url, config=run_config)
+
+                if not result.success:
+                    if retry_count < max_retries:
+                        retry_count += 1
+                        delay = base_delay * (2 ** (retry_count - 1))
+                        print(
+                            f"Retry {retry_count}/{max_retries} "
+                            f"after {delay}s delay..."
+                        )
+                        await asyncio.sleep(delay)
+                        continue
+                    else:
+                        # Try LLM-based extraction as a fallback
+                        if use_llm_fallback:
+                            return await self._fallback_to_llm(
+                                url, query, since_year, only_reviews, page
                             )
-                            await asyncio.sleep(delay)
-                            continue
                         else:
-                            # Try LLM-based extraction as a fallback
-                            if use_llm_fallback:
-                                return await self._fallback_to_llm(
-                                    url, query, since_year, only_reviews, page
-                                )
-                            else:
-                                return json.dumps({
-                                    "error": (
-                                        f"Error searching Google Scholar after "
-                                        f"{max_retries} retries: "
-                                        f"{result.error_message}"
-                                    ),
-                                    "query": query,
-                                    "filters": {
-                                        "since_year": since_year,
-                                        "only_reviews": only_reviews
-                                    },
-                                    "page": page,
-                                    "results": []
-                                })
-
-                    # Parse the extracted content
-                    search_results = json.loads(result.extracted_content)
-
-                    # Extract PDF links
-                    pdf_links = await self._extract_pdf_links(
-                        crawler, url, pdf_links_schema
-                    )
-
-                    # Extract related searches
-                    related_searches = await self._extract_related_searches(
-                        crawler, url, related_searches_schema
-                    )
-
-                    # Extract pagination info
-                    pagination_info = await self._extract_pagination_info(
-                        crawler, url, page
-                    )
-
-                    # Extract total results count
-                    total_results_count = await self._extract_total_results_count(
-                        crawler, url
-                    )
-
-                    # Process the search results to extract year and citation count
-                    processed_results = self._process_search_results(
-                        search_results, pdf_links
-                    )
-
-                    # Format the results
-                    formatted_result = self._format_results(
-                        query,
-                        since_year,
-                        only_reviews,
-                        page,
-                        processed_results,
-                        related_searches,
-                        pagination_info,
-                        total_results_count,
-                    )
-
-                    # Save the results to a file
-                    # file_path = self._save_results_to_file(
-                    #     query, since_year, only_reviews, page, formatted_result
-                    # )
-
-                    # Cache the result
-                    if use_cache:
-                        self._cache_result(cache_key, formatted_result)
-
-                    return formatted_result
+                            return json.dumps({
+                                "error": (
+                                    f"Error searching Google Scholar after "
+                                    f"{max_retries} retries: "
+                                    f"{result.error_message}"
+                                ),
+                                "query": query,
+                                "filters": {
+                                    "since_year": since_year,
+                                    "only_reviews": only_reviews
+                                },
+                                "page": page,
+                                "results": []
+                            })
+
+                # Parse the extracted content
+                search_results = json.loads(result.extracted_content)
+
+                # Run every secondary extraction against the HTML
+                # snapshot we already have instead of re-fetching the
+                # page once per extraction
+                html = result.html or ""
+                soup = BeautifulSoup(html, "html.parser")
+
+                # Extract PDF links
+                pdf_links = self._extract_pdf_links(
+                    html, url, pdf_links_schema
+                )
+
+                # Extract related searches
+                related_searches = self._extract_related_searches(
+                    html, url, related_searches_schema
+                )
+
+                # Extract pagination info
+                pagination_info = self._extract_pagination_info(
+                    soup, page
+                )
+
+                # Extract total results count
+                total_results_count = self._extract_total_results_count(
+                    soup
+                )
+
+                # Process the search results to extract year and citation count
+                processed_results = self._process_search_results(
+                    search_results, pdf_links
+                )
+
+                # Format the results
+                formatted_result = self._format_results(
+                    query,
+                    since_year,
+                    only_reviews,
+                    page,
+                    processed_results,
+                    related_searches,
+                    pagination_info,
+                    total_results_count,
+                )
+
+                # Save the results to a file
+                # file_path = self._save_results_to_file(
+                #     query, since_year, only_reviews, page, formatted_result
+                # )
+
+                # Cache the result
+                if use_cache:
+                    self._cache_result(cache_key, formatted_result)
+
+                return formatted_result
 
             except Exception as e:
                 if retry_count < max_retries:
@@ -586,9 +601,9 @@ class DirectGoogleScholarTool(BaseTool):
 
         return file_path
 
-    async def _extract_pdf_links(
+    def _extract_pdf_links(
         self,
-        crawler: AsyncWebCrawler,
+        html: str,
         url: str,
         schema: Dict[str, Any]
     ) -> List[Dict[str, str]]:
@@ -596,7 +611,7 @@ class DirectGoogleScholarTool(BaseTool):
         Extract PDF links from the Google Scholar page.
 
         Args:
-            crawler: The AsyncWebCrawler instance.
+            html: The HTML of the fetched Google Scholar page.
             url: The Google Scholar URL.
             schema: The extraction schema for PDF links.
 
@@ -604,32 +619,16 @@ class DirectGoogleScholarTool(BaseTool):
             A list of PDF links with their sources.
         """
         try:
-            # Create the extraction strategy
+            # Run the extraction strategy directly on the fetched HTML
             extraction_strategy = JsonCssExtractionStrategy(schema)
-
-            # Configure the crawler run
-            run_config = CrawlerRunConfig(
-                extraction_strategy=extraction_strategy,
-                cache_mode=CacheMode.BYPASS  # Don't cache this request
-            )
-
-            # Run the crawler
-            result = await crawler.arun(url=url, config=run_config)
-
-            if not result.success:
-                return []
-
-            # Parse the extracted content
-            pdf_links = json.loads(result.extracted_content)
-
-            return pdf_links
+            return extraction_strategy.extract(url, html)
         except Exception as e:
             print(f"Error extracting PDF links: {str(e)}")
             return []
 
-    async def _extract_related_searches(
+    def _extract_related_searches(
         self,
-        crawler: AsyncWebCrawler,
+        html: str,
         url: str,
         schema: Dict[str, Any]
     ) -> List[str]:
@@ -637,7 +636,7 @@ class DirectGoogleScholarTool(BaseTool):
         Extract related searches from the Google Scholar page.
 
         Args:
-            crawler: The AsyncWebCrawler instance.
+            html: The HTML of the fetched Google Scholar page.
             url: The Google Scholar URL.
             schema: The extraction schema for related searches.
 
@@ -645,23 +644,9 @@ class DirectGoogleScholarTool(BaseTool):
             A list of related search terms.
         """
         try:
-            # Create the extraction strategy
+            # Run the extraction strategy directly on the fetched HTML
             extraction_strategy = JsonCssExtractionStrategy(schema)
-
-            # Configure the crawler run
-            run_config = CrawlerRunConfig(
-                extraction_strategy=extraction_strategy,
-                cache_mode=CacheMode.BYPASS  # Don't cache this request
-            )
-
-            # Run the crawler
-            result = await crawler.arun(url=url, config=run_config)
-
-            if not result.success:
-                return []
-
-            # Parse the extracted content
-            related_searches = json.loads(result.extracted_content)
+            related_searches = extraction_strategy.extract(url, html)
 
             # Extract the search terms
             return [item["search_term"] for item in related_searches]
@@ -669,40 +654,22 @@ class DirectGoogleScholarTool(BaseTool):
             print(f"Error extracting related searches: {str(e)}")
             return []
 
-    async def _extract_pagination_info(
+    def _extract_pagination_info(
         self,
-        crawler: AsyncWebCrawler,
-        url: str,
+        soup: BeautifulSoup,
         current_page: int
     ) -> Dict[str, Any]:
         """
         Extract pagination information from the Google Scholar page.
 
         Args:
-            crawler: The AsyncWebCrawler instance.
-            url: The Google Scholar URL.
+            soup: The parsed HTML of the fetched Google Scholar page.
             current_page: The current page number.
 
         Returns:
             A dictionary containing pagination information.
         """
         try:
-            # Get the HTML content
-            html_result = await crawler.arun(
-                url=url,
-                config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
-            )
-
-            if not html_result.success:
-                return {
-                    "current_page": current_page,
-                    "next_page_url": None,
-                    "total_pages": 1
-                }
-
-            # Parse the HTML
-            soup = BeautifulSoup(html_result.html, "html.parser")
-
             # Find the pagination links
             pagination_links = soup.select("#gs_n a")
 
@@ -736,34 +703,17 @@ class DirectGoogleScholarTool(BaseTool):
                 "total_pages": 1
             }
 
-    async def _extract_total_results_count(
-        self,
-        crawler: AsyncWebCrawler,
-        url: str
-    ) -> str:
+    def _extract_total_results_count(self, soup: BeautifulSoup) -> str:
         """
         Extract the total results count from the Google Scholar page.
 
         Args:
-            crawler: The AsyncWebCrawler instance.
-            url: The Google Scholar URL.
+            soup: The parsed HTML of the fetched Google Scholar page.
 
         Returns:
             The total results count as a string.
         """
         try:
-            # Get the HTML content
-            html_result = await crawler.arun(
-                url=url,
-                config=CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
-            )
-
-            if not html_result.success:
-                return "Unknown"
-
-            # Parse the HTML
-            soup = BeautifulSoup(html_result.html, "html.parser")
-
             # Find the results count
             results_count = soup.select_one("#gs_ab_md")
 
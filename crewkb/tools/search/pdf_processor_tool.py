@@ -71,7 +71,25 @@ class PDFProcessorTool(BaseTool):
             A dictionary containing the processed PDF data
         """
         # Run the async method in a new event loop
-        return asyncio.run(self._arun(input_data))
+        return asyncio.run(self._arun_once(input_data))
+    
+    async def _arun_once(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Run the tool in a short-lived event loop.
+        
+        The download session is bound to the event loop, so it is closed
+        before the loop ends.
+        
+        Args:
+            input_data: A dictionary containing the input data
+            
+        Returns:
+            A dictionary containing the processed PDF data
+        """
+        try:
+            return await self._arun(input_data)
+        finally:
+            await self.pdf_processor.download_manager.close()
     
     async def _arun(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -167,12 +185,14 @@ class PDFProcessorTool(BaseTool):
             except Exception as e:
                 logger.error(f"Failed to create PaperSource: {str(e)}")
         
-        # Process the papers
-        results = await self.pdf_processor.process_papers(
+        # Process the papers, collecting results as they stream in
+        results = {}
+        async for paper_id, result in self.pdf_processor.process_papers(
             paper_sources,
             output_dir=output_dir,
             max_concurrent=max_concurrent
-        )
+        ):
+            results[paper_id] = result
         
         # Format the results
         formatted_results = {}
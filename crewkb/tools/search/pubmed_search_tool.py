@@ -6,7 +6,7 @@ using the Entrez API from the Bio package.
 """
 
 import os
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
@@ -61,6 +61,58 @@ class PubMedSearchTool(BaseTool):
         Raises:
             Exception: If the API request fails.
         """
+        error = self._configure_entrez()
+        if error:
+            return error
+        
+        try:
+            articles = self._fetch_articles(query, max_results, sort)
+            if not articles:
+                return f"No results found for query: {query}"
+            
+            # Format the results
+            return self._format_results(articles)
+        except Exception as e:
+            return f"Error performing PubMed search: {str(e)}"
+    
+    def search_papers(
+        self,
+        query: str,
+        max_results: int = 10,
+        sort: str = "relevance"
+    ) -> List[Dict[str, Any]]:
+        """
+        Search PubMed and return structured article data.
+        
+        Args:
+            query: The search query to perform.
+            max_results: The maximum number of results to return.
+            sort: How to sort results (relevance, date).
+            
+        Returns:
+            A list of dictionaries with the title, authors, year, journal,
+            date, pmid, url and abstract of each article.
+            
+        Raises:
+            RuntimeError: If Biopython is not installed or ENTREZ_EMAIL is not set.
+            Exception: If the API request fails.
+        """
+        error = self._configure_entrez()
+        if error:
+            raise RuntimeError(error)
+        
+        return [
+            self._parse_article(article)
+            for article in self._fetch_articles(query, max_results, sort)
+        ]
+    
+    def _configure_entrez(self) -> Optional[str]:
+        """
+        Configure the Entrez API from the environment.
+        
+        Returns:
+            An error message if the API cannot be used, None otherwise.
+        """
         if Entrez is None:
             return (
                 "Error: Biopython package not installed. "
@@ -79,35 +131,117 @@ class PubMedSearchTool(BaseTool):
         if api_key:
             Entrez.api_key = api_key
         
-        try:
-            # Search for articles
-            sort_method = "relevance" if sort == "relevance" else "pub date"
-            search_handle = Entrez.esearch(
-                db="pubmed",
-                term=query,
-                retmax=max_results,
-                sort=sort_method
-            )
-            search_results = Entrez.read(search_handle)
-            search_handle.close()
+        return None
+    
+    def _fetch_articles(
+        self,
+        query: str,
+        max_results: int,
+        sort: str
+    ) -> List[Dict[str, Any]]:
+        """
+        Search PubMed and fetch the details of the matching articles.
+        
+        Args:
+            query: The search query to perform.
+            max_results: The maximum number of results to return.
+            sort: How to sort results (relevance, date).
             
-            id_list = search_results["IdList"]
-            if not id_list:
-                return f"No results found for query: {query}"
+        Returns:
+            The list of article data from PubMed.
             
-            # Fetch article details
-            fetch_handle = Entrez.efetch(
-                db="pubmed",
-                id=id_list,
-                retmode="xml"
-            )
-            articles = Entrez.read(fetch_handle)["PubmedArticle"]
-            fetch_handle.close()
+        Raises:
+            Exception: If the API request fails.
+        """
+        # Search for articles
+        sort_method = "relevance" if sort == "relevance" else "pub date"
+        search_handle = Entrez.esearch(
+            db="pubmed",
+            term=query,
+            retmax=max_results,
+            sort=sort_method
+        )
+        search_results = Entrez.read(search_handle)
+        search_handle.close()
+        
+        id_list = search_results["IdList"]
+        if not id_list:
+            return []
+        
+        # Fetch article details
+        fetch_handle = Entrez.efetch(
+            db="pubmed",
+            id=id_list,
+            retmode="xml"
+        )
+        articles = Entrez.read(fetch_handle)["PubmedArticle"]
+        fetch_handle.close()
+        
+        return articles
+    
+    def _parse_article(self, article: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Extract the fields of a PubMed article.
+        
+        Args:
+            article: The article data from PubMed.
             
-            # Format the results
-            return self._format_results(articles)
-        except Exception as e:
-            return f"Error performing PubMed search: {str(e)}"
+        Returns:
+            A dictionary with the title, authors, year, journal, date, pmid,
+            url and abstract of the article; missing fields are None.
+        """
+        article_data = article["MedlineCitation"]
+        article_info = article_data["Article"]
+        
+        # Extract authors
+        authors = []
+        if "AuthorList" in article_info:
+            for author in article_info["AuthorList"]:
+                if "LastName" in author and "ForeName" in author:
+                    authors.append(
+                        f"{author['LastName']} {author['ForeName'][0]}"
+                    )
+        
+        # Extract journal and date
+        journal = article_info.get("Journal", {})
+        
+        year = None
+        pub_date = None
+        pub_date_info = journal.get("JournalIssue", {}).get("PubDate", {})
+        if "Year" in pub_date_info:
+            pub_date = str(pub_date_info["Year"])
+            year = int(pub_date) if pub_date.isdigit() else None
+            if "Month" in pub_date_info:
+                pub_date = f"{pub_date_info['Month']} {pub_date}"
+        
+        # Extract abstract
+        abstract = None
+        if "Abstract" in article_info:
+            abstract_parts = article_info["Abstract"].get(
+                "AbstractText", []
+            )
+            if abstract_parts:
+                if isinstance(abstract_parts, list):
+                    abstract = " ".join(
+                        str(part) for part in abstract_parts
+                    )
+                else:
+                    abstract = str(abstract_parts)
+        
+        # Extract PMID
+        pmid = article_data["PMID"]
+        pmid = pmid.get("#text") if isinstance(pmid, dict) else str(pmid)
+        
+        return {
+            "title": str(article_info.get("ArticleTitle", "")) or None,
+            "authors": authors,
+            "year": year,
+            "journal": journal.get("Title"),
+            "date": pub_date,
+            "pmid": pmid,
+            "url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/" if pmid else None,
+            "abstract": abstract
+        }
     
     def _format_results(self, articles: List[Dict[str, Any]]) -> str:
         """
@@ -122,56 +256,16 @@ class PubMedSearchTool(BaseTool):
         formatted = "PubMed Search Results:\n\n"
         
         for i, article in enumerate(articles, 1):
-            article_data = article["MedlineCitation"]
-            article_info = article_data["Article"]
-            
-            # Extract title
-            title = article_info.get("ArticleTitle", "No Title")
-            
-            # Extract authors
-            authors = []
-            if "AuthorList" in article_info:
-                for author in article_info["AuthorList"]:
-                    if "LastName" in author and "ForeName" in author:
-                        authors.append(
-                            f"{author['LastName']} {author['ForeName'][0]}"
-                        )
-            author_str = ", ".join(authors) if authors else "No Authors"
-            
-            # Extract journal and date
-            journal = article_info.get("Journal", {})
-            journal_title = journal.get("Title", "No Journal")
-            
-            pub_date = "No Date"
-            if "PubDate" in journal.get("JournalIssue", {}).get("PubDate", {}):
-                pub_date_info = journal["JournalIssue"]["PubDate"]
-                if "Year" in pub_date_info:
-                    pub_date = pub_date_info["Year"]
-                    if "Month" in pub_date_info:
-                        pub_date = f"{pub_date_info['Month']} {pub_date}"
-            
-            # Extract abstract
-            abstract = "No Abstract"
-            if "Abstract" in article_info:
-                abstract_parts = article_info["Abstract"].get(
-                    "AbstractText", []
-                )
-                if abstract_parts:
-                    if isinstance(abstract_parts, list):
-                        abstract = " ".join(
-                            str(part) for part in abstract_parts
-                        )
-                    else:
-                        abstract = str(abstract_parts)
+            paper = self._parse_article(article)
             
-            # Extract PMID
-            pmid = article_data["PMID"].get("#text", "No PMID")
+            author_str = ", ".join(paper["authors"]) if paper["authors"] else "No Authors"
+            abstract = paper["abstract"] or "No Abstract"
             
             # Format the article information
-            formatted += f"{i}. {title}\n"
+            formatted += f"{i}. {paper['title'] or 'No Title'}\n"
             formatted += f"   Authors: {author_str}\n"
-            formatted += f"   Journal: {journal_title}, {pub_date}\n"
-            formatted += f"   PMID: {pmid}\n"
+            formatted += f"   Journal: {paper['journal'] or 'No Journal'}, {paper['date'] or 'No Date'}\n"
+            formatted += f"   PMID: {paper['pmid'] or 'No PMID'}\n"
             formatted += f"   Abstract: {abstract[:200]}...\n\n"
         
         return formatted
@@ -8,7 +8,7 @@ Serper.dev Google Scholar API endpoint, which returns structured results.
 import os
 import json
 import requests
-from typing import Dict, Any
+from typing import Dict, List, Any
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
@@ -56,6 +56,85 @@ class SerperGoogleScholarTool(BaseTool):
         if not api_key:
             return "Error: SERPER_API_KEY environment variable not set"
         
+        try:
+            search_results = self._fetch_results(api_key, query, num_results)
+            
+            # Format results
+            formatted_results = self._format_results(
+                search_results, num_results
+            )
+            return formatted_results
+        except Exception as e:
+            return f"Error performing Google Scholar search: {str(e)}"
+    
+    def search_papers(
+        self,
+        query: str,
+        num_results: int = 5
+    ) -> List[Dict[str, Any]]:
+        """
+        Search Google Scholar and return structured paper data.
+        
+        Args:
+            query: The search query to perform.
+            num_results: The number of search results to return.
+            
+        Returns:
+            A list of dictionaries with the title, authors, year, journal,
+            url, pdf_url, citation_count and abstract of each paper.
+            
+        Raises:
+            RuntimeError: If the SERPER_API_KEY environment variable is not set.
+            Exception: If the API request fails.
+        """
+        api_key = os.getenv("SERPER_API_KEY")
+        if not api_key:
+            raise RuntimeError("SERPER_API_KEY environment variable not set")
+        
+        search_results = self._fetch_results(api_key, query, num_results)
+        
+        papers = []
+        for result in search_results.get("organic", [])[:num_results]:
+            authors = result.get("authors", "")
+            if isinstance(authors, str):
+                authors = [author.strip() for author in authors.split(",") if author.strip()]
+            
+            year = str(result.get("year", ""))
+            cited_by = str(result.get("cited_by", {}).get("value", ""))
+            
+            papers.append({
+                "title": result.get("title", "No Title"),
+                "authors": authors,
+                "year": int(year) if year.isdigit() else None,
+                "journal": result.get("publication") or None,
+                "url": result.get("link"),
+                "pdf_url": result.get("pdfUrl"),
+                "citation_count": int(cited_by) if cited_by.isdigit() else None,
+                "abstract": result.get("snippet")
+            })
+        
+        return papers
+    
+    def _fetch_results(
+        self,
+        api_key: str,
+        query: str,
+        num_results: int
+    ) -> Dict[str, Any]:
+        """
+        Request search results from the Serper API.
+        
+        Args:
+            api_key: The Serper API key.
+            query: The search query to perform.
+            num_results: The number of search results to return.
+            
+        Returns:
+            The raw search results from the API.
+            
+        Raises:
+            Exception: If the API request fails.
+        """
         url = "https://google.serper.dev/scholar"
         payload = json.dumps({
             "q": query,
@@ -66,20 +145,11 @@ class SerperGoogleScholarTool(BaseTool):
             'Content-Type': 'application/json'
         }
         
-        try:
-            response = requests.request(
-                "POST", url, headers=headers, data=payload
-            )
-            response.raise_for_status()
-            search_results = response.json()
-            
-            # Format results
-            formatted_results = self._format_results(
-                search_results, num_results
-            )
-            return formatted_results
-        except Exception as e:
-            return f"Error performing Google Scholar search: {str(e)}"
+        response = requests.request(
+            "POST", url, headers=headers, data=payload
+        )
+        response.raise_for_status()
+        return response.json()
     
     def _format_results(self, results: Dict[str, Any], num_results: int) -> str:
         """
@@ -0,0 +1,423 @@
+"""
+Browser pool for CrewKB.
+
+This module provides a process-wide pool of warm headless browsers shared by
+the crawl4ai-based tools, so Chromium is launched once per browser slot
+instead of once per call and per retry.
+"""
+
+import asyncio
+import atexit
+import logging
+import threading
+import time
+from typing import Any, Dict, Optional, Set
+
+from crawl4ai import AsyncWebCrawler
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig
+
+logger = logging.getLogger(__name__)
+
+# Default pool settings
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_PAGES_PER_BROWSER = 50
+DEFAULT_SHUTDOWN_TIMEOUT = 30.0
+
+
+class _PooledBrowser:
+    """A crawler owned by the pool together with its usage counter."""
+
+    def __init__(self, crawler: AsyncWebCrawler):
+        self.crawler = crawler
+        self.pages_served = 0
+
+
+class BrowserPool:
+    """
+    Pool of warm headless browsers.
+
+    Playwright browsers are bound to the event loop that launched them, while
+    the tools call ``asyncio.run`` once per invocation. The pool therefore
+    owns a background event loop on which every browser is launched and
+    driven; ``arun`` marshals each request onto that loop and hands the
+    result back to the caller's loop.
+
+    This class provides:
+    - A configurable number of warm browsers
+    - Exclusive leases, one page at a time per browser
+    - Recycling of browsers after a set number of pages or on a crash
+    - Launch and page latency statistics
+    - Clean shutdown on interpreter exit
+    """
+
+    def __init__(
+        self,
+        size: int = DEFAULT_POOL_SIZE,
+        max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER,
+        browser_config: Optional[BrowserConfig] = None
+    ):
+        """
+        Initialize the BrowserPool.
+
+        Args:
+            size: Number of browsers kept warm and leased concurrently.
+            max_pages_per_browser: Number of pages a browser serves before it
+                                   is closed and replaced by a fresh one.
+            browser_config: The crawl4ai browser configuration used to launch
+                            every browser in the pool.
+        """
+        if size < 1:
+            raise ValueError("size must be at least 1")
+        if max_pages_per_browser < 1:
+            raise ValueError("max_pages_per_browser must be at least 1")
+
+        self.size = size
+        self.max_pages_per_browser = max_pages_per_browser
+        self.browser_config = browser_config or BrowserConfig(headless=True)
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._idle: list = []
+        self._browsers: Set[_PooledBrowser] = set()
+        self._closed = False
+
+        self.stats: Dict[str, Any] = {
+            "launches": 0,
+            "launch_seconds": 0.0,
+            "pages": 0,
+            "page_seconds": 0.0,
+            "recycled": 0,
+            "crashes": 0
+        }
+
+    @property
+    def closed(self) -> bool:
+        """Whether the pool has been shut down."""
+        return self._closed
+
+    def _ensure_started(self) -> asyncio.AbstractEventLoop:
+        """
+        Start the pool's background event loop if it is not running yet.
+
+        Returns:
+            The pool's event loop.
+
+        Raises:
+            RuntimeError: If the pool has been closed.
+        """
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("Browser pool is closed")
+
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._semaphore = asyncio.Semaphore(self.size)
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="crewkb-browser-pool",
+                    daemon=True
+                )
+                self._thread.start()
+
+            return self._loop
+
+    async def _submit(self, coro) -> Any:
+        """
+        Run a coroutine on the pool's loop and await it from the caller's loop.
+
+        Args:
+            coro: The coroutine to run on the pool's loop.
+
+        Returns:
+            The result of the coroutine.
+        """
+        loop = self._ensure_started()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return await asyncio.wrap_future(future)
+
+    def warmup(self) -> None:
+        """
+        Launch every browser slot up front so the first leases are warm.
+
+        This blocks until the browsers have started and must not be called
+        from a running event loop; use ``await pool.awarmup()`` there.
+        """
+        loop = self._ensure_started()
+        asyncio.run_coroutine_threadsafe(self._warmup(), loop).result()
+
+    async def awarmup(self) -> None:
+        """Launch every browser slot up front from a running event loop."""
+        await self._submit(self._warmup())
+
+    async def arun(
+        self,
+        url: str,
+        config: Optional[CrawlerRunConfig] = None,
+        **kwargs
+    ) -> Any:
+        """
+        Crawl a URL with a browser leased from the pool.
+
+        Args:
+            url: The URL to crawl.
+            config: The crawler run configuration.
+            **kwargs: Additional keyword arguments for ``AsyncWebCrawler.arun``.
+
+        Returns:
+            The crawl4ai CrawlResult.
+        """
+        return await self._submit(self._arun(url, config, **kwargs))
+
+    async def _warmup(self) -> None:
+        """Fill the idle list up to the pool size (runs on the pool's loop)."""
+        missing = self.size - len(self._browsers)
+        if missing <= 0:
+            return
+
+        launched = await asyncio.gather(
+            *(self._launch() for _ in range(missing)),
+            return_exceptions=True
+        )
+        for browser in launched:
+            if isinstance(browser, Exception):
+                logger.warning(f"Failed to warm up browser: {str(browser)}")
+            else:
+                self._idle.append(browser)
+
+    async def _launch(self) -> _PooledBrowser:
+        """
+        Launch a new browser (runs on the pool's loop).
+
+        Returns:
+            The newly launched browser.
+        """
+        start_time = time.perf_counter()
+        crawler = AsyncWebCrawler(config=self.browser_config)
+        await crawler.start()
+
+        self.stats["launches"] += 1
+        self.stats["launch_seconds"] += time.perf_counter() - start_time
+
+        browser = _PooledBrowser(crawler)
+        self._browsers.add(browser)
+        return browser
+
+    async def _retire(self, browser: _PooledBrowser) -> None:
+        """
+        Close a browser and drop it from the pool (runs on the pool's loop).
+
+        Args:
+            browser: The browser to retire.
+        """
+        self._browsers.discard(browser)
+        try:
+            await browser.crawler.close()
+        except Exception as e:
+            logger.warning(f"Error closing pooled browser: {str(e)}")
+
+    async def _arun(
+        self,
+        url: str,
+        config: Optional[CrawlerRunConfig],
+        **kwargs
+    ) -> Any:
+        """
+        Lease a browser, crawl a URL and return the lease (runs on the pool's loop).
+
+        Args:
+            url: The URL to crawl.
+            config: The crawler run configuration.
+            **kwargs: Additional keyword arguments for ``AsyncWebCrawler.arun``.
+
+        Returns:
+            The crawl4ai CrawlResult.
+        """
+        async with self._semaphore:
+            # Prefer a warm browser and launch a fresh one only when none is idle
+            browser = self._idle.pop() if self._idle else await self._launch()
+
+            crashed = False
+            start_time = time.perf_counter()
+            try:
+                return await browser.crawler.arun(url=url, config=config, **kwargs)
+            except Exception:
+                crashed = True
+                raise
+            finally:
+                browser.pages_served += 1
+                self.stats["pages"] += 1
+                self.stats["page_seconds"] += time.perf_counter() - start_time
+
+                if crashed:
+                    self.stats["crashes"] += 1
+                    await self._retire(browser)
+                elif (
+                    browser.pages_served >= self.max_pages_per_browser
+                    or len(self._browsers) > self.size
+                    or self._closed
+                ):
+                    self.stats["recycled"] += 1
+                    await self._retire(browser)
+                else:
+                    self._idle.append(browser)
+
+    async def _close_all(self) -> None:
+        """Close every browser in the pool (runs on the pool's loop)."""
+        browsers = list(self._browsers)
+        self._idle = []
+        await asyncio.gather(
+            *(self._retire(browser) for browser in browsers),
+            return_exceptions=True
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get launch and page latency statistics for the pool.
+
+        ``avg_launch_seconds`` is the cold-start cost every call paid before
+        the pool existed; ``avg_page_seconds`` is the warm-path cost of a page
+        served by an already running browser.
+
+        Returns:
+            A dictionary of pool statistics.
+        """
+        stats = dict(self.stats)
+        stats["avg_launch_seconds"] = (
+            stats["launch_seconds"] / stats["launches"]
+            if stats["launches"] else 0.0
+        )
+        stats["avg_page_seconds"] = (
+            stats["page_seconds"] / stats["pages"]
+            if stats["pages"] else 0.0
+        )
+        stats["live_browsers"] = len(self._browsers)
+        stats["idle_browsers"] = len(self._idle)
+        return stats
+
+    def close(self, timeout: float = DEFAULT_SHUTDOWN_TIMEOUT) -> None:
+        """
+        Close every browser and stop the pool's background loop.
+
+        Args:
+            timeout: Maximum number of seconds to wait for browsers to close.
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(
+                self._close_all(), loop
+            ).result(timeout=timeout)
+        except Exception as e:
+            logger.warning(f"Error shutting down browser pool: {str(e)}")
+
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=timeout)
+        if not loop.is_running():
+            loop.close()
+
+        logger.info("Closed browser pool")
+
+
+# Process-wide pools, keyed by name so each tool can keep its own
+# browser configuration
+_pools: Dict[str, BrowserPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _config_signature(browser_config: Optional[BrowserConfig]) -> Dict[str, Any]:
+    """
+    Get the settings of a browser configuration that identify a pool's browsers.
+
+    A random user agent, and the sec-ch-ua header derived from it, is drawn
+    anew for every BrowserConfig, so they are left out when the configuration
+    asks for one.
+
+    Args:
+        browser_config: The crawl4ai browser configuration.
+
+    Returns:
+        The configuration's settings.
+    """
+    signature = (browser_config or BrowserConfig(headless=True)).to_dict()
+    if signature.get("user_agent_mode") == "random":
+        signature.pop("user_agent", None)
+        headers = dict(signature.get("headers") or {})
+        headers.pop("sec-ch-ua", None)
+        signature["headers"] = headers
+    return signature
+
+
+def get_browser_pool(
+    name: str = "default",
+    browser_config: Optional[BrowserConfig] = None,
+    size: int = DEFAULT_POOL_SIZE,
+    max_pages_per_browser: int = DEFAULT_MAX_PAGES_PER_BROWSER
+) -> BrowserPool:
+    """
+    Get the process-wide browser pool with the given name, creating it if needed.
+
+    The configuration arguments only apply when the pool is created; a warning
+    is logged if they differ from those of the existing pool.
+
+    Args:
+        name: The name of the pool.
+        browser_config: The crawl4ai browser configuration for the pool.
+        size: Number of browsers kept warm and leased concurrently.
+        max_pages_per_browser: Number of pages a browser serves before it is
+                               recycled.
+
+    Returns:
+        The browser pool.
+    """
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None or pool.closed:
+            pool = BrowserPool(
+                size=size,
+                max_pages_per_browser=max_pages_per_browser,
+                browser_config=browser_config
+            )
+            _pools[name] = pool
+            return pool
+
+    differences = []
+    if browser_config is not None and (
+        _config_signature(browser_config) != _config_signature(pool.browser_config)
+    ):
+        differences.append("browser_config")
+    if size != pool.size:
+        differences.append(f"size={size} (pool has {pool.size})")
+    if max_pages_per_browser != pool.max_pages_per_browser:
+        differences.append(
+            f"max_pages_per_browser={max_pages_per_browser} "
+            f"(pool has {pool.max_pages_per_browser})"
+        )
+    if differences:
+        logger.warning(
+            f"Browser pool {name} already exists; ignoring differing "
+            f"{', '.join(differences)}"
+        )
+    return pool
+
+
+def shutdown_browser_pools() -> None:
+    """Close every process-wide browser pool."""
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+
+    for pool in pools:
+        pool.close()
+
+
+atexit.register(shutdown_browser_pools)
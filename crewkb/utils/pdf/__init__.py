@@ -4,12 +4,19 @@ PDF utilities for CrewKB.
 This package provides utilities for downloading, parsing, and processing PDFs.
 """
 
+from crewkb.utils.pdf.pdf_blob_store import PDFBlobStore
+from crewkb.utils.pdf.failure_ledger import FailureLedger
 from crewkb.utils.pdf.pdf_download_manager import PDFDownloadManager
-from crewkb.utils.pdf.marker_wrapper import MarkerWrapper
+from crewkb.utils.pdf.marker_wrapper import MarkerWrapper, ImageHandle
+from crewkb.utils.pdf.parse_pool import PDFParsePool
 from crewkb.utils.pdf.pdf_processor import PDFProcessor
 
 __all__ = [
+    'PDFBlobStore',
+    'FailureLedger',
     'PDFDownloadManager',
     'MarkerWrapper',
+    'ImageHandle',
+    'PDFParsePool',
     'PDFProcessor'
 ]
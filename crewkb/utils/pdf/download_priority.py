@@ -0,0 +1,165 @@
+"""
+Download Prioritization for CrewKB.
+
+This module provides a priority-ordered semaphore for download slots and a
+scoring function that ranks papers by their expected value, so the most useful
+papers are downloaded first when a run is cut short.
+"""
+
+import re
+import math
+import heapq
+import asyncio
+import itertools
+from typing import Optional, Callable, List, Tuple, Any
+
+from crewkb.models.knowledge.paper import PaperSource
+
+# Priority bonus for review articles, which summarize many primary studies
+REVIEW_BONUS = 2.0
+
+# Priority bonus for papers with a direct PDF link, which rarely fail to download
+OPEN_ACCESS_BONUS = 1.0
+
+# Titles and journals that identify review articles
+REVIEW_PATTERN = re.compile(
+    r"\b(review|meta-analysis|meta-analyses|systematic review|overview)\b",
+    re.IGNORECASE
+)
+
+
+def is_review(paper: PaperSource) -> bool:
+    """
+    Decide whether a paper is a review article.
+
+    Args:
+        paper: The paper.
+
+    Returns:
+        True if the paper is flagged as a review or its title or journal names
+        it as one, False otherwise.
+    """
+    if getattr(paper, "is_review", False):
+        return True
+
+    text = f"{paper.title or ''} {getattr(paper, 'journal', None) or ''}"
+    return bool(REVIEW_PATTERN.search(text))
+
+
+def get_paper_priority(paper: PaperSource) -> float:
+    """
+    Score how valuable it is to download a paper early.
+
+    Citations count logarithmically, so a paper with 1000 citations ranks
+    above one with 10 without drowning out the review and open access bonuses.
+
+    Args:
+        paper: The paper.
+
+    Returns:
+        The priority; higher values are downloaded first.
+    """
+    citations = getattr(paper, "citation_count", None) or 0
+    priority = math.log1p(max(citations, 0))
+
+    if is_review(paper):
+        priority += REVIEW_BONUS
+
+    open_access = getattr(paper, "is_open_access", None)
+    if open_access is None:
+        open_access = bool(paper.pdf_url)
+    if open_access:
+        priority += OPEN_ACCESS_BONUS
+
+    return priority
+
+
+class PrioritySemaphore:
+    """
+    Semaphore that hands free slots to the highest-priority waiter.
+
+    Waiters with equal priority are served in arrival order. Waiters can be
+    cancelled while they are still queued, in which case ``acquire`` returns
+    False instead of a slot.
+    """
+
+    def __init__(self, slots: int):
+        """
+        Initialize the PrioritySemaphore.
+
+        Args:
+            slots: The number of slots.
+        """
+        self._free = slots
+        self._waiters: List[Tuple[float, int, asyncio.Future, Any]] = []
+        self._order = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        """The number of queued waiters."""
+        return sum(1 for _, _, future, _ in self._waiters if not future.done())
+
+    async def acquire(self, priority: float = 0.0, owner: Any = None) -> bool:
+        """
+        Wait for a slot.
+
+        Args:
+            priority: The waiter's priority; higher values are served first.
+            owner: An identifier of the waiter, used to cancel it.
+
+        Returns:
+            True once a slot is held, or False if the waiter was cancelled
+            while queued.
+        """
+        # Slots are only left free when nobody is queued
+        if self._free > 0:
+            self._free -= 1
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (-priority, next(self._order), future, owner))
+
+        try:
+            return await future
+        except asyncio.CancelledError:
+            # A slot handed over just as the task was cancelled goes to the next waiter
+            if future.done() and not future.cancelled() and future.result():
+                self.release()
+            raise
+
+    def release(self) -> None:
+        """
+        Release a slot, handing it to the highest-priority queued waiter.
+        """
+        while self._waiters:
+            _, _, future, _ = heapq.heappop(self._waiters)
+            if not future.done():
+                future.set_result(True)
+                return
+
+        self._free += 1
+
+    def cancel_waiting(self, predicate: Optional[Callable[[float, Any], bool]] = None) -> int:
+        """
+        Cancel queued waiters.
+
+        Args:
+            predicate: A function of a waiter's priority and owner that returns
+                       True for waiters to cancel. If None, every queued
+                       waiter is cancelled.
+
+        Returns:
+            The number of waiters cancelled.
+        """
+        cancelled = 0
+        for negative_priority, _, future, owner in self._waiters:
+            if future.done():
+                continue
+            if predicate is None or predicate(-negative_priority, owner):
+                future.set_result(False)
+                cancelled += 1
+
+        self._waiters = [waiter for waiter in self._waiters if not waiter[2].done()]
+        heapq.heapify(self._waiters)
+
+        return cancelled
@@ -0,0 +1,245 @@
+"""
+Failure Ledger for CrewKB.
+
+This module provides a persistent record of failed downloads, parses and
+processing attempts, so later runs skip known-bad entries until their backoff
+window has passed instead of re-attempting them every time.
+"""
+
+import os
+import json
+import time
+import uuid
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+# Default backoff after the first failure, in seconds
+DEFAULT_BASE_BACKOFF = 3600.0
+
+# Default factor the backoff grows by after each further failure
+DEFAULT_BACKOFF_FACTOR = 4.0
+
+# Default maximum backoff, in seconds
+DEFAULT_MAX_BACKOFF = 7 * 24 * 3600.0
+
+
+class FailureLedger:
+    """
+    Persistent ledger of failed operations.
+
+    This class provides:
+    - Failure entries with the last reason, the number of attempts, and the
+      time the entry becomes eligible for another attempt
+    - Exponential backoff between attempts
+    - Arbitrary context per entry, so failed operations can be retried later
+    - Atomic writes that merge entries written by other processes
+    """
+
+    def __init__(
+        self,
+        path: str,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        max_backoff: float = DEFAULT_MAX_BACKOFF
+    ):
+        """
+        Initialize the FailureLedger.
+
+        Args:
+            path: Path of the JSON file holding the ledger.
+            base_backoff: Seconds an entry is skipped for after its first failure.
+            backoff_factor: Factor the backoff grows by after each further failure.
+            max_backoff: Maximum number of seconds an entry is skipped for.
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.base_backoff = base_backoff
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+        # Keys changed by this instance, merged over the file on save
+        self._changed: Dict[str, Optional[Dict[str, Any]]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Load the ledger from disk.
+
+        Returns:
+            A dictionary mapping keys to failure entries.
+        """
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading failure ledger {self.path}: {str(e)}")
+            return {}
+
+    def _save(self) -> None:
+        """
+        Atomically write the ledger to disk.
+
+        Other processes may share the file, so its current entries are merged
+        with the changes made by this instance first. Must be called with the
+        lock held.
+        """
+        entries = self._load()
+        for key, entry in self._changed.items():
+            if entry is None:
+                entries.pop(key, None)
+            else:
+                entries[key] = entry
+        self._entries = entries
+        self._changed = {}
+
+        temp_path = self.path.with_name(f"{self.path.name}.{uuid.uuid4().hex}.part")
+        with open(temp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(temp_path, self.path)
+
+    def get_backoff(self, attempts: int) -> float:
+        """
+        Get the backoff after a number of failed attempts.
+
+        Args:
+            attempts: The number of failed attempts.
+
+        Returns:
+            The backoff in seconds.
+        """
+        backoff = self.base_backoff * (self.backoff_factor ** max(attempts - 1, 0))
+        return min(backoff, self.max_backoff)
+
+    def record_failure(
+        self,
+        key: str,
+        reason: str,
+        context: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Record a failed attempt.
+
+        Args:
+            key: The key of the failed operation, e.g. a URL.
+            reason: Why the attempt failed.
+            context: Information needed to retry the operation. If None, the
+                     context of an existing entry is kept.
+
+        Returns:
+            The updated entry.
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = dict(self._entries.get(key) or {"first_failed": now, "attempts": 0})
+            entry["attempts"] += 1
+            entry["reason"] = reason
+            entry["last_failed"] = now
+            entry["next_eligible"] = now + self.get_backoff(entry["attempts"])
+            if context is not None:
+                entry["context"] = context
+
+            self._entries[key] = entry
+            self._changed[key] = entry
+            self._save()
+
+        logger.info(
+            f"Recorded failure {entry['attempts']} for {key}: {reason}; "
+            f"skipping it for {self.get_backoff(entry['attempts']):.0f}s"
+        )
+
+        return entry
+
+    def record_success(self, key: str) -> None:
+        """
+        Remove an entry after a successful attempt.
+
+        Args:
+            key: The key of the operation.
+        """
+        with self._lock:
+            if key not in self._entries:
+                return
+
+            del self._entries[key]
+            self._changed[key] = None
+            self._save()
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the entry for a key.
+
+        Args:
+            key: The key of the operation.
+
+        Returns:
+            The entry, or None if the operation has not failed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            return dict(entry) if entry else None
+
+    def is_blocked(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Check whether a key is within its backoff window.
+
+        Args:
+            key: The key of the operation.
+            now: The current time. If None, the system time is used.
+
+        Returns:
+            True if the operation failed and is not yet eligible for another
+            attempt, False otherwise.
+        """
+        entry = self.get(key)
+        if entry is None:
+            return False
+
+        return (now if now is not None else time.time()) < entry["next_eligible"]
+
+    def keys(self, due_only: bool = False, now: Optional[float] = None) -> List[str]:
+        """
+        Get the keys in the ledger.
+
+        Args:
+            due_only: Whether to only return keys whose backoff window has passed.
+            now: The current time. If None, the system time is used.
+
+        Returns:
+            The keys, ordered by when they become eligible for another attempt.
+        """
+        now = now if now is not None else time.time()
+
+        with self._lock:
+            entries = sorted(self._entries.items(), key=lambda item: item[1]["next_eligible"])
+
+        return [key for key, entry in entries if not due_only or entry["next_eligible"] <= now]
+
+    def __len__(self) -> int:
+        """Get the number of entries in the ledger."""
+        with self._lock:
+            return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        """Check whether a key is in the ledger."""
+        with self._lock:
+            return key in self._entries
+
+    def clear(self) -> None:
+        """
+        Remove every entry.
+        """
+        with self._lock:
+            self._entries = {}
+            self._changed = {}
+            if self.path.exists():
+                self.path.unlink()
@@ -5,8 +5,13 @@ This module provides a wrapper for the Marker PDF parser with Gemini integration
 """
 
 import os
+import re
+import json
+import hashlib
 import logging
 import tempfile
+import threading
+from collections import OrderedDict
 from pathlib import Path
 from typing import Optional, Dict, Any, List, Tuple, Union
 
@@ -16,8 +21,320 @@ from marker.models import create_model_dict
 from marker.output import text_from_rendered
 from marker.config.parser import ConfigParser
 
+from crewkb.utils.pdf.text_layer import (
+    PARSE_TIERS,
+    DEFAULT_MIN_QUALITY,
+    extract_text_layer,
+    score_text_layer
+)
+from crewkb.utils.section_index import PAPER_SECTION_MARKERS, get_section_indexer
+from crewkb.utils.pdf.failure_ledger import FailureLedger
+
 logger = logging.getLogger(__name__)
 
+# Maximum number of converters kept alive in the process-wide registry
+MAX_CACHED_CONVERTERS = 8
+
+# Process-wide Marker state: the model artifacts are loaded once and shared by
+# every converter, and converters are cached by a hash of their config
+_artifact_dict: Optional[Dict[str, Any]] = None
+_artifact_lock = threading.Lock()
+_converters: "OrderedDict[str, PdfConverter]" = OrderedDict()
+_converters_lock = threading.Lock()
+
+
+def get_artifact_dict() -> Dict[str, Any]:
+    """
+    Get the Marker model artifacts, loading them on first use.
+
+    Returns:
+        The artifact dictionary shared by every converter in the process.
+    """
+    global _artifact_dict
+
+    if _artifact_dict is None:
+        with _artifact_lock:
+            if _artifact_dict is None:
+                logger.info("Loading Marker models")
+                _artifact_dict = create_model_dict()
+
+    return _artifact_dict
+
+
+def normalize_config(config: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize a Marker configuration so equivalent configs compare equal.
+
+    Options left at their default (None, False or empty) are dropped, and
+    language lists are joined into Marker's comma-separated form.
+
+    Args:
+        config: The Marker configuration.
+
+    Returns:
+        The normalized configuration.
+    """
+    normalized = {}
+    for key, value in config.items():
+        if value is None or value is False or value == "" or value == [] or value == {}:
+            continue
+        if key == "languages" and isinstance(value, (list, tuple)):
+            value = ",".join(value)
+        normalized[key] = value
+
+    return normalized
+
+
+def get_config_hash(config: Dict[str, Any]) -> str:
+    """
+    Get a stable hash for a Marker configuration.
+
+    Equivalent configurations (see normalize_config) get the same hash.
+
+    Args:
+        config: The Marker configuration.
+
+    Returns:
+        A hex digest identifying the configuration.
+    """
+    config_str = json.dumps(normalize_config(config), sort_keys=True, default=str)
+    return hashlib.md5(config_str.encode()).hexdigest()
+
+
+def get_converter(config: Dict[str, Any]) -> PdfConverter:
+    """
+    Get a PdfConverter for a configuration from the process-wide registry.
+
+    Converters are built once per distinct configuration on top of the shared
+    model artifacts. The least recently used converter is dropped once more
+    than MAX_CACHED_CONVERTERS configurations are in use.
+
+    Args:
+        config: The Marker configuration.
+
+    Returns:
+        The PdfConverter for the configuration.
+    """
+    config_hash = get_config_hash(config)
+
+    with _converters_lock:
+        converter = _converters.get(config_hash)
+        if converter is not None:
+            _converters.move_to_end(config_hash)
+            return converter
+
+    # Build outside the registry lock; the model load has its own lock
+    config_parser = ConfigParser(config)
+    converter = PdfConverter(
+        config=config_parser.generate_config_dict(),
+        artifact_dict=get_artifact_dict(),
+        processor_list=config_parser.get_processors(),
+        renderer=config_parser.get_renderer(),
+        llm_service=config_parser.get_llm_service()
+    )
+
+    with _converters_lock:
+        converter = _converters.setdefault(config_hash, converter)
+        _converters.move_to_end(config_hash)
+        while len(_converters) > MAX_CACHED_CONVERTERS:
+            _converters.popitem(last=False)
+
+    return converter
+
+
+def warmup(configs: Optional[List[Dict[str, Any]]] = None) -> None:
+    """
+    Load the Marker models so later parses do not pay the load cost.
+
+    Long-running workers should call this once at startup.
+
+    Args:
+        configs: Optional configurations to build converters for up front.
+    """
+    get_artifact_dict()
+
+    for config in configs or []:
+        get_converter(config)
+
+
+class ImageHandle:
+    """
+    Lightweight handle to an image extracted from a PDF.
+
+    The image bytes are only read from disk when read() is called. Handles also
+    support the dictionary access of the earlier image format
+    (handle["path"], handle["data"]).
+    """
+
+    def __init__(self, path: str, data: Optional[bytes] = None):
+        """
+        Initialize the ImageHandle.
+
+        Args:
+            path: Path to the image file.
+            data: The image bytes, if they are already in memory.
+        """
+        self.path = str(path)
+        self._data = data
+
+    @property
+    def size(self) -> int:
+        """The size of the image in bytes."""
+        if self._data is not None:
+            return len(self._data)
+        return os.path.getsize(self.path)
+
+    def read(self) -> bytes:
+        """
+        Read the image bytes.
+
+        Returns:
+            The image bytes.
+        """
+        if self._data is not None:
+            return self._data
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "path":
+            return self.path
+        if key == "data":
+            return self.read()
+        if key == "size":
+            return self.size
+        raise KeyError(key)
+
+    def __repr__(self) -> str:
+        return f"ImageHandle({self.path!r})"
+
+
+def _image_index(image_path: Path) -> Tuple[Tuple[int, ...], str]:
+    """
+    Sort key ordering image files by the numbers in their names.
+
+    Marker names images by page and block (_page_<p>_Picture_<n>.jpeg), so
+    this orders them by page, then by their position on the page.
+
+    Args:
+        image_path: Path to the image file.
+
+    Returns:
+        The sort key.
+    """
+    numbers = tuple(int(number) for number in re.findall(r"\d+", image_path.stem))
+    return numbers, image_path.name
+
+
+def _save_images(
+    images_dir: Path,
+    images: Union[Dict[str, Any], List[bytes]]
+) -> List[ImageHandle]:
+    """
+    Save the images extracted by Marker.
+
+    Marker returns the images keyed by the names its markdown references
+    them by, and each image is saved under its key so the references resolve
+    against the images directory. Images given as a plain list of bytes are
+    saved as image_<n>.png.
+
+    Args:
+        images_dir: The directory to save the images to.
+        images: The images, as PIL images or bytes.
+
+    Returns:
+        Handles to the saved images, in extraction order.
+    """
+    if not isinstance(images, dict):
+        images = {f"image_{i}.png": image for i, image in enumerate(images)}
+
+    images_dir.mkdir(parents=True, exist_ok=True)
+    handles = []
+    for name, image in images.items():
+        image_path = images_dir / name
+        if isinstance(image, bytes):
+            with open(image_path, "wb") as f:
+                f.write(image)
+            handles.append(ImageHandle(image_path, image))
+        else:
+            image.save(image_path)
+            handles.append(ImageHandle(image_path))
+    return handles
+
+
+def plan_page_ranges(page_count: int, pages_per_shard: int) -> List[str]:
+    """
+    Split a document into contiguous page ranges for sharded parsing.
+
+    Args:
+        page_count: Number of pages in the document.
+        pages_per_shard: Maximum number of pages per shard.
+
+    Returns:
+        The page ranges in Marker's page_range syntax, in page order.
+    """
+    return [
+        f"{start}-{min(start + pages_per_shard, page_count) - 1}"
+        for start in range(0, page_count, pages_per_shard)
+    ]
+
+
+def stitch_shards(
+    shards: List[Tuple[str, Optional[Dict[str, Any]], List[str]]],
+    page_ranges: List[str]
+) -> Tuple[str, Dict[str, Any], List[Dict[str, Any]]]:
+    """
+    Stitch the results of a sharded parse back into one document.
+
+    Each shard's images are saved under the names its markdown references
+    them by, and those names may repeat across shards. Every name is
+    therefore prefixed with its shard (shard_<k>_<name>), both in the
+    markdown and in the image list, which maps each name to its file.
+
+    Args:
+        shards: The text, metadata and image paths of each shard, in page order.
+        page_ranges: The page range of each shard.
+
+    Returns:
+        A tuple containing the stitched text, the merged metadata dictionary
+        and the list of images, each with its name in the stitched text, its
+        path and the page range of its shard.
+    """
+    texts = []
+    images = []
+    metadata: Dict[str, Any] = {"table_of_contents": [], "page_stats": []}
+
+    for index, ((text, shard_metadata, image_paths), page_range) in enumerate(
+        zip(shards, page_ranges)
+    ):
+        names = {}
+        for image_path in image_paths:
+            name = os.path.basename(image_path)
+            names[name] = f"shard_{index}_{name}"
+            images.append({
+                "path": image_path,
+                "name": names[name],
+                "page_range": page_range
+            })
+
+        if names:
+            # Longest names first, so no name matches inside a longer one
+            pattern = "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+            text = re.sub(
+                rf"(?<![\w])({pattern})",
+                lambda match: names[match.group(1)],
+                text
+            )
+        texts.append(text.strip())
+
+        for key in ("table_of_contents", "page_stats"):
+            metadata[key].extend((shard_metadata or {}).get(key) or [])
+
+    metadata["parse_tier"] = "marker"
+    metadata["shards"] = page_ranges
+
+    return "\n\n".join(texts) + "\n", metadata, images
+
 
 class MarkerWrapper:
     """
@@ -25,6 +342,10 @@ class MarkerWrapper:
     
     This class provides a wrapper for the Marker PDF parser, with support for:
     - Parsing PDFs to markdown format
+    - A fast tier that reads the PDF's text layer and only escalates to
+      Marker when the extraction scores too low
+    - Caching parsed PDFs by content and configuration, so renamed copies of
+      a PDF are only parsed once
     - Using Gemini for improved accuracy
     - Customizing parsing options
     - Tracking failed parsing attempts
@@ -36,7 +357,9 @@ class MarkerWrapper:
         use_llm: bool = True,
         output_format: str = "markdown",
         cache_dir: str = "cache/marker",
-        google_api_key: Optional[str] = None
+        google_api_key: Optional[str] = None,
+        tier: str = "auto",
+        min_text_quality: float = DEFAULT_MIN_QUALITY
     ):
         """
         Initialize the MarkerWrapper.
@@ -47,151 +370,384 @@ class MarkerWrapper:
             cache_dir: Directory to cache parsed PDFs.
             google_api_key: Google API key for Gemini. If None, will use the
                             GOOGLE_API_KEY environment variable.
+            tier: The default parse tier: "auto" tries the PDF's text layer and
+                  escalates to Marker if it scores below min_text_quality,
+                  "fast" only uses the text layer, and "marker" always runs Marker.
+            min_text_quality: Minimum text layer quality score (0 to 1) for the
+                              "auto" tier to skip Marker.
         """
+        if tier not in PARSE_TIERS:
+            raise ValueError(f"Unknown parse tier {tier}, expected one of {PARSE_TIERS}")
+        
         self.use_llm = use_llm
         self.output_format = output_format
+        self.tier = tier
+        self.min_text_quality = min_text_quality
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        # Index of PDF content hashes, so unchanged files are only hashed once
+        self.index_path = self.cache_dir / "index.json"
+        self._index_lock = threading.Lock()
+        self._index = self._load_index()
+        
         # Set the Google API key if provided
         if google_api_key:
             os.environ["GOOGLE_API_KEY"] = google_api_key
         
         # Initialize the failed parsing set
         self.failed_parsing = set()
+        
+        # Failures persist across runs, so unparseable PDFs are skipped until
+        # their backoff window has passed
+        self.failures = FailureLedger(self.cache_dir / "failures.json")
     
-    def parse_pdf(
+    def warmup(self) -> None:
+        """
+        Load the Marker models and build the converter for the default config.
+        
+        Long-running workers should call this once so that the first parse
+        does not pay the model load.
+        """
+        warmup([self._build_config(self.use_llm, self.output_format)])
+    
+    def _build_config(
         self,
-        pdf_path: str,
-        output_path: Optional[str] = None,
-        use_llm: Optional[bool] = None,
-        output_format: Optional[str] = None,
-        force: bool = False,
+        use_llm: bool,
+        output_format: str,
         page_range: Optional[str] = None,
         redo_inline_math: bool = False,
         disable_image_extraction: bool = False,
         force_ocr: bool = False,
         strip_existing_ocr: bool = False,
         languages: Optional[List[str]] = None
-    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+    ) -> Dict[str, Any]:
         """
-        Parse a PDF file using Marker.
+        Build the Marker configuration for a set of parsing options.
         
         Args:
-            pdf_path: Path to the PDF file.
-            output_path: Path to save the parsed output. If None, the output will be
-                         saved to the cache directory.
-            use_llm: Whether to use Gemini for improved accuracy. If None, will use
-                     the value provided in the constructor.
-            output_format: The output format (markdown, json, html). If None, will use
-                           the value provided in the constructor.
-            force: Whether to force parsing even if the PDF is already cached.
-            page_range: Specify which pages to process. Accepts comma-separated page
-                        numbers and ranges. Example: "0,5-10,20".
-            redo_inline_math: If True, will use Gemini for high-quality inline math conversion.
-            disable_image_extraction: If True, will not extract images from the PDF.
-            force_ocr: If True, will force OCR processing on the entire document.
-            strip_existing_ocr: If True, will remove all existing OCR text and re-OCR.
-            languages: Optionally specify which languages to use for OCR processing.
-                       Accepts a list of language codes. Example: ["en", "fr", "de"].
-                       
+            use_llm: Whether to use Gemini for improved accuracy.
+            output_format: The output format (markdown, json, html).
+            page_range: Specify which pages to process.
+            redo_inline_math: Whether to use Gemini for inline math conversion.
+            disable_image_extraction: Whether to skip image extraction.
+            force_ocr: Whether to force OCR processing on the entire document.
+            strip_existing_ocr: Whether to remove existing OCR text and re-OCR.
+            languages: Languages to use for OCR processing.
+            
         Returns:
-            A tuple containing:
-            - The parsed text (or None if parsing failed)
-            - The metadata dictionary (or None if parsing failed)
-            - The list of images (or None if parsing failed or image extraction is disabled)
+            The Marker configuration dictionary.
         """
-        # Use the provided values or fall back to the constructor values
-        use_llm = use_llm if use_llm is not None else self.use_llm
-        output_format = output_format or self.output_format
+        config = {
+            "output_format": output_format,
+            "use_llm": use_llm,
+            "redo_inline_math": redo_inline_math,
+            "disable_image_extraction": disable_image_extraction,
+            "force_ocr": force_ocr,
+            "strip_existing_ocr": strip_existing_ocr
+        }
         
-        # Create the cache path
-        pdf_filename = os.path.basename(pdf_path)
-        cache_key = f"{pdf_filename}_{use_llm}_{output_format}"
+        # Add page_range if provided
         if page_range:
-            cache_key += f"_{page_range}"
-        if redo_inline_math:
-            cache_key += "_math"
-        if disable_image_extraction:
-            cache_key += "_noimg"
-        if force_ocr:
-            cache_key += "_ocr"
-        if strip_existing_ocr:
-            cache_key += "_strip"
+            config["page_range"] = page_range
+        
+        # Add languages if provided
         if languages:
-            cache_key += f"_{'_'.join(languages)}"
+            config["languages"] = ",".join(languages)
         
-        cache_path = self.cache_dir / f"{cache_key}.{output_format}"
+        return config
+    
+    def _load_index(self) -> Dict[str, str]:
+        """
+        Load the index mapping PDF files to their content hashes.
         
-        # If output_path is provided, use that instead
-        output_path = output_path or str(cache_path)
+        Returns:
+            A dictionary mapping file identities (path, size and modification
+            time) to SHA-256 hex digests.
+        """
+        if not self.index_path.exists():
+            return {}
+        
+        try:
+            with open(self.index_path, "r") as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading Marker cache index {self.index_path}: {str(e)}")
+            return {}
+    
+    def _save_index(self) -> None:
+        """
+        Atomically write the content hash index to disk.
         
-        # If the file already exists and force is False, return the cached result
-        if not force and os.path.exists(cache_path):
-            logger.info(f"PDF already parsed at {cache_path}")
+        Parse workers share the cache directory, so entries written by other
+        processes are merged in first. A lost entry only costs a re-hash.
+        """
+        with self._index_lock:
+            index = self._load_index()
+            index.update(self._index)
+            self._index = index
             
-            # Load the cached result
-            if output_format == "markdown":
-                with open(cache_path, "r") as f:
-                    text = f.read()
-                
-                # Load the metadata and images if they exist
-                metadata_path = cache_path.with_suffix(".metadata.json")
-                metadata = None
-                if metadata_path.exists():
-                    import json
-                    with open(metadata_path, "r") as f:
-                        metadata = json.load(f)
-                
-                # Load the images if they exist and image extraction is not disabled
-                images = None
-                if not disable_image_extraction:
-                    images_dir = cache_path.with_suffix(".images")
-                    if images_dir.exists():
-                        images = []
-                        for image_path in images_dir.glob("*"):
-                            with open(image_path, "rb") as f:
-                                image_data = f.read()
-                            images.append({
-                                "path": str(image_path),
-                                "data": image_data
-                            })
-                
-                return text, metadata, images
+            fd, temp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".part")
+            with os.fdopen(fd, "w") as f:
+                json.dump(index, f)
+            os.replace(temp_path, self.index_path)
+    
+    def get_pdf_hash(self, pdf_path: str) -> str:
+        """
+        Get the SHA-256 hash of a PDF's content.
+        
+        Hashes are looked up in the index by path, size and modification time,
+        so unchanged files are only read once.
+        
+        Args:
+            pdf_path: Path to the PDF file.
             
-            # For other formats, we need to parse the PDF again
-            # This is because we don't have a good way to cache the rendered object
+        Returns:
+            The SHA-256 hex digest of the file.
+        """
+        stat = os.stat(pdf_path)
+        identity = f"{os.path.abspath(pdf_path)}|{stat.st_size}|{stat.st_mtime_ns}"
+        
+        with self._index_lock:
+            pdf_hash = self._index.get(identity)
+        if pdf_hash is not None:
+            return pdf_hash
+        
+        sha256 = hashlib.sha256()
+        with open(pdf_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+        pdf_hash = sha256.hexdigest()
+        
+        with self._index_lock:
+            self._index[identity] = pdf_hash
+        self._save_index()
+        
+        return pdf_hash
+    
+    def _get_cache_path(self, pdf_path: str, config: Dict[str, Any]) -> Path:
+        """
+        Get the cache path for a PDF parsed with a configuration.
+        
+        The key combines the PDF's content hash with the normalized config hash,
+        so results are shared by every copy of the same PDF regardless of its
+        name or the URL it came from.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            config: The Marker configuration.
             
-        try:
-            # Create the configuration
-            config = {
-                "output_format": output_format,
-                "use_llm": use_llm,
-                "redo_inline_math": redo_inline_math,
-                "disable_image_extraction": disable_image_extraction,
-                "force_ocr": force_ocr,
-                "strip_existing_ocr": strip_existing_ocr
-            }
+        Returns:
+            The cache path for the parsed output.
+        """
+        output_format = config.get("output_format", self.output_format)
+        cache_key = f"{self.get_pdf_hash(pdf_path)}_{get_config_hash(config)}"
+        return self.cache_dir / f"{cache_key}.{output_format}"
+    
+    def _load_cached(
+        self,
+        cache_path: Path,
+        load_images: bool
+    ) -> Tuple[str, Optional[Dict[str, Any]], Optional[List[ImageHandle]]]:
+        """
+        Load a parsed PDF from the cache.
+        
+        Only the text and metadata are read; images are returned as handles
+        that read their bytes on demand.
+        
+        Args:
+            cache_path: The cache path of the parsed output.
+            load_images: Whether to list the cached images.
             
-            # Add page_range if provided
-            if page_range:
-                config["page_range"] = page_range
+        Returns:
+            A tuple containing the parsed text, the metadata dictionary and the
+            list of image handles.
+        """
+        with open(cache_path, "r") as f:
+            text = f.read()
+        
+        # Load the metadata if it exists
+        metadata_path = cache_path.with_suffix(".metadata.json")
+        metadata = None
+        if metadata_path.exists():
+            with open(metadata_path, "r") as f:
+                metadata = json.load(f)
+        
+        # List the images if they exist and were requested
+        images = None
+        if load_images:
+            images_dir = cache_path.with_suffix(".images")
+            if images_dir.exists():
+                images = [
+                    ImageHandle(image_path)
+                    for image_path in sorted(images_dir.glob("*"), key=_image_index)
+                ]
+        
+        return text, metadata, images
+    
+    def _save_result(
+        self,
+        cache_path: Path,
+        output_path: str,
+        text: str,
+        metadata: Optional[Dict[str, Any]]
+    ) -> None:
+        """
+        Write parsed text and metadata to the cache and the output path.
+        
+        Args:
+            cache_path: The cache path of the parsed output.
+            output_path: Path to save the parsed output to.
+            text: The parsed text.
+            metadata: The metadata dictionary.
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(cache_path, "w") as f:
+            f.write(text)
+        
+        # Save the metadata if available
+        if metadata:
+            metadata_path = cache_path.with_suffix(".metadata.json")
+            with open(metadata_path, "w") as f:
+                json.dump(metadata, f)
+        
+        # If output_path is different from cache_path, copy the file
+        if output_path != str(cache_path):
+            output_path_obj = Path(output_path)
+            output_path_obj.parent.mkdir(parents=True, exist_ok=True)
             
-            # Add languages if provided
-            if languages:
-                config["languages"] = ",".join(languages)
+            with open(cache_path, "r") as src:
+                with open(output_path_obj, "w") as dst:
+                    dst.write(src.read())
+    
+    def _parse_fast(
+        self,
+        pdf_path: str,
+        page_range: Optional[str],
+        output_path: Optional[str],
+        force: bool,
+        min_quality: float
+    ) -> Optional[Tuple[str, Dict[str, Any], None]]:
+        """
+        Parse a PDF from its text layer, without Marker.
+        
+        Extractions are cached along with their quality score, including those
+        that scored too low, so a PDF is only scored once.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            page_range: Pages to extract, in Marker's page range syntax.
+            output_path: Path to save the parsed output. If None, the output will be
+                         saved to the cache directory.
+            force: Whether to force extraction even if the PDF is already cached.
+            min_quality: Minimum quality score for the extraction to be used.
             
-            # Create the config parser
-            config_parser = ConfigParser(config)
+        Returns:
+            A tuple containing the markdown, the metadata dictionary and no
+            images, or None if the extraction failed or scored below min_quality.
+        """
+        config = {"parse_tier": "fast", "output_format": "markdown", "page_range": page_range}
+        
+        try:
+            cache_path = self._get_cache_path(pdf_path, config)
+            output_path = output_path or str(cache_path)
             
-            # Create the converter
-            converter = PdfConverter(
-                config=config_parser.generate_config_dict(),
-                artifact_dict=create_model_dict(),
-                processor_list=config_parser.get_processors(),
-                renderer=config_parser.get_renderer(),
-                llm_service=config_parser.get_llm_service()
+            if not force and cache_path.exists():
+                text, metadata, _ = self._load_cached(cache_path, False)
+            else:
+                text, metadata = extract_text_layer(pdf_path, page_range=page_range)
+                metadata["parse_tier"] = "fast"
+                metadata["text_quality"] = score_text_layer(text, metadata["page_count"])
+                self._save_result(cache_path, str(cache_path), text, metadata)
+        except Exception as e:
+            logger.warning(f"Text layer extraction failed for {pdf_path}: {str(e)}")
+            return None
+        
+        score = metadata["text_quality"]["score"]
+        if score < min_quality:
+            logger.info(
+                f"Text layer of {pdf_path} scored {score:.2f}, below {min_quality:.2f}; "
+                f"escalating to Marker"
             )
+            return None
+        
+        if output_path != str(cache_path):
+            self._save_result(cache_path, output_path, text, None)
+        
+        logger.info(f"Parsed PDF from its text layer: {pdf_path} (score {score:.2f})")
+        
+        return text, metadata, None
+    
+    def _get_failure_key(self, pdf_path: str, config: Optional[Dict[str, Any]]) -> str:
+        """
+        Get the failure ledger key for parsing a PDF with a configuration.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            config: The Marker configuration, or None for the text layer tier.
+            
+        Returns:
+            The ledger key.
+        """
+        config_key = get_config_hash(config) if config is not None else "fast"
+        return f"{os.path.abspath(pdf_path)}|{config_key}"
+    
+    def _parse_with_config(
+        self,
+        pdf_path: str,
+        config: Dict[str, Any],
+        output_path: Optional[str],
+        force: bool,
+        load_images: bool = True,
+        skip_failed: bool = True
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[List[ImageHandle]]]:
+        """
+        Parse a PDF with a Marker configuration, using the parse cache.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            config: The Marker configuration.
+            output_path: Path to save the parsed output. If None, the output will be
+                         saved to the cache directory.
+            force: Whether to force parsing even if the PDF is already cached.
+            load_images: Whether to return handles to the extracted images.
+            skip_failed: Whether to skip PDFs that failed to parse with this
+                         configuration and are still within their backoff window.
+            
+        Returns:
+            A tuple containing:
+            - The parsed text (or None if parsing failed)
+            - The metadata dictionary (or None if parsing failed)
+            - The list of image handles (or None if parsing failed, image extraction
+              is disabled, or load_images is False)
+        """
+        output_format = config.get("output_format", self.output_format)
+        disable_image_extraction = config.get("disable_image_extraction", False)
+        load_images = load_images and not disable_image_extraction
+        
+        try:
+            # Create the cache path
+            cache_path = self._get_cache_path(pdf_path, config)
+            
+            # If output_path is provided, use that instead
+            output_path = output_path or str(cache_path)
+            
+            # If the file already exists and force is False, return the cached result.
+            # For other formats, we need to parse the PDF again, because we don't
+            # have a good way to cache the rendered object
+            if not force and output_format == "markdown" and cache_path.exists():
+                logger.info(f"PDF already parsed at {cache_path}")
+                return self._load_cached(cache_path, load_images)
+            
+            # Don't re-run Marker on PDFs that are known to fail
+            failure_key = self._get_failure_key(pdf_path, config)
+            if skip_failed and self.failures.is_blocked(failure_key):
+                logger.info(f"Skipping {pdf_path}, which failed to parse recently")
+                self.failed_parsing.add(pdf_path)
+                return None, None, None
+            
+            # Get the converter from the process-wide registry
+            converter = get_converter(config)
             
             # Parse the PDF
             logger.info(f"Parsing PDF: {pdf_path}")
@@ -200,188 +756,175 @@ class MarkerWrapper:
             # Extract the text, metadata, and images
             text, metadata, images = text_from_rendered(rendered)
             
-            # Save the result to the cache path
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w") as f:
-                f.write(text)
+            # Record the tier that served the parse
+            metadata = dict(metadata or {})
+            metadata["parse_tier"] = "marker"
             
-            # Save the metadata if available
-            if metadata:
-                import json
-                metadata_path = cache_path.with_suffix(".metadata.json")
-                with open(metadata_path, "w") as f:
-                    json.dump(metadata, f)
+            # Save the result to the cache path and the output path
+            self._save_result(cache_path, output_path, text, metadata)
             
             # Save the images if available and image extraction is not disabled
             if images and not disable_image_extraction:
-                images_dir = cache_path.with_suffix(".images")
-                images_dir.mkdir(parents=True, exist_ok=True)
-                
-                for i, image in enumerate(images):
-                    image_path = images_dir / f"image_{i}.png"
-                    with open(image_path, "wb") as f:
-                        f.write(image)
-                    
-                    # Update the image path in the list
-                    images[i] = {
-                        "path": str(image_path),
-                        "data": image
-                    }
-            
-            # If output_path is different from cache_path, copy the file
-            if output_path != str(cache_path):
-                output_path_obj = Path(output_path)
-                output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(cache_path, "r") as src:
-                    with open(output_path_obj, "w") as dst:
-                        dst.write(src.read())
+                images = _save_images(cache_path.with_suffix(".images"), images)
             
             logger.info(f"Parsed PDF from {pdf_path} to {output_path}")
+            self.failures.record_success(failure_key)
             
-            return text, metadata, images
+            return text, metadata, (images if load_images else None)
             
         except Exception as e:
             logger.error(f"Failed to parse PDF {pdf_path}: {str(e)}")
             self.failed_parsing.add(pdf_path)
+            self.failures.record_failure(
+                self._get_failure_key(pdf_path, config),
+                str(e),
+                {"pdf_path": pdf_path, "config": config}
+            )
             return None, None, None
     
-    def parse_pdf_with_custom_config(
+    def parse_pdf(
         self,
         pdf_path: str,
-        config: Dict[str, Any],
         output_path: Optional[str] = None,
-        force: bool = False
-    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[List[Dict[str, Any]]]]:
+        use_llm: Optional[bool] = None,
+        output_format: Optional[str] = None,
+        force: bool = False,
+        page_range: Optional[str] = None,
+        redo_inline_math: bool = False,
+        disable_image_extraction: bool = False,
+        force_ocr: bool = False,
+        strip_existing_ocr: bool = False,
+        languages: Optional[List[str]] = None,
+        tier: Optional[str] = None,
+        load_images: bool = True,
+        skip_failed: bool = True
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[List[ImageHandle]]]:
         """
-        Parse a PDF file with custom configuration.
+        Parse a PDF file, using its text layer or Marker.
         
         Args:
             pdf_path: Path to the PDF file.
-            config: Custom configuration for Marker.
             output_path: Path to save the parsed output. If None, the output will be
                          saved to the cache directory.
+            use_llm: Whether to use Gemini for improved accuracy. If None, will use
+                     the value provided in the constructor.
+            output_format: The output format (markdown, json, html). If None, will use
+                           the value provided in the constructor.
             force: Whether to force parsing even if the PDF is already cached.
-            
+            page_range: Specify which pages to process. Accepts comma-separated page
+                        numbers and ranges. Example: "0,5-10,20".
+            redo_inline_math: If True, will use Gemini for high-quality inline math conversion.
+            disable_image_extraction: If True, will not extract images from the PDF.
+            force_ocr: If True, will force OCR processing on the entire document.
+            strip_existing_ocr: If True, will remove all existing OCR text and re-OCR.
+            languages: Optionally specify which languages to use for OCR processing.
+                       Accepts a list of language codes. Example: ["en", "fr", "de"].
+            tier: The parse tier ("auto", "fast" or "marker"). If None, will use the
+                  value provided in the constructor. The tier that served the parse
+                  is recorded in the metadata under "parse_tier".
+            load_images: Whether to return handles to the extracted images. Callers
+                         that only need the text can pass False to skip listing
+                         the images of a cached parse.
+            skip_failed: Whether to skip PDFs that failed to parse with the same
+                         options in an earlier attempt and are still within their
+                         backoff window. Failures are kept in the cache directory.
+                       
         Returns:
             A tuple containing:
             - The parsed text (or None if parsing failed)
             - The metadata dictionary (or None if parsing failed)
-            - The list of images (or None if parsing failed or image extraction is disabled)
+            - The list of image handles, each with a path, a size and a lazy read()
+              (or None if parsing failed, image extraction is disabled, load_images
+              is False, or the text layer served the parse)
         """
-        # Extract the output format from the config
-        output_format = config.get("output_format", self.output_format)
-        
-        # Create a cache key from the config
-        import hashlib
-        import json
-        config_str = json.dumps(config, sort_keys=True)
-        config_hash = hashlib.md5(config_str.encode()).hexdigest()
+        # Use the provided values or fall back to the constructor values
+        use_llm = use_llm if use_llm is not None else self.use_llm
+        output_format = output_format or self.output_format
+        tier = tier or self.tier
+        if tier not in PARSE_TIERS:
+            raise ValueError(f"Unknown parse tier {tier}, expected one of {PARSE_TIERS}")
         
-        # Create the cache path
-        pdf_filename = os.path.basename(pdf_path)
-        cache_key = f"{pdf_filename}_{config_hash}"
-        cache_path = self.cache_dir / f"{cache_key}.{output_format}"
+        # Create the configuration
+        config = self._build_config(
+            use_llm,
+            output_format,
+            page_range=page_range,
+            redo_inline_math=redo_inline_math,
+            disable_image_extraction=disable_image_extraction,
+            force_ocr=force_ocr,
+            strip_existing_ocr=strip_existing_ocr,
+            languages=languages
+        )
         
-        # If output_path is provided, use that instead
-        output_path = output_path or str(cache_path)
+        # OCR options only make sense for Marker, and the text layer only
+        # produces markdown
+        fast_eligible = output_format == "markdown" and not force_ocr and not strip_existing_ocr
         
-        # If the file already exists and force is False, return the cached result
-        if not force and os.path.exists(cache_path):
-            logger.info(f"PDF already parsed at {cache_path}")
-            
-            # Load the cached result
-            if output_format == "markdown":
-                with open(cache_path, "r") as f:
-                    text = f.read()
+        if tier == "fast" or (tier == "auto" and fast_eligible):
+            # A Marker result that is already cached beats a fresh text layer parse
+            if tier == "fast" or force or not self._is_cached(pdf_path, config):
+                min_quality = 0.0 if tier == "fast" else self.min_text_quality
+                result = self._parse_fast(pdf_path, page_range, output_path, force, min_quality)
+                if result is not None:
+                    return result
                 
-                # Load the metadata and images if they exist
-                metadata_path = cache_path.with_suffix(".metadata.json")
-                metadata = None
-                if metadata_path.exists():
-                    with open(metadata_path, "r") as f:
-                        metadata = json.load(f)
-                
-                # Load the images if they exist and image extraction is not disabled
-                images = None
-                if not config.get("disable_image_extraction", False):
-                    images_dir = cache_path.with_suffix(".images")
-                    if images_dir.exists():
-                        images = []
-                        for image_path in images_dir.glob("*"):
-                            with open(image_path, "rb") as f:
-                                image_data = f.read()
-                            images.append({
-                                "path": str(image_path),
-                                "data": image_data
-                            })
-                
-                return text, metadata, images
+                if tier == "fast":
+                    logger.error(f"Failed to parse PDF {pdf_path} from its text layer")
+                    self.failed_parsing.add(pdf_path)
+                    return None, None, None
         
-        try:
-            # Create the config parser
-            config_parser = ConfigParser(config)
-            
-            # Create the converter
-            converter = PdfConverter(
-                config=config_parser.generate_config_dict(),
-                artifact_dict=create_model_dict(),
-                processor_list=config_parser.get_processors(),
-                renderer=config_parser.get_renderer(),
-                llm_service=config_parser.get_llm_service()
-            )
-            
-            # Parse the PDF
-            logger.info(f"Parsing PDF with custom config: {pdf_path}")
-            rendered = converter(pdf_path)
-            
-            # Extract the text, metadata, and images
-            text, metadata, images = text_from_rendered(rendered)
-            
-            # Save the result to the cache path
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w") as f:
-                f.write(text)
-            
-            # Save the metadata if available
-            if metadata:
-                metadata_path = cache_path.with_suffix(".metadata.json")
-                with open(metadata_path, "w") as f:
-                    json.dump(metadata, f)
-            
-            # Save the images if available and image extraction is not disabled
-            if images and not config.get("disable_image_extraction", False):
-                images_dir = cache_path.with_suffix(".images")
-                images_dir.mkdir(parents=True, exist_ok=True)
-                
-                for i, image in enumerate(images):
-                    image_path = images_dir / f"image_{i}.png"
-                    with open(image_path, "wb") as f:
-                        f.write(image)
-                    
-                    # Update the image path in the list
-                    images[i] = {
-                        "path": str(image_path),
-                        "data": image
-                    }
-            
-            # If output_path is different from cache_path, copy the file
-            if output_path != str(cache_path):
-                output_path_obj = Path(output_path)
-                output_path_obj.parent.mkdir(parents=True, exist_ok=True)
-                
-                with open(cache_path, "r") as src:
-                    with open(output_path_obj, "w") as dst:
-                        dst.write(src.read())
-            
-            logger.info(f"Parsed PDF with custom config from {pdf_path} to {output_path}")
+        return self._parse_with_config(
+            pdf_path, config, output_path, force, load_images, skip_failed
+        )
+    
+    def _is_cached(self, pdf_path: str, config: Dict[str, Any]) -> bool:
+        """
+        Check whether a PDF has already been parsed with a configuration.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            config: The Marker configuration.
             
-            return text, metadata, images
+        Returns:
+            True if the parsed output is in the cache, False otherwise.
+        """
+        try:
+            return self._get_cache_path(pdf_path, config).exists()
+        except OSError:
+            return False
+    
+    def parse_pdf_with_custom_config(
+        self,
+        pdf_path: str,
+        config: Dict[str, Any],
+        output_path: Optional[str] = None,
+        force: bool = False,
+        load_images: bool = True,
+        skip_failed: bool = True
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[List[ImageHandle]]]:
+        """
+        Parse a PDF file with custom configuration.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            config: Custom configuration for Marker.
+            output_path: Path to save the parsed output. If None, the output will be
+                         saved to the cache directory.
+            force: Whether to force parsing even if the PDF is already cached.
+            load_images: Whether to return handles to the extracted images.
+            skip_failed: Whether to skip PDFs that failed to parse with this
+                         configuration and are still within their backoff window.
             
-        except Exception as e:
-            logger.error(f"Failed to parse PDF with custom config {pdf_path}: {str(e)}")
-            self.failed_parsing.add(pdf_path)
-            return None, None, None
+        Returns:
+            A tuple containing:
+            - The parsed text (or None if parsing failed)
+            - The metadata dictionary (or None if parsing failed)
+            - The list of image handles (or None if parsing failed, image extraction
+              is disabled, or load_images is False)
+        """
+        return self._parse_with_config(
+            pdf_path, config, output_path, force, load_images, skip_failed
+        )
     
     def extract_sections(
         self,
@@ -401,63 +944,10 @@ class MarkerWrapper:
         """
         # Use default section markers if none are provided
         if section_markers is None:
-            section_markers = {
-                "abstract": ["abstract", "summary"],
-                "introduction": ["introduction", "background"],
-                "methods": ["methods", "methodology", "materials and methods"],
-                "results": ["results", "findings"],
-                "discussion": ["discussion"],
-                "conclusion": ["conclusion", "conclusions"],
-                "references": ["references", "bibliography"]
-            }
-        
-        # Split the markdown into lines
-        lines = markdown.split("\n")
-        
-        # Initialize the sections dictionary
-        sections = {}
-        
-        # Initialize variables for tracking the current section
-        current_section = None
-        current_content = []
-        
-        # Process each line
-        for line in lines:
-            # Check if the line is a heading
-            if line.startswith("#"):
-                # Extract the heading text
-                heading_text = line.lstrip("#").strip().lower()
-                
-                # Check if the heading matches any section marker
-                matched_section = None
-                for section, markers in section_markers.items():
-                    if any(marker in heading_text for marker in markers):
-                        matched_section = section
-                        break
-                
-                # If we found a matching section
-                if matched_section:
-                    # If we were already in a section, save it
-                    if current_section:
-                        sections[current_section] = "\n".join(current_content)
-                    
-                    # Start a new section
-                    current_section = matched_section
-                    current_content = [line]
-                else:
-                    # If we're in a section, add the line to the current content
-                    if current_section:
-                        current_content.append(line)
-            else:
-                # If we're in a section, add the line to the current content
-                if current_section:
-                    current_content.append(line)
+            section_markers = PAPER_SECTION_MARKERS
         
-        # Save the last section if there is one
-        if current_section:
-            sections[current_section] = "\n".join(current_content)
-        
-        return sections
+        # Each section runs from its heading to the next section heading
+        return get_section_indexer(section_markers).extract(markdown)
     
     def get_failed_parsing(self) -> set:
         """
@@ -479,4 +969,8 @@ class MarkerWrapper:
                 import shutil
                 shutil.rmtree(file)
         
+        with self._index_lock:
+            self._index = {}
+        self.failures.clear()
+        
         logger.info(f"Cleared Marker cache directory: {self.cache_dir}")
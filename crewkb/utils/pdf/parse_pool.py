@@ -0,0 +1,372 @@
+"""
+PDF Parse Pool for CrewKB.
+
+This module provides a bounded pool of worker processes that parse PDFs with
+Marker while keeping the Marker models resident in each worker. The worker
+processes are shared by every PDFParsePool in a process.
+"""
+
+import sys
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Dict, Any, List, Tuple
+
+from crewkb.utils.pdf.marker_wrapper import MarkerWrapper, plan_page_ranges, stitch_shards
+from crewkb.utils.pdf.text_layer import DEFAULT_MIN_QUALITY, get_page_count
+
+logger = logging.getLogger(__name__)
+
+# Default number of worker processes. Every worker loads its own copy of the
+# Marker models, several GB of RAM (or GPU memory when CUDA is available), so
+# the pool is kept small rather than sized to the CPU count
+DEFAULT_PARSE_WORKERS = 2
+
+# The MarkerWrappers of the current worker process, by configuration. The
+# Marker models are loaded once per process and shared by every wrapper
+_worker_wrappers: Dict[Tuple[Tuple[str, Any], ...], MarkerWrapper] = {}
+
+
+def _get_worker_wrapper(wrapper_kwargs: Dict[str, Any]) -> MarkerWrapper:
+    """
+    Get the current worker's MarkerWrapper for a configuration, creating it if needed.
+
+    Args:
+        wrapper_kwargs: Keyword arguments for the MarkerWrapper.
+
+    Returns:
+        The MarkerWrapper.
+    """
+    key = tuple(sorted(wrapper_kwargs.items()))
+    if key not in _worker_wrappers:
+        _worker_wrappers[key] = MarkerWrapper(**wrapper_kwargs)
+    return _worker_wrappers[key]
+
+
+def _init_worker(wrapper_kwargs: Dict[str, Any]) -> None:
+    """
+    Initialize a worker process and load the Marker models once.
+
+    Args:
+        wrapper_kwargs: Keyword arguments for the worker's first MarkerWrapper.
+    """
+    _get_worker_wrapper(wrapper_kwargs).warmup()
+
+
+def _parse_in_worker(
+    wrapper_kwargs: Dict[str, Any],
+    pdf_path: str,
+    parse_kwargs: Dict[str, Any]
+) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    """
+    Parse a PDF in a worker process.
+
+    Images are left in the parse cache rather than sent back to the parent.
+
+    Args:
+        wrapper_kwargs: Keyword arguments for the MarkerWrapper to parse with.
+        pdf_path: Path to the PDF file.
+        parse_kwargs: Keyword arguments for MarkerWrapper.parse_pdf.
+
+    Returns:
+        A tuple containing the parsed text and the metadata dictionary.
+    """
+    parse_kwargs = {"load_images": False, **parse_kwargs}
+    text, metadata, _ = _get_worker_wrapper(wrapper_kwargs).parse_pdf(pdf_path, **parse_kwargs)
+    return text, metadata
+
+
+def _parse_shard_in_worker(
+    wrapper_kwargs: Dict[str, Any],
+    pdf_path: str,
+    parse_kwargs: Dict[str, Any]
+) -> Tuple[Optional[str], Optional[Dict[str, Any]], List[str]]:
+    """
+    Parse a page range of a PDF in a worker process.
+
+    Args:
+        wrapper_kwargs: Keyword arguments for the MarkerWrapper to parse with.
+        pdf_path: Path to the PDF file.
+        parse_kwargs: Keyword arguments for MarkerWrapper.parse_pdf, including
+                      the shard's page_range.
+
+    Returns:
+        A tuple containing the parsed text, the metadata dictionary and the
+        paths of the shard's cached images.
+    """
+    text, metadata, images = _get_worker_wrapper(wrapper_kwargs).parse_pdf(pdf_path, **parse_kwargs)
+    return text, metadata, [image["path"] for image in images or []]
+
+
+class _WorkerProcesses:
+    """The parse worker processes of this process, shared by every PDFParsePool."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.max_workers = 0
+        self.tasks_submitted = 0
+
+
+_workers = _WorkerProcesses()
+
+
+class PDFParsePool:
+    """
+    Bounded pool of worker processes for CPU-heavy PDF parsing.
+
+    This class provides:
+    - Parsing PDFs off the event loop in a few worker processes, shared by
+      every pool of the process so the Marker models are loaded only once
+      per worker
+    - Marker models kept resident in each worker
+    - Splitting long PDFs into page ranges parsed in parallel
+    - Recycling of workers after a set number of tasks to cap memory growth
+    - Recovery from crashed workers
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        max_tasks_per_worker: int = 20,
+        use_llm: bool = True,
+        output_format: str = "markdown",
+        cache_dir: str = "cache/marker",
+        tier: str = "auto",
+        min_text_quality: float = DEFAULT_MIN_QUALITY,
+        pages_per_shard: int = 40
+    ):
+        """
+        Initialize the PDFParsePool.
+
+        Args:
+            max_workers: Maximum number of worker processes. If None,
+                         DEFAULT_PARSE_WORKERS are used. Each worker holds a
+                         full set of Marker models in memory. The workers are
+                         shared by every pool of the process and sized by the
+                         pool that starts them.
+            max_tasks_per_worker: Number of PDFs a worker parses before it is
+                                  replaced by a fresh process.
+            use_llm: Whether the workers use Gemini for improved accuracy.
+            output_format: The output format (markdown, json, html).
+            cache_dir: Directory the workers cache parsed PDFs in.
+            tier: The default parse tier of the workers ("auto", "fast" or "marker").
+            min_text_quality: Minimum text layer quality score for the "auto"
+                              tier to skip Marker.
+            pages_per_shard: Number of pages per shard when a long PDF is parsed
+                             with parse_sharded.
+        """
+        self.max_workers = max_workers or DEFAULT_PARSE_WORKERS
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.pages_per_shard = pages_per_shard
+        self.wrapper_kwargs = {
+            "use_llm": use_llm,
+            "output_format": output_format,
+            "cache_dir": cache_dir,
+            "tier": tier,
+            "min_text_quality": min_text_quality
+        }
+
+        # Whether this pool has warned that the running workers have another size
+        self._size_warned = False
+
+        # max_tasks_per_child is only available from Python 3.11; older
+        # interpreters recycle the whole pool after the same number of tasks
+        self._native_recycling = sys.version_info >= (3, 11)
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        """
+        Create a new process pool executor.
+
+        Returns:
+            The executor.
+        """
+        kwargs = {
+            "max_workers": self.max_workers,
+            # Spawn avoids forking a parent that runs event loops and threads
+            "mp_context": multiprocessing.get_context("spawn"),
+            "initializer": _init_worker,
+            "initargs": (self.wrapper_kwargs,)
+        }
+        if self._native_recycling:
+            kwargs["max_tasks_per_child"] = self.max_tasks_per_worker
+
+        return ProcessPoolExecutor(**kwargs)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """
+        Get the process's shared executor, creating or recycling it as needed.
+
+        Returns:
+            The executor to submit the next task to.
+        """
+        with _workers.lock:
+            recycle_after = _workers.max_workers * self.max_tasks_per_worker
+            if (
+                _workers.executor is not None
+                and not self._native_recycling
+                and _workers.tasks_submitted >= recycle_after
+            ):
+                # Let in-flight parses finish on the old workers
+                _workers.executor.shutdown(wait=False)
+                _workers.executor = None
+
+            if _workers.executor is None:
+                _workers.executor = self._create_executor()
+                _workers.max_workers = self.max_workers
+                _workers.tasks_submitted = 0
+            elif _workers.max_workers != self.max_workers and not self._size_warned:
+                self._size_warned = True
+                logger.warning(
+                    f"Parse workers are shared by the process; using the running "
+                    f"{_workers.max_workers} workers instead of {self.max_workers}"
+                )
+
+            _workers.tasks_submitted += 1
+            return _workers.executor
+
+    def _reset(self, broken: ProcessPoolExecutor) -> None:
+        """
+        Drop a broken executor so the next task starts fresh workers.
+
+        Args:
+            broken: The executor whose worker died.
+        """
+        with _workers.lock:
+            if _workers.executor is broken:
+                _workers.executor = None
+        broken.shutdown(wait=False)
+
+    async def _run(self, func, pdf_path: str, parse_kwargs: Dict[str, Any]):
+        """
+        Run a parse function in a worker process.
+
+        Args:
+            func: The module-level function to run in the worker.
+            pdf_path: Path to the PDF file.
+            parse_kwargs: Keyword arguments for MarkerWrapper.parse_pdf.
+
+        Returns:
+            The result of the function.
+
+        Raises:
+            BrokenProcessPool: If the worker died while parsing the PDF.
+        """
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+
+        try:
+            return await loop.run_in_executor(
+                executor, func, self.wrapper_kwargs, pdf_path, parse_kwargs
+            )
+        except BrokenProcessPool:
+            logger.error(f"Parse worker died while parsing {pdf_path}")
+            self._reset(executor)
+            raise
+
+    async def parse(
+        self,
+        pdf_path: str,
+        **parse_kwargs
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Parse a PDF in a worker process without blocking the event loop.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            **parse_kwargs: Keyword arguments for MarkerWrapper.parse_pdf.
+
+        Returns:
+            A tuple containing the parsed text and the metadata dictionary
+            (both None if parsing failed).
+
+        Raises:
+            BrokenProcessPool: If the worker died while parsing the PDF.
+        """
+        return await self._run(_parse_in_worker, pdf_path, parse_kwargs)
+
+    async def parse_sharded(
+        self,
+        pdf_path: str,
+        **parse_kwargs
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Parse a long PDF as page-range shards spread across the workers.
+
+        PDFs with no more than pages_per_shard pages, and PDFs whose text layer
+        is good enough for the "auto" tier, are parsed in one piece. Each shard
+        is cached separately by its page range, so if a shard fails, only that
+        shard is parsed again on the next attempt.
+
+        Args:
+            pdf_path: Path to the PDF file.
+            **parse_kwargs: Keyword arguments for MarkerWrapper.parse_pdf.
+
+        Returns:
+            A tuple containing the stitched text and the merged metadata
+            dictionary, which lists the shards' images under "images"
+            (both None if any shard failed).
+
+        Raises:
+            BrokenProcessPool: If a worker died while parsing a shard.
+        """
+        tier = parse_kwargs.get("tier") or self.wrapper_kwargs["tier"]
+
+        try:
+            page_count = get_page_count(pdf_path)
+        except Exception as e:
+            logger.warning(f"Could not count pages of {pdf_path}, parsing it whole: {str(e)}")
+            page_count = 0
+
+        if page_count <= self.pages_per_shard or parse_kwargs.get("page_range") or tier == "fast":
+            return await self.parse(pdf_path, **parse_kwargs)
+
+        # A born-digital PDF is served by its text layer without any sharding
+        if tier == "auto":
+            text, metadata = await self.parse(pdf_path, **{**parse_kwargs, "tier": "fast"})
+            quality = (metadata or {}).get("text_quality") or {}
+            if text and quality.get("score", 0.0) >= self.wrapper_kwargs["min_text_quality"]:
+                return text, metadata
+
+        page_ranges = plan_page_ranges(page_count, self.pages_per_shard)
+        logger.info(f"Parsing {pdf_path} ({page_count} pages) as {len(page_ranges)} shards")
+
+        shards = await asyncio.gather(*(
+            self._run(
+                _parse_shard_in_worker,
+                pdf_path,
+                {**parse_kwargs, "tier": "marker", "page_range": page_range}
+            )
+            for page_range in page_ranges
+        ))
+
+        failed = [page_range for page_range, shard in zip(page_ranges, shards) if not shard[0]]
+        if failed:
+            logger.error(f"Failed to parse pages {', '.join(failed)} of {pdf_path}")
+            return None, None
+
+        # The image list is small, so it travels with the metadata
+        text, metadata, images = stitch_shards(shards, page_ranges)
+        metadata["images"] = images
+        return text, metadata
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shut down the worker processes.
+
+        The workers are shared by every pool of the process. Parses already
+        submitted by other pools still finish, and the next parse starts
+        fresh workers.
+
+        Args:
+            wait: Whether to wait for in-flight parses to finish.
+        """
+        with _workers.lock:
+            executor, _workers.executor = _workers.executor, None
+
+        if executor is not None:
+            executor.shutdown(wait=wait)
+            logger.info("Shut down PDF parse pool")
@@ -0,0 +1,357 @@
+"""
+PDF Blob Store for CrewKB.
+
+This module provides a content-addressed store for downloaded PDFs, so the same
+paper reached through different URLs is only stored once.
+"""
+
+import os
+import json
+import uuid
+import shutil
+import logging
+import hashlib
+import threading
+from pathlib import Path
+from typing import Optional, Dict, Any, Callable, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ioctl request that clones a file's extents on Linux (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Index locks by index path, shared by the stores of a process on the same directory
+_index_locks: Dict[str, threading.Lock] = {}
+_index_locks_lock = threading.Lock()
+
+
+def _get_index_lock(index_path: Path) -> threading.Lock:
+    """
+    Get the lock guarding an index file within this process.
+
+    Args:
+        index_path: The path of the index file.
+
+    Returns:
+        The lock.
+    """
+    with _index_locks_lock:
+        return _index_locks.setdefault(os.path.abspath(index_path), threading.Lock())
+
+
+def reflink_file(source: Path, destination: Path) -> None:
+    """
+    Clone a file so the copy shares the source's data blocks.
+
+    Args:
+        source: The source path.
+        destination: The destination path.
+
+    Raises:
+        OSError: If the platform or filesystem does not support reflinks.
+    """
+    try:
+        import fcntl
+    except ImportError:
+        raise OSError("Reflinks are not supported on this platform")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        try:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        except OSError:
+            dst.close()
+            os.unlink(destination)
+            raise
+
+
+def materialize_file(
+    source: Path,
+    destination: Path,
+    reflink: Callable[[Path, Path], None] = reflink_file
+) -> str:
+    """
+    Make a file available at another path without duplicating its data.
+
+    A hardlink is tried first, then a reflink, then a plain copy. The
+    destination is replaced atomically if it already exists.
+
+    Args:
+        source: The file to make available.
+        destination: The path to make the file available at.
+        reflink: The function used to clone the file.
+
+    Returns:
+        The method used: "hardlink", "reflink" or "copy".
+    """
+    source = Path(source)
+    destination = Path(destination)
+    destination.parent.mkdir(parents=True, exist_ok=True)
+
+    if destination.exists() and os.path.samefile(source, destination):
+        return "hardlink"
+
+    temp_path = destination.with_name(
+        f"{destination.name}.{uuid.uuid4().hex}.part"
+    )
+
+    try:
+        try:
+            os.link(source, temp_path)
+            method = "hardlink"
+        except OSError:
+            try:
+                reflink(source, temp_path)
+                method = "reflink"
+            except OSError:
+                shutil.copyfile(source, temp_path)
+                method = "copy"
+
+        os.replace(temp_path, destination)
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return method
+
+
+class PDFBlobStore:
+    """
+    Content-addressed store for PDF files.
+
+    This class provides:
+    - Blobs stored once per SHA-256 digest of their content
+    - An index mapping each source URL to the digest of its content, shared
+      with other stores on the same directory
+    - Materialization of blobs at other paths via hardlinks, falling back to
+      reflinks and then to plain copies
+    - Deduplication statistics
+    """
+
+    def __init__(self, store_dir: str = "cache/pdf"):
+        """
+        Initialize the PDFBlobStore.
+
+        Args:
+            store_dir: Directory holding the blobs and the URL index.
+        """
+        self.store_dir = Path(store_dir)
+        self.blob_dir = self.store_dir / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.store_dir / "index.json"
+
+        self._lock = _get_index_lock(self.index_path)
+        self._urls: Dict[str, str] = {}
+        self._sizes: Dict[str, int] = {}
+        with self._lock:
+            self._load_index()
+
+    def _read_index(self) -> Tuple[Dict[str, str], Dict[str, int]]:
+        """
+        Read the URL index from disk.
+
+        Returns:
+            The URL to digest and digest to size mappings.
+        """
+        if not self.index_path.exists():
+            return {}, {}
+
+        try:
+            with open(self.index_path, "r") as f:
+                index = json.load(f)
+            return index.get("urls", {}), index.get("sizes", {})
+        except Exception as e:
+            logger.error(f"Error loading PDF store index {self.index_path}: {str(e)}")
+            return {}, {}
+
+    def _load_index(self) -> None:
+        """
+        Load the URL index from disk, picking up entries committed by other
+        stores on the same directory. Must be called with the lock held.
+        """
+        self._urls, self._sizes = self._read_index()
+
+    def _save_index(self, url: str, digest: str, size: int) -> None:
+        """
+        Atomically add an entry to the URL index on disk.
+
+        Other stores may share the file, so its current entries are merged
+        with the new one first. Must be called with the lock held; stores in
+        other processes can still race, which only costs a re-download.
+
+        Args:
+            url: The source URL.
+            digest: The SHA-256 hex digest of the URL's content.
+            size: The size of the content in bytes.
+        """
+        self._load_index()
+        self._urls[url] = digest
+        self._sizes[digest] = size
+
+        temp_path = self.index_path.with_name(
+            f"{self.index_path.name}.{uuid.uuid4().hex}.part"
+        )
+        with open(temp_path, "w") as f:
+            json.dump({"urls": self._urls, "sizes": self._sizes}, f)
+        os.replace(temp_path, self.index_path)
+
+    def blob_path(self, digest: str) -> Path:
+        """
+        Get the path of the blob with a digest.
+
+        Args:
+            digest: The SHA-256 hex digest of the blob.
+
+        Returns:
+            The path of the blob.
+        """
+        return self.blob_dir / digest[:2] / f"{digest}.pdf"
+
+    def temp_path(self) -> Path:
+        """
+        Get a unique path to stage a new blob at.
+
+        The path is on the same filesystem as the blobs, so staged files can be
+        committed with an atomic rename.
+
+        Returns:
+            The staging path.
+        """
+        return self.blob_dir / f"{uuid.uuid4().hex}.part"
+
+    def lookup(self, url: str) -> Optional[Path]:
+        """
+        Get the blob stored for a URL.
+
+        Args:
+            url: The source URL.
+
+        Returns:
+            The path of the blob, or None if the URL is not in the store.
+        """
+        with self._lock:
+            digest = self._urls.get(url)
+
+            # Another store on the same directory may have committed the URL
+            if digest is None:
+                self._load_index()
+                digest = self._urls.get(url)
+
+        if digest is None:
+            return None
+
+        path = self.blob_path(digest)
+        return path if path.exists() else None
+
+    def commit(self, temp_path: Path, digest: str, url: str) -> Path:
+        """
+        Commit a staged file to the store and index it under a URL.
+
+        If a blob with the same content already exists, the staged file is
+        discarded and the URL is pointed at the existing blob.
+
+        Args:
+            temp_path: The staged file.
+            digest: The SHA-256 hex digest of the staged file.
+            url: The URL the file was downloaded from.
+
+        Returns:
+            The path of the blob.
+        """
+        path = self.blob_path(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = temp_path.stat().st_size
+
+        with self._lock:
+            if path.exists():
+                logger.info(f"PDF from {url} is already stored as {digest}")
+                temp_path.unlink()
+            else:
+                os.replace(temp_path, path)
+
+            self._save_index(url, digest, size)
+
+        return path
+
+    def add_file(self, source: Path, url: str) -> Path:
+        """
+        Move an existing file into the store and index it under a URL.
+
+        Args:
+            source: The file to move into the store.
+            url: The URL the file was downloaded from.
+
+        Returns:
+            The path of the blob.
+        """
+        sha256 = hashlib.sha256()
+        with open(source, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(chunk)
+
+        temp_path = self.temp_path()
+        shutil.move(str(source), temp_path)
+        return self.commit(temp_path, sha256.hexdigest(), url)
+
+    def materialize(self, blob: Path, destination: Path) -> str:
+        """
+        Make a blob available at another path without duplicating its data.
+
+        Args:
+            blob: The path of the blob.
+            destination: The path to make the blob available at.
+
+        Returns:
+            The method used: "hardlink", "reflink" or "copy".
+        """
+        return materialize_file(blob, destination, reflink=self._reflink)
+
+    def _reflink(self, source: Path, destination: Path) -> None:
+        """
+        Clone a file so the copy shares the source's data blocks.
+
+        Args:
+            source: The source path.
+            destination: The destination path.
+
+        Raises:
+            OSError: If the platform or filesystem does not support reflinks.
+        """
+        reflink_file(source, destination)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics for the store.
+
+        Returns:
+            A dictionary with the number of indexed URLs and stored blobs, the
+            deduplication ratio (URLs per blob), the bytes the URLs would take
+            if stored separately, the bytes actually stored, and the bytes saved.
+        """
+        with self._lock:
+            digests = list(self._urls.values())
+            sizes = dict(self._sizes)
+
+        unique = set(digests)
+        logical_bytes = sum(sizes.get(digest, 0) for digest in digests)
+        stored_bytes = sum(sizes.get(digest, 0) for digest in unique)
+
+        return {
+            "urls": len(digests),
+            "blobs": len(unique),
+            "dedup_ratio": len(digests) / len(unique) if unique else 1.0,
+            "logical_bytes": logical_bytes,
+            "stored_bytes": stored_bytes,
+            "bytes_saved": logical_bytes - stored_bytes
+        }
+
+    def clear(self) -> None:
+        """
+        Remove every blob and the URL index.
+        """
+        with self._lock:
+            shutil.rmtree(self.blob_dir, ignore_errors=True)
+            self.blob_dir.mkdir(parents=True, exist_ok=True)
+            if self.index_path.exists():
+                self.index_path.unlink()
+            self._urls = {}
+            self._sizes = {}
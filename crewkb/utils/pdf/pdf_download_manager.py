@@ -5,36 +5,68 @@ This module provides utilities for downloading PDFs from URLs with caching and r
 """
 
 import os
+import re
+import json
 import asyncio
 import logging
 import hashlib
 from pathlib import Path
-from typing import Optional, Dict, List, Tuple, Set
+from typing import Optional, Dict, List, Tuple, Set, Any, Callable
 import aiohttp
 import aiofiles
 from urllib.parse import urlparse
 
 from crewkb.utils.search.retry import RetryStrategy
+from crewkb.utils.pdf.pdf_blob_store import PDFBlobStore
+from crewkb.utils.pdf.failure_ledger import FailureLedger
+from crewkb.utils.pdf.download_priority import PrioritySemaphore, get_paper_priority
+from crewkb.models.knowledge.paper import PaperSource
 
 logger = logging.getLogger(__name__)
 
+# Magic bytes every PDF file starts with (within its first KiB)
+PDF_MAGIC = b"%PDF"
+PDF_MAGIC_WINDOW = 1024
+
+# Errors after which a partial download is kept so the next attempt can resume
+RESUMABLE_ERRORS = (
+    aiohttp.ClientPayloadError,
+    aiohttp.ClientConnectionError,
+    asyncio.TimeoutError
+)
+
 
 class PDFDownloadManager:
     """
     Manages downloading PDFs from URLs with caching and retry logic.
     
     This class provides utilities for downloading PDFs from URLs, with support for:
-    - Caching downloaded PDFs to avoid redundant downloads
+    - Caching downloaded PDFs in a content-addressed store, so the same paper
+      reached through several URLs is stored once
+    - Resuming interrupted downloads with HTTP Range requests
+    - Hardlinking cached PDFs into output directories instead of copying them
+    - Streaming downloads to disk with a size cap and atomic commits to the cache
     - Retry logic with exponential backoff for failed downloads
-    - Parallel downloads with rate limiting
-    - Tracking of failed downloads for potential fallback processing
+    - A shared, pooled HTTP session with keep-alive and DNS caching
+    - Parallel downloads with global and per-host rate limiting
+    - Priority scheduling of queued downloads, with deadlines and budgets that
+      cancel low-priority downloads still waiting for a slot
+    - A persistent ledger of failed downloads, skipped until their backoff
+      has passed
     """
     
     def __init__(
         self,
         cache_dir: str = "cache/pdf",
         max_concurrent_downloads: int = 5,
-        retry_strategy: Optional[RetryStrategy] = None
+        retry_strategy: Optional[RetryStrategy] = None,
+        max_file_size: int = 100 * 1024 * 1024,
+        chunk_size: int = 64 * 1024,
+        max_downloads_per_host: int = 2,
+        connection_limit: int = 100,
+        dns_cache_ttl: int = 300,
+        connect_timeout: float = 10.0,
+        read_timeout: float = 60.0
     ):
         """
         Initialize the PDFDownloadManager.
@@ -43,12 +75,40 @@ class PDFDownloadManager:
             cache_dir: Directory to cache downloaded PDFs.
             max_concurrent_downloads: Maximum number of concurrent downloads.
             retry_strategy: Retry strategy for failed downloads.
+            max_file_size: Maximum size of a PDF in bytes. Larger downloads are aborted.
+            chunk_size: Size in bytes of the chunks streamed to disk.
+            max_downloads_per_host: Maximum number of concurrent downloads from a
+                                    single host, which also caps the session's
+                                    connections per host.
+            connection_limit: Maximum number of open connections in the session.
+            dns_cache_ttl: Seconds to cache DNS lookups for.
+            connect_timeout: Seconds to wait for a connection to be established.
+            read_timeout: Seconds to wait for each read from an open connection.
         """
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = PDFBlobStore(cache_dir)
+        self.partial_dir = self.cache_dir / "partial"
+        self.partial_dir.mkdir(parents=True, exist_ok=True)
         
         self.max_concurrent_downloads = max_concurrent_downloads
-        self.semaphore = asyncio.Semaphore(max_concurrent_downloads)
+        self.max_file_size = max_file_size
+        self.chunk_size = chunk_size
+        self.max_downloads_per_host = max_downloads_per_host
+        self.connection_limit = connection_limit
+        self.dns_cache_ttl = dns_cache_ttl
+        self.timeout = aiohttp.ClientTimeout(
+            total=None,
+            connect=connect_timeout,
+            sock_read=read_timeout
+        )
+        self.semaphore = PrioritySemaphore(max_concurrent_downloads)
+        self._host_semaphores: Dict[str, PrioritySemaphore] = {}
+        
+        # The session and the semaphores belong to the event loop they were
+        # created on and are rebuilt if the manager is used from a new loop
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
         
         self.retry_strategy = retry_strategy or RetryStrategy(
             max_retries=3,
@@ -57,16 +117,88 @@ class PDFDownloadManager:
         )
         
         self.failed_downloads: Set[str] = set()
+        
+        # URLs whose queued download was cancelled before it started
+        self.cancelled_downloads: Set[str] = set()
+        
+        # Downloads in progress, by URL, shared by concurrent callers
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        
+        # Failures persist across runs, so known-dead URLs are skipped until
+        # their backoff window has passed
+        self.failures = FailureLedger(self.cache_dir / "failures.json")
+    
+    async def __aenter__(self) -> "PDFDownloadManager":
+        """Open the shared HTTP session for the lifetime of the context."""
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        """Close the shared HTTP session."""
+        await self.close()
+    
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """
+        Get the shared HTTP session, creating it on first use.
+        
+        Returns:
+            The shared HTTP session.
+        """
+        loop = asyncio.get_running_loop()
+        
+        if self._session_loop is not loop:
+            # A previous event loop has ended; its session and semaphores
+            # cannot be used from this one
+            self._session = None
+            self._session_loop = loop
+            self.semaphore = PrioritySemaphore(self.max_concurrent_downloads)
+            self._host_semaphores = {}
+        
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.connection_limit,
+                limit_per_host=self.max_downloads_per_host,
+                ttl_dns_cache=self.dns_cache_ttl
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout
+            )
+        
+        return self._session
+    
+    async def close(self) -> None:
+        """
+        Close the shared HTTP session.
+        """
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+    
+    def _get_host_semaphore(self, url: str) -> PrioritySemaphore:
+        """
+        Get the semaphore limiting concurrent downloads from a URL's host.
+        
+        Args:
+            url: The URL to get the semaphore for.
+            
+        Returns:
+            The semaphore for the URL's host.
+        """
+        host = urlparse(url).netloc.lower()
+        if host not in self._host_semaphores:
+            self._host_semaphores[host] = PrioritySemaphore(self.max_downloads_per_host)
+        return self._host_semaphores[host]
     
     def _get_cache_path(self, url: str) -> Path:
         """
-        Get the cache path for a URL.
+        Get the path a URL was cached at before the content-addressed store.
         
         Args:
             url: The URL to get the cache path for.
             
         Returns:
-            The cache path for the URL.
+            The legacy cache path for the URL.
         """
         # Create a hash of the URL to use as the filename
         url_hash = hashlib.md5(url.encode()).hexdigest()
@@ -88,68 +220,295 @@ class PDFDownloadManager:
         
         return self.cache_dir / filename
     
+    def _get_cached(self, url: str) -> Optional[Path]:
+        """
+        Get the cached PDF for a URL.
+        
+        PDFs cached under the old URL-keyed layout are moved into the store the
+        first time they are looked up.
+        
+        Args:
+            url: The URL to get the cached PDF for.
+            
+        Returns:
+            The path of the cached PDF, or None if the URL is not cached.
+        """
+        blob = self.store.lookup(url)
+        if blob is not None:
+            return blob
+        
+        legacy_path = self._get_cache_path(url)
+        if legacy_path.exists():
+            logger.info(f"Moving {legacy_path} into the PDF store")
+            return self.store.add_file(legacy_path, url)
+        
+        return None
+    
     async def download(
         self,
         url: str,
         output_path: Optional[str] = None,
-        force: bool = False
+        force: bool = False,
+        skip_failed: bool = True,
+        priority: float = 0.0,
+        cancel_event: Optional[asyncio.Event] = None,
+        on_downloaded: Optional[Callable[[str], None]] = None
     ) -> Optional[str]:
         """
         Download a PDF from a URL with retry logic.
         
         Args:
             url: The URL to download the PDF from.
-            output_path: The path to save the PDF to. If None, the PDF will be saved to the cache directory.
+            output_path: The path to save the PDF to. If None, the path of the PDF in the cache is returned.
             force: Whether to force download even if the PDF is already cached.
+            skip_failed: Whether to skip URLs that failed in an earlier attempt
+                         and are still within their backoff window.
+            priority: The download's priority. When all download slots are
+                      busy, queued downloads start in order of priority.
+            cancel_event: An event that cancels the download if it is set
+                          before the download gets a slot.
+            on_downloaded: Called with the path of the PDF in the store once it
+                           is downloaded, before its slot goes to a queued
+                           download. Not called for cached PDFs.
             
         Returns:
-            The path to the downloaded PDF, or None if the download failed.
+            The path to the downloaded PDF, or None if the download failed or
+            was cancelled while queued.
         """
-        # Get the cache path
-        cache_path = self._get_cache_path(url)
-        
-        # If output_path is provided, use that instead
-        output_path = Path(output_path) if output_path else cache_path
+        output_path = Path(output_path) if output_path else None
         
-        # If the file already exists and force is False, return the path
-        if not force and cache_path.exists():
-            logger.info(f"PDF already cached at {cache_path}")
+        # If the PDF is already cached and force is False, return the path
+        cached_path = None if force else self._get_cached(url)
+        if cached_path is not None:
+            logger.info(f"PDF already cached at {cached_path}")
             
-            # If output_path is different from cache_path, copy the file
-            if output_path != cache_path:
-                output_path.parent.mkdir(parents=True, exist_ok=True)
-                await self._copy_file(cache_path, output_path)
+            if output_path is None:
+                return str(cached_path)
             
+            await asyncio.to_thread(self.store.materialize, cached_path, output_path)
             return str(output_path)
         
-        # Acquire the semaphore to limit concurrent downloads
-        async with self.semaphore:
+        # Don't re-wait on URLs that are known to fail
+        if skip_failed and self.failures.is_blocked(url):
+            logger.info(f"Skipping {url}, which failed recently: {self.failures.get(url)['reason']}")
+            self.failed_downloads.add(url)
+            return None
+        
+        # Concurrent downloads of the same URL share a single request
+        owner = asyncio.current_task()
+        while True:
+            flight = self._in_flight.get(url)
+            leader = flight is None
+            if leader:
+                flight = asyncio.ensure_future(
+                    self._fetch(url, priority, owner, cancel_event, output_path, on_downloaded)
+                )
+                self._in_flight[url] = flight
+                flight.add_done_callback(lambda done, url=url: self._end_flight(url, done))
+            else:
+                logger.info(f"Joining the download of {url} already in progress")
+            
+            path, cancelled = await asyncio.shield(flight)
+            
+            # A download cancelled by another caller's budget is queued again
+            if cancelled and not leader and not (cancel_event is not None and cancel_event.is_set()):
+                continue
+            break
+        
+        if path is not None and not leader and on_downloaded is not None:
+            on_downloaded(path)
+        
+        if path is None or output_path is None:
+            return path
+        
+        await asyncio.to_thread(self.store.materialize, path, output_path)
+        return str(output_path)
+    
+    def _end_flight(self, url: str, flight: asyncio.Future) -> None:
+        """
+        Forget a finished download of a URL.
+        
+        Args:
+            url: The URL.
+            flight: The finished download.
+        """
+        if self._in_flight.get(url) is flight:
+            del self._in_flight[url]
+    
+    async def _fetch(
+        self,
+        url: str,
+        priority: float,
+        owner: Any,
+        cancel_event: Optional[asyncio.Event],
+        output_path: Optional[Path] = None,
+        on_downloaded: Optional[Callable[[str], None]] = None
+    ) -> Tuple[Optional[str], bool]:
+        """
+        Download a PDF into the store once slots are free.
+        
+        Args:
+            url: The URL to download the PDF from.
+            priority: The download's priority.
+            owner: The task the download is queued for, used to cancel it.
+            cancel_event: An event that cancels the download if it is set
+                          before the download gets a slot.
+            output_path: Where the caller saves the PDF, recorded with a
+                         failure so a retry saves it there too.
+            on_downloaded: Called with the path of the PDF before its slots
+                           are released.
+            
+        Returns:
+            A tuple containing the path of the PDF in the store (None if the
+            download failed or was cancelled) and whether it was cancelled.
+        """
+        # Bind the session and semaphores to the running event loop
+        await self._get_session()
+        
+        # Wait for a slot on the host before taking a global slot, so a busy
+        # host never holds global slots that other hosts could use
+        host_semaphore = self._get_host_semaphore(url)
+        
+        if not await host_semaphore.acquire(priority, owner):
+            return self._cancelled(url), True
+        try:
+            if not await self.semaphore.acquire(priority, owner):
+                return self._cancelled(url), True
             try:
+                # The slot may have been handed over just before the cancellation
+                if cancel_event is not None and cancel_event.is_set():
+                    return self._cancelled(url), True
+                
                 # Download the PDF with retry logic
-                return await self.retry_strategy.execute(
+                path = await self.retry_strategy.execute(
                     self._download_pdf,
-                    url=url,
-                    output_path=output_path,
-                    cache_path=cache_path
+                    url=url
                 )
+                
+                if on_downloaded is not None:
+                    on_downloaded(path)
             except Exception as e:
                 logger.error(f"Failed to download PDF from {url}: {str(e)}")
                 self.failed_downloads.add(url)
-                return None
+                self.failures.record_failure(url, str(e), {"output_path": output_path and str(output_path)})
+                return None, False
+            finally:
+                self.semaphore.release()
+        finally:
+            host_semaphore.release()
+        
+        self.failed_downloads.discard(url)
+        self.failures.record_success(url)
+        return path, False
+    
+    def _cancelled(self, url: str) -> None:
+        """
+        Record that a queued download was cancelled.
+        
+        Args:
+            url: The URL of the cancelled download.
+        """
+        logger.info(f"Cancelled queued download of {url}")
+        self.cancelled_downloads.add(url)
+        return None
+    
+    def cancel_queued(
+        self,
+        below_priority: Optional[float] = None,
+        tasks: Optional[Set[asyncio.Task]] = None
+    ) -> int:
+        """
+        Cancel downloads that are waiting for a slot.
+        
+        Downloads that have already started are not affected. Cancelled
+        downloads return None and are not recorded as failures.
+        
+        Args:
+            below_priority: Only cancel downloads with a lower priority. If None,
+                            downloads of any priority are cancelled.
+            tasks: Only cancel downloads running in these tasks. If None,
+                   downloads from every caller are cancelled.
+            
+        Returns:
+            The number of downloads cancelled.
+        """
+        def should_cancel(priority: float, owner: Any) -> bool:
+            if below_priority is not None and priority >= below_priority:
+                return False
+            return tasks is None or owner in tasks
+        
+        semaphores = [self.semaphore] + list(self._host_semaphores.values())
+        return sum(semaphore.cancel_waiting(should_cancel) for semaphore in semaphores)
+    
+    def _get_partial_paths(self, url: str) -> Tuple[Path, Path]:
+        """
+        Get the paths of a URL's partial download and its validators.
+        
+        Args:
+            url: The URL being downloaded.
+            
+        Returns:
+            A tuple containing the partial file path and the validator file path.
+        """
+        url_hash = hashlib.md5(url.encode()).hexdigest()
+        return (
+            self.partial_dir / f"{url_hash}.pdf.part",
+            self.partial_dir / f"{url_hash}.json"
+        )
+    
+    def _get_resume_headers(self, url: str) -> Tuple[Dict[str, str], int]:
+        """
+        Get the request headers that resume a partial download.
+        
+        Args:
+            url: The URL being downloaded.
+            
+        Returns:
+            A tuple containing the Range and If-Range headers and the offset to
+            resume from, or an empty dictionary and 0 if there is nothing to resume.
+        """
+        partial_path, state_path = self._get_partial_paths(url)
+        if not partial_path.exists() or not state_path.exists():
+            return {}, 0
+        
+        try:
+            with open(state_path, "r") as f:
+                state = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable partial download state for {url}: {str(e)}")
+            return {}, 0
+        
+        # Weak ETags cannot be used with If-Range
+        etag = state.get("etag")
+        validator = etag if etag and not etag.startswith("W/") else state.get("last_modified")
+        offset = partial_path.stat().st_size
+        if not validator or offset == 0:
+            return {}, 0
+        
+        return {"Range": f"bytes={offset}-", "If-Range": validator}, offset
+    
+    def _discard_partial(self, url: str) -> None:
+        """
+        Remove a URL's partial download and its validators.
+        
+        Args:
+            url: The URL being downloaded.
+        """
+        for path in self._get_partial_paths(url):
+            if path.exists():
+                path.unlink()
     
     async def _download_pdf(
         self,
         url: str,
-        output_path: Path,
-        cache_path: Path
+        output_path: Optional[Path] = None
     ) -> str:
         """
-        Download a PDF from a URL.
+        Download a PDF from a URL, resuming a previous partial download if possible.
         
         Args:
             url: The URL to download the PDF from.
-            output_path: The path to save the PDF to.
-            cache_path: The cache path for the PDF.
+            output_path: The path to save the PDF to. If None, the path of the PDF in the cache is returned.
             
         Returns:
             The path to the downloaded PDF.
@@ -157,67 +516,268 @@ class PDFDownloadManager:
         Raises:
             Exception: If the download fails.
         """
-        logger.info(f"Downloading PDF from {url}")
+        headers, offset = self._get_resume_headers(url)
         
-        # Create the parent directories if they don't exist
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        if offset:
+            logger.info(f"Resuming download of {url} from byte {offset}")
+        else:
+            logger.info(f"Downloading PDF from {url}")
         
-        # Download the PDF
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    raise Exception(f"Failed to download PDF from {url}: {response.status}")
-                
-                # Check if the content type is PDF
-                content_type = response.headers.get('Content-Type', '')
-                if 'application/pdf' not in content_type.lower() and not url.lower().endswith('.pdf'):
-                    raise Exception(f"URL {url} does not point to a PDF: {content_type}")
-                
-                # Save the PDF to the cache path
-                async with aiofiles.open(cache_path, 'wb') as f:
-                    await f.write(await response.read())
-                
-                # If output_path is different from cache_path, copy the file
-                if output_path != cache_path:
-                    await self._copy_file(cache_path, output_path)
+        # Download the PDF over the shared session
+        session = await self._get_session()
+        async with session.get(url, headers=headers) as response:
+            if response.status == 206 and offset:
+                # The server must resume exactly where the partial file ends
+                match = re.match(r"bytes (\d+)-", response.headers.get('Content-Range', ''))
+                if not match or int(match.group(1)) != offset:
+                    self._discard_partial(url)
+                    raise Exception(f"Server returned an unexpected range for {url}")
+            elif response.status == 200:
+                # The server ignored the range or the file changed, so start over
+                offset = 0
+            elif response.status == 416:
+                self._discard_partial(url)
+                raise Exception(f"Server rejected the resume range for {url}")
+            else:
+                raise Exception(f"Failed to download PDF from {url}: {response.status}")
+            
+            # Check if the content type is PDF
+            content_type = response.headers.get('Content-Type', '')
+            if 'application/pdf' not in content_type.lower() and not url.lower().endswith('.pdf'):
+                raise Exception(f"URL {url} does not point to a PDF: {content_type}")
+            
+            # Reject oversized PDFs before reading the body
+            content_length = response.headers.get('Content-Length')
+            if content_length and offset + int(content_length) > self.max_file_size:
+                self._discard_partial(url)
+                raise Exception(
+                    f"PDF at {url} is {offset + int(content_length)} bytes, which "
+                    f"exceeds the {self.max_file_size} byte limit"
+                )
+            
+            # Stream the PDF into the store
+            blob = await self._stream_to_cache(url, response, offset)
+        
+        if output_path is None:
+            output_path = blob
+        else:
+            await asyncio.to_thread(self.store.materialize, blob, output_path)
+        
+        logger.info(f"Downloaded PDF from {url} to {output_path}")
+        
+        return str(output_path)
+    
+    async def _stream_to_cache(
+        self,
+        url: str,
+        response: aiohttp.ClientResponse,
+        offset: int = 0
+    ) -> Path:
+        """
+        Stream a response body into the content-addressed store.
+        
+        The body is appended chunk by chunk to a partial file and hashed on the
+        way, and is only committed to the store once it is complete and valid,
+        so an interrupted download never leaves a corrupt file in the cache.
+        If the connection drops and the server sent a validator, the partial
+        file is kept so the next attempt can resume it.
+        
+        Args:
+            url: The URL being downloaded.
+            response: The response to stream.
+            offset: Number of bytes of the partial file the response continues.
+            
+        Returns:
+            The path of the PDF in the store.
+            
+        Raises:
+            Exception: If the body is not a PDF or exceeds the size limit.
+        """
+        partial_path, state_path = self._get_partial_paths(url)
+        
+        # Resuming is only safe if the server can tell us the file has not changed
+        validators = {
+            "url": url,
+            "etag": response.headers.get('ETag'),
+            "last_modified": response.headers.get('Last-Modified')
+        }
+        resumable = (
+            (validators["etag"] or validators["last_modified"])
+            and (response.status == 206 or response.headers.get('Accept-Ranges', '').lower() == 'bytes')
+        )
+        if resumable:
+            with open(state_path, "w") as f:
+                json.dump(validators, f)
+        elif state_path.exists():
+            state_path.unlink()
+        
+        keep_partial = False
+        
+        try:
+            size = offset
+            header = b""
+            sha256 = hashlib.sha256()
+            
+            async with aiofiles.open(partial_path, 'ab' if offset else 'wb') as f:
+                # Hash the bytes downloaded by earlier attempts
+                if offset:
+                    async with aiofiles.open(partial_path, 'rb') as existing:
+                        remaining = offset
+                        while remaining > 0:
+                            chunk = await existing.read(min(self.chunk_size, remaining))
+                            if not chunk:
+                                break
+                            if len(header) < PDF_MAGIC_WINDOW:
+                                header += chunk
+                            sha256.update(chunk)
+                            remaining -= len(chunk)
                 
-                logger.info(f"Downloaded PDF from {url} to {output_path}")
+                if len(header) >= PDF_MAGIC_WINDOW:
+                    self._check_pdf_magic(url, header)
+                    header = None
                 
-                return str(output_path)
+                try:
+                    async for chunk in response.content.iter_chunked(self.chunk_size):
+                        size += len(chunk)
+                        if size > self.max_file_size:
+                            raise Exception(
+                                f"PDF at {url} exceeds the {self.max_file_size} byte limit"
+                            )
+                        
+                        # Validate the magic bytes as soon as enough data has arrived
+                        if header is not None:
+                            header += chunk
+                            if len(header) >= PDF_MAGIC_WINDOW:
+                                self._check_pdf_magic(url, header)
+                                header = None
+                        
+                        sha256.update(chunk)
+                        await f.write(chunk)
+                except RESUMABLE_ERRORS:
+                    keep_partial = bool(resumable)
+                    if keep_partial:
+                        logger.warning(f"Kept {size} bytes of {url} to resume later")
+                    raise
+            
+            # Validate short files that ended before the magic window filled up
+            if header is not None:
+                self._check_pdf_magic(url, header)
+            
+            # Atomically publish the complete file
+            return self.store.commit(partial_path, sha256.hexdigest(), url)
+        finally:
+            if not keep_partial:
+                self._discard_partial(url)
     
-    async def _copy_file(self, source: Path, destination: Path) -> None:
+    def _check_pdf_magic(self, url: str, header: bytes) -> None:
         """
-        Copy a file from source to destination.
+        Check that the start of a download looks like a PDF.
         
         Args:
-            source: The source path.
-            destination: The destination path.
+            url: The URL being downloaded.
+            header: The first bytes of the download.
+            
+        Raises:
+            Exception: If the PDF magic bytes are missing.
         """
-        async with aiofiles.open(source, 'rb') as src:
-            async with aiofiles.open(destination, 'wb') as dst:
-                await dst.write(await src.read())
+        if PDF_MAGIC not in header[:PDF_MAGIC_WINDOW]:
+            raise Exception(f"URL {url} did not return a PDF file")
+    
+    @staticmethod
+    def _interleave_by_host(urls: List[str]) -> List[str]:
+        """
+        Order URLs round-robin by host.
+        
+        Args:
+            urls: The URLs to order.
+            
+        Returns:
+            The URLs, taking one from each host in turn.
+        """
+        by_host: Dict[str, List[str]] = {}
+        for url in dict.fromkeys(urls):
+            by_host.setdefault(urlparse(url).netloc.lower(), []).append(url)
+        
+        ordered = []
+        queues = list(by_host.values())
+        while queues:
+            for queue in queues:
+                ordered.append(queue.pop(0))
+            queues = [queue for queue in queues if queue]
+        
+        return ordered
     
     async def download_batch(
         self,
         urls: List[str],
         output_dir: Optional[str] = None,
-        force: bool = False
+        force: bool = False,
+        priorities: Optional[Dict[str, float]] = None,
+        deadline: Optional[float] = None,
+        max_downloads: Optional[int] = None,
+        max_bytes: Optional[int] = None
     ) -> Dict[str, Optional[str]]:
         """
         Download multiple PDFs in parallel with rate limiting.
         
+        When a budget is given and runs out, downloads still waiting for a slot
+        are cancelled; downloads already in progress are allowed to finish.
+        
         Args:
             urls: The URLs to download PDFs from.
             output_dir: The directory to save the PDFs to. If None, the PDFs will be saved to the cache directory.
             force: Whether to force download even if the PDFs are already cached.
+            priorities: The priority of each URL. Higher-priority downloads take
+                        free slots first. URLs without a priority get 0.
+            deadline: Seconds after which queued downloads are cancelled.
+            max_downloads: Number of PDFs after which queued downloads are cancelled.
+            max_bytes: Total PDF size in bytes after which queued downloads are cancelled.
             
         Returns:
-            A dictionary mapping URLs to the paths of the downloaded PDFs, or None if the download failed.
+            A dictionary mapping URLs to the paths of the downloaded PDFs, or None
+            if the download failed or was cancelled.
         """
+        priorities = priorities or {}
+        
+        # Alternate between hosts so the slots of busy hosts don't starve the
+        # others, then start higher-priority downloads first
+        ordered = sorted(self._interleave_by_host(urls), key=lambda url: -priorities.get(url, 0.0))
+        
+        # Once a budget runs out, downloads still waiting for a slot are cancelled
+        budgeted = deadline is not None or max_downloads is not None or max_bytes is not None
+        cancel_event = asyncio.Event() if budgeted else None
+        batch_tasks: Set[asyncio.Task] = set()
+        downloaded = {"count": 0, "bytes": 0}
+        
+        def stop(reason: str) -> None:
+            if cancel_event.is_set():
+                return
+            cancel_event.set()
+            cancelled = self.cancel_queued(tasks=batch_tasks)
+            logger.info(f"Reached the {reason}; cancelled {cancelled} queued downloads")
+        
+        def account(path: str) -> None:
+            # Runs before the download's slot goes to a queued download
+            downloaded["count"] += 1
+            downloaded["bytes"] += os.path.getsize(path)
+            if max_downloads is not None and downloaded["count"] >= max_downloads:
+                stop(f"budget of {max_downloads} PDFs")
+            elif max_bytes is not None and downloaded["bytes"] >= max_bytes:
+                stop(f"budget of {max_bytes} bytes")
+        
+        async def download(url: str, output_path: Optional[str]) -> Optional[str]:
+            return await self.download(
+                url,
+                output_path,
+                force,
+                priority=priorities.get(url, 0.0),
+                cancel_event=cancel_event,
+                on_downloaded=account if budgeted else None
+            )
+        
         # Create tasks for downloading each PDF
         tasks = []
-        for url in urls:
+        for url in ordered:
             # If output_dir is provided, create the output path
             output_path = None
             if output_dir:
@@ -232,21 +792,134 @@ class PDFDownloadManager:
                 output_path = os.path.join(output_dir, filename)
             
             # Create a task for downloading the PDF
-            task = asyncio.create_task(self.download(url, output_path, force))
+            task = asyncio.create_task(download(url, output_path))
+            batch_tasks.add(task)
             tasks.append((url, task))
         
-        # Wait for all tasks to complete
+        timer = None
+        if deadline is not None:
+            timer = asyncio.get_running_loop().call_later(
+                deadline, stop, f"deadline of {deadline}s"
+            )
+        
+        # Wait for all tasks to complete, reporting results in input order
+        tasks = dict(tasks)
         results = {}
-        for url, task in tasks:
-            try:
-                results[url] = await task
-            except Exception as e:
-                logger.error(f"Failed to download PDF from {url}: {str(e)}")
-                results[url] = None
-                self.failed_downloads.add(url)
+        try:
+            for url in dict.fromkeys(urls):
+                task = tasks[url]
+                try:
+                    results[url] = await task
+                except Exception as e:
+                    logger.error(f"Failed to download PDF from {url}: {str(e)}")
+                    results[url] = None
+                    self.failed_downloads.add(url)
+        finally:
+            if timer is not None:
+                timer.cancel()
+        
+        return results
+    
+    async def download_papers(
+        self,
+        papers: List[PaperSource],
+        output_dir: Optional[str] = None,
+        force: bool = False,
+        priority: Callable[[PaperSource], float] = get_paper_priority,
+        deadline: Optional[float] = None,
+        max_downloads: Optional[int] = None,
+        max_bytes: Optional[int] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Download the PDFs of multiple papers, most valuable papers first.
+        
+        By default papers are ranked by citation count, review status and
+        open access availability (see get_paper_priority).
+        
+        Args:
+            papers: The papers to download.
+            output_dir: The directory to save the PDFs to. If None, the PDFs will be saved to the cache directory.
+            force: Whether to force download even if the PDFs are already cached.
+            priority: A function scoring each paper; higher scores are downloaded first.
+            deadline: Seconds after which queued downloads are cancelled.
+            max_downloads: Number of PDFs after which queued downloads are cancelled.
+            max_bytes: Total PDF size in bytes after which queued downloads are cancelled.
+            
+        Returns:
+            A dictionary mapping paper IDs to the paths of the downloaded PDFs, or
+            None if the paper has no URL or its download failed or was cancelled.
+        """
+        urls = {}
+        priorities = {}
+        for paper in papers:
+            url = paper.pdf_url or paper.url
+            urls[paper.id] = url
+            if url:
+                priorities[url] = max(priorities.get(url, float("-inf")), priority(paper))
+        
+        paths = await self.download_batch(
+            list(priorities),
+            output_dir=output_dir,
+            force=force,
+            priorities=priorities,
+            deadline=deadline,
+            max_downloads=max_downloads,
+            max_bytes=max_bytes
+        )
+        
+        return {paper_id: paths.get(url) if url else None for paper_id, url in urls.items()}
+    
+    async def retry_failed(
+        self,
+        max_concurrent: Optional[int] = None,
+        due_only: bool = True
+    ) -> Dict[str, Optional[str]]:
+        """
+        Retry the downloads recorded in the failure ledger.
+        
+        Args:
+            max_concurrent: Maximum number of concurrent retries. If None, the
+                            manager's download concurrency is used.
+            due_only: Whether to only retry URLs whose backoff window has passed.
+                      If False, every recorded URL is retried.
+            
+        Returns:
+            A dictionary mapping the retried URLs to the paths of the downloaded
+            PDFs, or None if the download failed again.
+        """
+        urls = self._interleave_by_host(self.failures.keys(due_only=due_only))
+        if not urls:
+            return {}
+        
+        logger.info(f"Retrying {len(urls)} failed downloads")
+        semaphore = asyncio.Semaphore(max_concurrent or self.max_concurrent_downloads)
+        
+        async def retry(url: str) -> Optional[str]:
+            async with semaphore:
+                entry = self.failures.get(url) or {}
+                output_path = entry.get("context", {}).get("output_path")
+                return await self.download(url, output_path, skip_failed=False)
+        
+        paths = await asyncio.gather(*(retry(url) for url in urls), return_exceptions=True)
+        
+        results = {}
+        for url, path in zip(urls, paths):
+            if isinstance(path, Exception):
+                logger.error(f"Failed to retry download from {url}: {str(path)}")
+                path = None
+            results[url] = path
         
         return results
     
+    def get_cancelled_downloads(self) -> Set[str]:
+        """
+        Get the set of URLs whose queued download was cancelled.
+        
+        Returns:
+            The set of URLs whose download was cancelled before it started.
+        """
+        return self.cancelled_downloads
+    
     def get_failed_downloads(self) -> Set[str]:
         """
         Get the set of URLs that failed to download.
@@ -256,11 +929,25 @@ class PDFDownloadManager:
         """
         return self.failed_downloads
     
+    def get_dedup_stats(self) -> Dict[str, Any]:
+        """
+        Get deduplication statistics for the PDF cache.
+        
+        Returns:
+            A dictionary with the number of cached URLs and stored PDFs, the
+            deduplication ratio, and the bytes saved by storing each PDF once.
+        """
+        return self.store.get_stats()
+    
     def clear_cache(self) -> None:
         """
         Clear the cache directory.
         """
         for file in self.cache_dir.glob('*.pdf'):
             file.unlink()
+        for file in self.partial_dir.iterdir():
+            file.unlink()
+        self.store.clear()
+        self.failures.clear()
         
         logger.info(f"Cleared PDF cache directory: {self.cache_dir}")
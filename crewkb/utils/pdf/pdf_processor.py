@@ -6,17 +6,54 @@ and extracting content.
 """
 
 import os
+import json
+import uuid
 import asyncio
 import logging
 from pathlib import Path
-from typing import Optional, Dict, Any, List, Set, Tuple
+from typing import Optional, Dict, Any, List, Set, Tuple, AsyncIterator
 
 from crewkb.utils.pdf.pdf_download_manager import PDFDownloadManager
 from crewkb.utils.pdf.marker_wrapper import MarkerWrapper
+from crewkb.utils.pdf.parse_pool import PDFParsePool, DEFAULT_PARSE_WORKERS
+from crewkb.utils.pdf.pdf_blob_store import materialize_file
+from crewkb.utils.pdf.failure_ledger import FailureLedger
 from crewkb.models.knowledge.paper import PaperSource
 
 logger = logging.getLogger(__name__)
 
+# Processing modes: "full" parses the whole paper, "triage" only its first pages
+PROCESSING_MODES = ("full", "triage")
+
+# Sections kept by a triage parse
+TRIAGE_SECTIONS = ("abstract", "introduction")
+
+# Version of the persisted sections files; bump it when section extraction
+# changes so stale files are rebuilt from the cached markdown
+SECTIONS_CACHE_VERSION = 1
+
+
+class _PaperJob:
+    """State of a paper as it moves through the processing stages."""
+    
+    def __init__(
+        self,
+        paper: PaperSource,
+        pdf_url: str,
+        cache_path: Path,
+        output_path: Optional[str],
+        mode: str = "full",
+        skip_failed: bool = True
+    ):
+        self.paper = paper
+        self.pdf_url = pdf_url
+        self.cache_path = cache_path
+        self.output_path = output_path
+        self.mode = mode
+        self.skip_failed = skip_failed
+        self.pdf_path: Optional[str] = None
+        self.markdown: Optional[str] = None
+
 
 class PDFProcessor:
     """
@@ -24,9 +61,15 @@ class PDFProcessor:
     
     This class orchestrates the download and parsing of PDFs, with support for:
     - Downloading PDFs from URLs
-    - Parsing PDFs to markdown format
-    - Extracting sections from parsed PDFs
-    - Tracking failed downloads and parsing attempts
+    - Parsing PDFs to markdown format in a pool of worker processes
+    - Recording which parse tier (text layer or Marker) served each paper
+    - Extracting sections from parsed PDFs, persisted next to the cached
+      markdown so cache hits skip re-extraction
+    - A triage mode that parses only the first pages of a paper for ranking,
+      which can later be promoted to a full parse without another download
+    - Tracking failed downloads and parsing attempts in a persistent ledger,
+      so papers that keep failing are skipped until their backoff has passed
+      and can be retried in a batch
     - Providing fallback options for failed processing
     """
     
@@ -36,7 +79,11 @@ class PDFProcessor:
         marker_wrapper: Optional[MarkerWrapper] = None,
         cache_dir: str = "cache/pdf_processor",
         use_llm: bool = True,
-        google_api_key: Optional[str] = None
+        google_api_key: Optional[str] = None,
+        parse_workers: Optional[int] = None,
+        max_parses_per_worker: int = 20,
+        pages_per_shard: int = 40,
+        triage_pages: int = 3
     ):
         """
         Initialize the PDFProcessor.
@@ -48,6 +95,18 @@ class PDFProcessor:
             use_llm: Whether to use Gemini for improved accuracy.
             google_api_key: Google API key for Gemini. If None, will use the
                             GOOGLE_API_KEY environment variable.
+            parse_workers: Number of worker processes used for parsing. If None,
+                           DEFAULT_PARSE_WORKERS are used, unless a marker_wrapper
+                           is provided, in which case that instance parses in a
+                           background thread. Use 0 to always parse in a thread.
+                           Each worker loads a full set of Marker models, and
+                           the workers are shared by every PDFProcessor of
+                           the process.
+            max_parses_per_worker: Number of PDFs a worker parses before it is
+                                   replaced, to cap memory growth.
+            pages_per_shard: PDFs longer than this are split into page ranges
+                             that are parsed in parallel by the workers.
+            triage_pages: Number of leading pages parsed in triage mode.
         """
         self.download_manager = download_manager or PDFDownloadManager(
             cache_dir=os.path.join(cache_dir, "downloads")
@@ -59,34 +118,111 @@ class PDFProcessor:
             google_api_key=google_api_key
         )
         
+        # An injected MarkerWrapper cannot be rebuilt inside the workers, so it
+        # parses in a background thread unless workers are requested explicitly
+        if parse_workers is None:
+            parse_workers = 0 if marker_wrapper is not None else DEFAULT_PARSE_WORKERS
+        
+        self.parse_pool: Optional[PDFParsePool] = None
+        if parse_workers > 0:
+            self.parse_pool = PDFParsePool(
+                max_workers=parse_workers,
+                max_tasks_per_worker=max_parses_per_worker,
+                use_llm=self.marker_wrapper.use_llm,
+                output_format=self.marker_wrapper.output_format,
+                cache_dir=str(self.marker_wrapper.cache_dir),
+                tier=self.marker_wrapper.tier,
+                min_text_quality=self.marker_wrapper.min_text_quality,
+                pages_per_shard=pages_per_shard
+            )
+        
         self.cache_dir = Path(cache_dir)
         self.cache_dir.mkdir(parents=True, exist_ok=True)
         
+        self.triage_pages = triage_pages
+        
         self.failed_processing: Set[str] = set()
+        
+        # Failures persist across runs, with the paper needed to retry them
+        self.failures = FailureLedger(self.cache_dir / "failures.json")
+        
+        # The parse tier that served each paper, by paper ID
+        self.parse_tiers: Dict[str, str] = {}
     
-    async def process_paper(
+    async def _parse_pdf(
+        self,
+        pdf_path: str,
+        use_llm: Optional[bool] = None,
+        tier: Optional[str] = None,
+        page_range: Optional[str] = None,
+        skip_failed: bool = True
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """
+        Parse a PDF without blocking the event loop.
+        
+        Args:
+            pdf_path: Path to the PDF file.
+            use_llm: Whether to use Gemini for improved accuracy. If None, will use
+                     the value provided in the constructor.
+            tier: The parse tier ("auto", "fast" or "marker"). If None, the
+                  MarkerWrapper's default tier is used.
+            page_range: Pages to parse, in Marker's page range syntax. If None,
+                        the whole PDF is parsed.
+            skip_failed: Whether to skip PDFs that failed to parse recently.
+            
+        Returns:
+            A tuple containing the parsed markdown and the metadata dictionary
+            (both None if parsing failed).
+        """
+        parse_kwargs = {"use_llm": use_llm}
+        if tier:
+            parse_kwargs["tier"] = tier
+        if page_range:
+            parse_kwargs["page_range"] = page_range
+        if not skip_failed:
+            parse_kwargs["skip_failed"] = False
+        
+        if self.parse_pool is not None:
+            # Long PDFs are split into shards across the workers
+            markdown, metadata = await self.parse_pool.parse_sharded(pdf_path, **parse_kwargs)
+            
+            # The worker's failure set lives in another process
+            if not markdown:
+                self.marker_wrapper.failed_parsing.add(pdf_path)
+            
+            return markdown, metadata
+        
+        # Only the text is needed, so skip listing the images
+        markdown, metadata, _ = await asyncio.to_thread(
+            self.marker_wrapper.parse_pdf,
+            pdf_path,
+            load_images=False,
+            **parse_kwargs
+        )
+        return markdown, metadata
+    
+    def _prepare_job(
         self,
         paper: PaperSource,
         output_dir: Optional[str] = None,
-        force: bool = False,
-        use_llm: Optional[bool] = None
-    ) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        mode: str = "full",
+        skip_failed: bool = True
+    ) -> Optional["_PaperJob"]:
         """
-        Process a paper and extract its content.
+        Resolve the URL and the cache and output paths for a paper.
         
         Args:
             paper: The PaperSource object representing the paper.
-            output_dir: The directory to save the processed paper to. If None,
-                        the paper will be saved to the cache directory.
-            force: Whether to force processing even if the paper is already cached.
-            use_llm: Whether to use Gemini for improved accuracy. If None, will use
-                     the value provided in the constructor.
+            output_dir: The directory to save the processed paper to.
+            mode: The processing mode ("full" or "triage").
+            skip_failed: Whether the job skips downloads and parses that failed recently.
             
         Returns:
-            A tuple containing:
-            - The path to the processed markdown file (or None if processing failed)
-            - A dictionary mapping section names to section content (or None if processing failed)
+            The job for the paper, or None if the paper has no URL.
         """
+        if mode not in PROCESSING_MODES:
+            raise ValueError(f"Unknown processing mode {mode}, expected one of {PROCESSING_MODES}")
+        
         # Get the PDF URL from the paper
         pdf_url = paper.pdf_url
         
@@ -94,11 +230,12 @@ class PDFProcessor:
         if not pdf_url:
             pdf_url = paper.url
         
-        # If we still don't have a URL, we can't process the paper
+        # If we still don't have a URL, we can't process the paper. Retrying
+        # won't help, so the paper is skipped without a ledger entry
         if not pdf_url:
-            logger.error(f"Paper {paper.title} has no URL to download from")
+            logger.warning(f"Skipping paper {paper.title}, which has no URL to download from")
             self.failed_processing.add(paper.id)
-            return None, None
+            return None
         
         # Create the output directory if it doesn't exist
         if output_dir:
@@ -116,93 +253,459 @@ class PDFProcessor:
                 sanitized_title = sanitized_title[:100]
             
             # Create the output path
-            output_path = os.path.join(output_dir, f"{sanitized_title}.md")
+            suffix = ".triage.md" if mode == "triage" else ".md"
+            output_path = os.path.join(output_dir, f"{sanitized_title}{suffix}")
         
-        # Create the cache key
-        cache_key = f"{paper.id}.md"
+        # Create the cache key; triage results are cached apart from full parses
+        cache_key = f"{paper.id}.triage.md" if mode == "triage" else f"{paper.id}.md"
         cache_path = self.cache_dir / cache_key
         
-        # If the file already exists and force is False, return the cached result
-        if not force and cache_path.exists():
-            logger.info(f"Paper {paper.title} already processed at {cache_path}")
+        return _PaperJob(paper, pdf_url, cache_path, output_path, mode, skip_failed)
+    
+    def _record_failure(self, paper: PaperSource, mode: str, stage: str, reason: str) -> None:
+        """
+        Record that a paper failed to process.
+        
+        Args:
+            paper: The PaperSource object representing the paper.
+            mode: The processing mode ("full" or "triage").
+            stage: The stage that failed.
+            reason: Why the stage failed.
+        """
+        self.failed_processing.add(paper.id)
+        self.failures.record_failure(
+            self._get_failure_key(paper, mode),
+            f"{stage}: {reason}",
+            {"paper": paper.to_dict(), "mode": mode, "stage": stage}
+        )
+    
+    def _get_failure_key(self, paper: PaperSource, mode: str) -> str:
+        """
+        Get the failure ledger key for a paper.
+        
+        Args:
+            paper: The PaperSource object representing the paper.
+            mode: The processing mode ("full" or "triage").
             
-            # Load the cached result
-            with open(cache_path, "r") as f:
-                markdown = f.read()
+        Returns:
+            The ledger key; triage failures are kept apart from full ones.
+        """
+        return f"{paper.id}.triage" if mode == "triage" else paper.id
+    
+    def _is_blocked(self, job: "_PaperJob") -> bool:
+        """
+        Check whether a job's paper failed recently and is within its backoff window.
+        
+        Args:
+            job: The job for the paper.
             
-            # Extract sections from the markdown
-            sections = self.marker_wrapper.extract_sections(markdown)
+        Returns:
+            True if the paper should be skipped, False otherwise.
+        """
+        if not job.skip_failed or not self.failures.is_blocked(self._get_failure_key(job.paper, job.mode)):
+            return False
+        
+        logger.info(f"Skipping paper {job.paper.title}, which failed recently")
+        self.failed_processing.add(job.paper.id)
+        return True
+    
+    def _select_sections(self, job: "_PaperJob", sections: Dict[str, str]) -> Dict[str, str]:
+        """
+        Keep the sections a job's mode asks for.
+        
+        Args:
+            job: The job for the paper.
+            sections: The sections extracted from the markdown.
             
-            # If output_path is provided and different from cache_path, copy the file
-            if output_path and str(cache_path) != output_path:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(cache_path, "r") as src:
-                    with open(output_path, "w") as dst:
-                        dst.write(src.read())
+        Returns:
+            All sections for a full parse, or the triage sections for a triage parse.
+        """
+        if job.mode != "triage":
+            return sections
+        
+        return {name: content for name, content in sections.items() if name in TRIAGE_SECTIONS}
+    
+    def _get_source_path(self, job: "_PaperJob") -> Path:
+        """
+        Get the path of the record of which PDF a cached result was parsed from.
+        
+        Args:
+            job: The job for the paper.
             
-            return str(cache_path), sections
+        Returns:
+            The path of the source record.
+        """
+        return job.cache_path.with_suffix(".source.json")
+    
+    def _find_triaged_pdf(self, job: "_PaperJob") -> Optional[str]:
+        """
+        Find the PDF a previous triage parse of a paper downloaded.
+        
+        Args:
+            job: The full-mode job for the paper.
+            
+        Returns:
+            The path of the local PDF, or None if the paper was not triaged from
+            the same URL or the PDF is gone.
+        """
+        source_path = self.cache_dir / f"{job.paper.id}.triage.source.json"
+        if not source_path.exists():
+            return None
         
         try:
-            # Download the PDF
-            pdf_path = await self.download_manager.download(pdf_url)
+            with open(source_path, "r") as f:
+                source = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable triage record {source_path}: {str(e)}")
+            return None
+        
+        pdf_path = source.get("pdf_path")
+        if source.get("pdf_url") != job.pdf_url or not pdf_path or not os.path.exists(pdf_path):
+            return None
+        
+        return pdf_path
+    
+    def _get_sections_path(self, job: "_PaperJob") -> Path:
+        """
+        Get the path of the persisted sections of a cached result.
+        
+        Args:
+            job: The job for the paper.
             
-            # If the download failed, we can't process the paper
-            if not pdf_path:
-                logger.error(f"Failed to download PDF for paper {paper.title}")
-                self.failed_processing.add(paper.id)
-                return None, None
+        Returns:
+            The path of the sections file.
+        """
+        return job.cache_path.with_suffix(".sections.json")
+    
+    def _save_sections(self, job: "_PaperJob", sections: Dict[str, str]) -> None:
+        """
+        Persist the sections of a cached result.
+        
+        The file records the cache version, the processing mode and the size of
+        the markdown it was extracted from, so stale files can be detected.
+        
+        Args:
+            job: The job for the paper.
+            sections: The sections to persist.
+        """
+        sections_path = self._get_sections_path(job)
+        temp_path = sections_path.with_name(f"{sections_path.name}.{uuid.uuid4().hex}.part")
+        with open(temp_path, "w") as f:
+            json.dump({
+                "version": SECTIONS_CACHE_VERSION,
+                "mode": job.mode,
+                "markdown_size": job.cache_path.stat().st_size,
+                "sections": sections
+            }, f)
+        os.replace(temp_path, sections_path)
+    
+    def _load_sections(self, job: "_PaperJob") -> Optional[Dict[str, str]]:
+        """
+        Load the persisted sections of a cached result.
+        
+        Args:
+            job: The job for the paper.
             
-            # Parse the PDF
-            markdown, metadata, _ = self.marker_wrapper.parse_pdf(
-                pdf_path,
-                use_llm=use_llm
-            )
+        Returns:
+            The sections, or None if the file is missing, unreadable, from
+            another cache version, or does not match the cached markdown.
+        """
+        sections_path = self._get_sections_path(job)
+        if not sections_path.exists():
+            return None
+        
+        try:
+            with open(sections_path, "r") as f:
+                record = json.load(f)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable sections file {sections_path}: {str(e)}")
+            return None
+        
+        # Files written before versioning hold the bare sections dictionary
+        if (
+            not isinstance(record, dict)
+            or record.get("version") != SECTIONS_CACHE_VERSION
+            or record.get("mode") != job.mode
+            or record.get("markdown_size") != job.cache_path.stat().st_size
+        ):
+            logger.info(f"Rebuilding stale sections file {sections_path}")
+            return None
+        
+        return record.get("sections")
+    
+    def _write_markdown(self, cache_path: Path, markdown: str) -> None:
+        """
+        Atomically write markdown to the cache.
+        
+        Output files may be hardlinks to a cached file, so the cached file is
+        replaced rather than rewritten in place.
+        
+        Args:
+            cache_path: The path of the cached markdown.
+            markdown: The markdown to write.
+        """
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{uuid.uuid4().hex}.part")
+        with open(temp_path, "w") as f:
+            f.write(markdown)
+        os.replace(temp_path, cache_path)
+    
+    def _materialize_output(self, job: "_PaperJob") -> None:
+        """
+        Make the cached markdown available at the job's output path.
+        
+        Args:
+            job: The job for the paper.
+        """
+        if job.output_path and str(job.cache_path) != job.output_path:
+            method = materialize_file(job.cache_path, Path(job.output_path))
+            logger.debug(f"Materialized {job.output_path} from the cache with a {method}")
+    
+    def _load_cached(self, job: "_PaperJob") -> Tuple[str, Dict[str, str]]:
+        """
+        Load an already processed paper from the cache.
+        
+        Args:
+            job: The job for the paper.
             
-            # If the parsing failed, we can't process the paper
-            if not markdown:
-                logger.error(f"Failed to parse PDF for paper {paper.title}")
-                self.failed_processing.add(paper.id)
-                return None, None
+        Returns:
+            A tuple containing the cached markdown path and the sections.
+        """
+        logger.info(f"Paper {job.paper.title} already processed at {job.cache_path}")
+        
+        sections = self._load_sections(job)
+        
+        # Rebuild missing or stale sections from the cached markdown
+        if sections is None:
+            with open(job.cache_path, "r") as f:
+                markdown = f.read()
             
-            # Extract sections from the markdown
-            sections = self.marker_wrapper.extract_sections(markdown)
+            sections = self._select_sections(job, self.marker_wrapper.extract_sections(markdown))
+            self._save_sections(job, sections)
+        
+        # Link the output to the cached file instead of copying it
+        self._materialize_output(job)
+        
+        return str(job.cache_path), sections
+    
+    async def _download_stage(self, job: "_PaperJob") -> bool:
+        """
+        Download the PDF for a job.
+        
+        Args:
+            job: The job for the paper.
             
-            # Save the markdown to the cache path
-            cache_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(cache_path, "w") as f:
-                f.write(markdown)
+        Returns:
+            True if the PDF was downloaded, False otherwise.
+        """
+        # A paper promoted from triage reuses the PDF the triage parse downloaded
+        if job.mode == "full":
+            job.pdf_path = self._find_triaged_pdf(job)
+            if job.pdf_path:
+                logger.info(f"Reusing triaged PDF {job.pdf_path} for paper {job.paper.title}")
+                return True
+        
+        if job.skip_failed:
+            job.pdf_path = await self.download_manager.download(job.pdf_url)
+        else:
+            job.pdf_path = await self.download_manager.download(job.pdf_url, skip_failed=False)
+        
+        # If the download failed, we can't process the paper
+        if not job.pdf_path:
+            logger.error(f"Failed to download PDF for paper {job.paper.title}")
+            self._record_failure(job.paper, job.mode, "download", f"failed to download {job.pdf_url}")
+            return False
+        
+        return True
+    
+    async def _parse_stage(
+        self,
+        job: "_PaperJob",
+        use_llm: Optional[bool] = None,
+        tier: Optional[str] = None
+    ) -> bool:
+        """
+        Parse the downloaded PDF for a job.
+        
+        Args:
+            job: The job for the paper.
+            use_llm: Whether to use Gemini for improved accuracy.
+            tier: The parse tier ("auto", "fast" or "marker").
             
-            # Save the sections to a separate file
-            sections_path = cache_path.with_suffix(".sections.json")
-            import json
-            with open(sections_path, "w") as f:
-                json.dump(sections, f)
+        Returns:
+            True if the PDF was parsed, False otherwise.
+        """
+        # Triage only parses the first pages
+        page_range = f"0-{self.triage_pages - 1}" if job.mode == "triage" else None
+        
+        # Parse the PDF off the event loop so downloads keep flowing
+        job.markdown, metadata = await self._parse_pdf(
+            job.pdf_path,
+            use_llm=use_llm,
+            tier=tier,
+            page_range=page_range,
+            skip_failed=job.skip_failed
+        )
+        
+        if metadata and metadata.get("parse_tier"):
+            self.parse_tiers[job.paper.id] = metadata["parse_tier"]
+        
+        # If the parsing failed, we can't process the paper
+        if not job.markdown:
+            logger.error(f"Failed to parse PDF for paper {job.paper.title}")
+            self._record_failure(job.paper, job.mode, "parse", f"failed to parse {job.pdf_path}")
+            return False
+        
+        return True
+    
+    def _section_stage(self, job: "_PaperJob") -> Tuple[str, Dict[str, str]]:
+        """
+        Extract sections from the parsed markdown and write the results.
+        
+        Args:
+            job: The job for the paper.
             
-            # If output_path is provided, save the markdown to the output path
-            if output_path:
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                with open(output_path, "w") as f:
-                    f.write(markdown)
+        Returns:
+            A tuple containing the cached markdown path and the sections.
+        """
+        markdown = job.markdown
+        cache_path = job.cache_path
+        
+        # Extract sections from the markdown
+        sections = self._select_sections(job, self.marker_wrapper.extract_sections(markdown))
+        
+        # Save the markdown to the cache path
+        self._write_markdown(cache_path, markdown)
+        
+        # Save the sections to a separate file
+        self._save_sections(job, sections)
+        
+        # Record the PDF so a triaged paper can be promoted without a download
+        with open(self._get_source_path(job), "w") as f:
+            json.dump({"pdf_url": job.pdf_url, "pdf_path": job.pdf_path}, f)
+        
+        # If output_path is provided, link it to the cached markdown
+        self._materialize_output(job)
+        
+        self.failures.record_success(self._get_failure_key(job.paper, job.mode))
+        
+        logger.info(f"Processed paper {job.paper.title} to {cache_path}")
+        
+        return str(cache_path), sections
+    
+    async def process_paper(
+        self,
+        paper: PaperSource,
+        output_dir: Optional[str] = None,
+        force: bool = False,
+        use_llm: Optional[bool] = None,
+        tier: Optional[str] = None,
+        mode: str = "full",
+        skip_failed: bool = True
+    ) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """
+        Process a paper and extract its content.
+        
+        Args:
+            paper: The PaperSource object representing the paper.
+            output_dir: The directory to save the processed paper to. If None,
+                        the paper will be saved to the cache directory.
+            force: Whether to force processing even if the paper is already cached.
+            use_llm: Whether to use Gemini for improved accuracy. If None, will use
+                     the value provided in the constructor.
+            tier: The parse tier ("auto", "fast" or "marker"). If None, the
+                  MarkerWrapper's default tier is used.
+            mode: "full" to parse the whole paper, or "triage" to parse only the
+                  first triage_pages pages and keep the abstract and introduction.
+            skip_failed: Whether to skip papers, URLs and PDFs that failed in an
+                         earlier attempt and are still within their backoff window.
             
-            logger.info(f"Processed paper {paper.title} to {cache_path}")
+        Returns:
+            A tuple containing:
+            - The path to the processed markdown file (or None if processing failed)
+            - A dictionary mapping section names to section content (or None if processing failed)
+        """
+        job = self._prepare_job(paper, output_dir, mode, skip_failed)
+        if job is None:
+            return None, None
+        
+        # If the file already exists and force is False, return the cached result
+        if not force and job.cache_path.exists():
+            return self._load_cached(job)
+        
+        if self._is_blocked(job):
+            return None, None
+        
+        try:
+            if not await self._download_stage(job):
+                return None, None
             
-            return str(cache_path), sections
+            if not await self._parse_stage(job, use_llm=use_llm, tier=tier):
+                return None, None
+            
+            return self._section_stage(job)
             
         except Exception as e:
             logger.error(f"Failed to process paper {paper.title}: {str(e)}")
-            self.failed_processing.add(paper.id)
+            self._record_failure(paper, mode, "process", str(e))
             return None, None
     
+    async def promote_triage(
+        self,
+        paper: PaperSource,
+        output_dir: Optional[str] = None,
+        use_llm: Optional[bool] = None,
+        tier: Optional[str] = None
+    ) -> Tuple[Optional[str], Optional[Dict[str, str]]]:
+        """
+        Fully process a paper that was previously triaged.
+        
+        The PDF downloaded for the triage parse is reused, so promotion only
+        costs the full parse.
+        
+        Args:
+            paper: The PaperSource object representing the paper.
+            output_dir: The directory to save the processed paper to. If None,
+                        the paper will be saved to the cache directory.
+            use_llm: Whether to use Gemini for improved accuracy. If None, will use
+                     the value provided in the constructor.
+            tier: The parse tier ("auto", "fast" or "marker"). If None, the
+                  MarkerWrapper's default tier is used.
+            
+        Returns:
+            A tuple containing:
+            - The path to the processed markdown file (or None if processing failed)
+            - A dictionary mapping section names to section content (or None if processing failed)
+        """
+        return await self.process_paper(
+            paper,
+            output_dir=output_dir,
+            use_llm=use_llm,
+            tier=tier,
+            mode="full"
+        )
+    
     async def process_papers(
         self,
         papers: List[PaperSource],
         output_dir: Optional[str] = None,
         force: bool = False,
         use_llm: Optional[bool] = None,
-        max_concurrent: int = 5
-    ) -> Dict[str, Tuple[Optional[str], Optional[Dict[str, str]]]]:
+        tier: Optional[str] = None,
+        mode: str = "full",
+        max_concurrent: int = 5,
+        parse_concurrency: Optional[int] = None,
+        section_concurrency: int = 1,
+        queue_size: Optional[int] = None,
+        skip_failed: bool = True
+    ) -> AsyncIterator[Tuple[str, Tuple[Optional[str], Optional[Dict[str, str]]]]]:
         """
-        Process multiple papers in parallel.
+        Process multiple papers in an overlapping download, parse and section pipeline.
+        
+        Each stage has its own workers and hands papers to the next stage
+        through a bounded queue, so downloads continue while earlier papers
+        are being parsed. Results are yielded as soon as each paper finishes,
+        in completion order.
         
         Args:
             papers: The list of PaperSource objects to process.
@@ -211,34 +714,177 @@ class PDFProcessor:
             force: Whether to force processing even if the papers are already cached.
             use_llm: Whether to use Gemini for improved accuracy. If None, will use
                      the value provided in the constructor.
-            max_concurrent: Maximum number of papers to process concurrently.
+            tier: The parse tier ("auto", "fast" or "marker"). If None, the
+                  MarkerWrapper's default tier is used.
+            mode: "full" to parse the whole papers, or "triage" to parse only
+                  their first pages.
+            max_concurrent: Maximum number of concurrent downloads.
+            parse_concurrency: Maximum number of concurrent parses. If None, the
+                               number of parse workers is used.
+            section_concurrency: Maximum number of concurrent section extractions.
+            queue_size: Maximum number of papers waiting between two stages. If
+                        None, twice the parse concurrency is used.
+            skip_failed: Whether to skip papers, URLs and PDFs that failed in an
+                         earlier attempt and are still within their backoff window.
             
-        Returns:
-            A dictionary mapping paper IDs to tuples containing:
+        Yields:
+            Tuples of the paper ID and a tuple containing:
             - The path to the processed markdown file (or None if processing failed)
             - A dictionary mapping section names to section content (or None if processing failed)
         """
-        # Create a semaphore to limit concurrent processing
-        semaphore = asyncio.Semaphore(max_concurrent)
+        if not papers:
+            return
+        
+        if parse_concurrency is None:
+            parse_concurrency = (
+                self.parse_pool.max_workers if self.parse_pool else max_concurrent
+            )
+        queue_size = queue_size or 2 * parse_concurrency
+        
+        download_queue: asyncio.Queue = asyncio.Queue()
+        parse_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        section_queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        results: asyncio.Queue = asyncio.Queue()
+        
+        for paper in papers:
+            download_queue.put_nowait(paper)
         
-        # Create tasks for processing each paper
-        async def process_with_semaphore(paper):
-            async with semaphore:
-                return paper.id, await self.process_paper(
-                    paper,
-                    output_dir=output_dir,
-                    force=force,
-                    use_llm=use_llm
-                )
+        async def fail(paper: PaperSource, stage: str, error: Exception) -> None:
+            logger.error(f"Failed to process paper {paper.title} in the {stage} stage: {str(error)}")
+            self._record_failure(paper, mode, stage, str(error))
+            await results.put((paper.id, (None, None)))
         
-        # Create tasks for processing each paper
-        tasks = [process_with_semaphore(paper) for paper in papers]
+        async def download_worker() -> None:
+            while not download_queue.empty():
+                paper = download_queue.get_nowait()
+                
+                try:
+                    job = self._prepare_job(paper, output_dir, mode, skip_failed)
+                    if job is None:
+                        await results.put((paper.id, (None, None)))
+                    elif not force and job.cache_path.exists():
+                        await results.put((paper.id, self._load_cached(job)))
+                    elif self._is_blocked(job):
+                        await results.put((paper.id, (None, None)))
+                    elif await self._download_stage(job):
+                        await parse_queue.put(job)
+                    else:
+                        await results.put((paper.id, (None, None)))
+                except Exception as e:
+                    await fail(paper, "download", e)
+        
+        async def parse_worker() -> None:
+            while True:
+                job = await parse_queue.get()
+                if job is None:
+                    return
+                
+                try:
+                    if await self._parse_stage(job, use_llm=use_llm, tier=tier):
+                        await section_queue.put(job)
+                    else:
+                        await results.put((job.paper.id, (None, None)))
+                except Exception as e:
+                    await fail(job.paper, "parse", e)
+        
+        async def section_worker() -> None:
+            while True:
+                job = await section_queue.get()
+                if job is None:
+                    return
+                
+                try:
+                    result = await asyncio.to_thread(self._section_stage, job)
+                    await results.put((job.paper.id, result))
+                except Exception as e:
+                    await fail(job.paper, "sections", e)
+        
+        async def run_stage(workers, next_queue, next_workers) -> None:
+            # Once a stage drains, tell every worker of the next stage to stop
+            await asyncio.gather(*workers)
+            for _ in range(next_workers):
+                await next_queue.put(None)
+        
+        stages = [
+            asyncio.create_task(run_stage(
+                [download_worker() for _ in range(max_concurrent)],
+                parse_queue,
+                parse_concurrency
+            )),
+            asyncio.create_task(run_stage(
+                [parse_worker() for _ in range(parse_concurrency)],
+                section_queue,
+                section_concurrency
+            )),
+            asyncio.create_task(run_stage(
+                [section_worker() for _ in range(section_concurrency)],
+                results,
+                0
+            ))
+        ]
+        
+        try:
+            for _ in range(len(papers)):
+                yield await results.get()
+        finally:
+            # Stop the pipeline if the caller stops iterating early
+            for stage in stages:
+                stage.cancel()
+            await asyncio.gather(*stages, return_exceptions=True)
+    
+    async def retry_failed(
+        self,
+        output_dir: Optional[str] = None,
+        use_llm: Optional[bool] = None,
+        tier: Optional[str] = None,
+        max_concurrent: int = 5,
+        due_only: bool = True
+    ) -> Dict[str, Tuple[Optional[str], Optional[Dict[str, str]]]]:
+        """
+        Retry the papers recorded in the failure ledger.
+        
+        Each paper is retried in the mode it failed in, bypassing the backoff
+        of its download and parse as well. Papers that fail again have their
+        backoff extended.
+        
+        Args:
+            output_dir: The directory to save the processed papers to. If None,
+                        the papers will be saved to the cache directory.
+            use_llm: Whether to use Gemini for improved accuracy. If None, will use
+                     the value provided in the constructor.
+            tier: The parse tier ("auto", "fast" or "marker"). If None, the
+                  MarkerWrapper's default tier is used.
+            max_concurrent: Maximum number of concurrent downloads.
+            due_only: Whether to only retry papers whose backoff window has passed.
+                      If False, every recorded paper is retried.
+            
+        Returns:
+            A dictionary mapping the retried paper IDs to a tuple containing:
+            - The path to the processed markdown file (or None if processing failed)
+            - A dictionary mapping section names to section content (or None if processing failed)
+        """
+        papers_by_mode: Dict[str, List[PaperSource]] = {}
+        for key in self.failures.keys(due_only=due_only):
+            context = (self.failures.get(key) or {}).get("context") or {}
+            if "paper" not in context:
+                continue
+            
+            paper = PaperSource.from_dict(context["paper"])
+            papers_by_mode.setdefault(context.get("mode", "full"), []).append(paper)
         
-        # Wait for all tasks to complete
         results = {}
-        for task in asyncio.as_completed(tasks):
-            paper_id, result = await task
-            results[paper_id] = result
+        for mode, papers in papers_by_mode.items():
+            logger.info(f"Retrying {len(papers)} failed papers in {mode} mode")
+            async for paper_id, result in self.process_papers(
+                papers,
+                output_dir=output_dir,
+                use_llm=use_llm,
+                tier=tier,
+                mode=mode,
+                max_concurrent=max_concurrent,
+                skip_failed=False
+            ):
+                results[paper_id] = result
         
         return results
     
@@ -251,6 +897,25 @@ class PDFProcessor:
         """
         return self.failed_processing
     
+    def get_parse_tiers(self) -> Dict[str, str]:
+        """
+        Get the parse tier that served each paper parsed by this processor.
+        
+        Returns:
+            A dictionary mapping paper IDs to "fast" or "marker".
+        """
+        return self.parse_tiers
+    
+    def close(self) -> None:
+        """
+        Shut down the parse worker processes.
+        
+        The workers are shared by every PDFProcessor of the process; the next
+        parse by any of them starts fresh workers.
+        """
+        if self.parse_pool is not None:
+            self.parse_pool.shutdown()
+    
     def clear_cache(self) -> None:
         """
         Clear the cache directory.
@@ -265,5 +930,6 @@ class PDFProcessor:
         for file in self.cache_dir.glob("*"):
             if file.is_file():
                 file.unlink()
+        self.failures.clear()
         
         logger.info(f"Cleared PDF processor cache directory: {self.cache_dir}")
@@ -0,0 +1,249 @@
+"""
+Text Layer Extraction for CrewKB.
+
+This module provides a fast parse tier that reads the embedded text layer of
+born-digital PDFs, rebuilds headings with simple heuristics, and scores the
+result so poor extractions can be escalated to Marker.
+"""
+
+import re
+import logging
+import unicodedata
+from typing import Optional, Dict, Any, List, Tuple
+
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+logger = logging.getLogger(__name__)
+
+# Parse tiers: "fast" reads the text layer only, "marker" always runs Marker,
+# and "auto" tries the text layer and escalates to Marker when it scores low
+PARSE_TIERS = ("auto", "fast", "marker")
+
+# Minimum quality score for a text layer extraction to be used in "auto" mode
+DEFAULT_MIN_QUALITY = 0.7
+
+# Characters per page at which the text density score saturates
+TARGET_CHARS_PER_PAGE = 1500
+
+# Garbage character ratio at which the garbage score drops to zero
+MAX_GARBAGE_RATIO = 0.05
+
+# Number of recognized sections at which the section score saturates
+TARGET_SECTIONS = 3
+
+# Standard paper section headings, used to detect unnumbered headings
+SECTION_HEADINGS = {
+    "abstract": "abstract",
+    "summary": "abstract",
+    "introduction": "introduction",
+    "background": "introduction",
+    "methods": "methods",
+    "methodology": "methods",
+    "materials and methods": "methods",
+    "patients and methods": "methods",
+    "results": "results",
+    "findings": "results",
+    "results and discussion": "results",
+    "discussion": "discussion",
+    "conclusion": "conclusion",
+    "conclusions": "conclusion",
+    "references": "references",
+    "bibliography": "references",
+    "acknowledgements": None,
+    "acknowledgments": None,
+}
+
+# Numbered headings such as "2 Methods" or "3.1. Study design"
+NUMBERED_HEADING_PATTERN = re.compile(r"^(\d{1,2}(?:\.\d{1,2})*)\.?\s+([A-Z][^.!?]{1,80})$")
+
+
+def parse_page_range(page_range: Optional[str], page_count: int) -> List[int]:
+    """
+    Expand a Marker-style page range into page indices.
+
+    Args:
+        page_range: Comma-separated page numbers and ranges, e.g. "0,5-10,20".
+                    If None, every page is selected.
+        page_count: Number of pages in the document.
+
+    Returns:
+        The sorted, zero-based page indices within the document.
+    """
+    if not page_range:
+        return list(range(page_count))
+
+    pages = set()
+    for part in page_range.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = part.split("-", 1)
+            pages.update(range(int(start), int(end) + 1))
+        else:
+            pages.add(int(part))
+
+    return sorted(page for page in pages if 0 <= page < page_count)
+
+
+def get_page_count(pdf_path: str) -> int:
+    """
+    Get the number of pages in a PDF.
+
+    Args:
+        pdf_path: Path to the PDF file.
+
+    Returns:
+        The number of pages.
+
+    Raises:
+        Exception: If pypdfium2 is not installed or the PDF cannot be read.
+    """
+    if pdfium is None:
+        raise Exception("pypdfium2 is required to count PDF pages")
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def _heading_level(line: str) -> Optional[int]:
+    """
+    Decide whether a line of the text layer is a heading.
+
+    Args:
+        line: The stripped line.
+
+    Returns:
+        The markdown heading level, or None if the line is body text.
+    """
+    if not line or len(line) > 90:
+        return None
+
+    if line.lower().rstrip(":") in SECTION_HEADINGS:
+        return 1
+
+    match = NUMBERED_HEADING_PATTERN.match(line)
+    if match:
+        return min(match.group(1).count(".") + 1, 3)
+
+    # Short all-caps lines, e.g. "RESULTS AND DISCUSSION"
+    letters = [c for c in line if c.isalpha()]
+    if len(letters) >= 4 and len(line) <= 60 and all(c.isupper() for c in letters):
+        return 1
+
+    return None
+
+
+def text_to_markdown(text: str) -> str:
+    """
+    Turn raw text layer output into markdown with headings.
+
+    Args:
+        text: The text layer of one or more pages.
+
+    Returns:
+        The markdown.
+    """
+    lines = []
+    for raw_line in text.splitlines():
+        line = raw_line.strip()
+        level = _heading_level(line)
+        if level is not None:
+            lines.extend(["", f"{'#' * level} {line}", ""])
+        else:
+            lines.append(line)
+
+    markdown = "\n".join(lines)
+    return re.sub(r"\n{3,}", "\n\n", markdown).strip() + "\n"
+
+
+def extract_text_layer(
+    pdf_path: str,
+    page_range: Optional[str] = None
+) -> Tuple[str, Dict[str, Any]]:
+    """
+    Extract the embedded text layer of a PDF as markdown.
+
+    Args:
+        pdf_path: Path to the PDF file.
+        page_range: Pages to extract, in Marker's page range syntax.
+
+    Returns:
+        A tuple containing the markdown and a metadata dictionary with the
+        number of pages extracted.
+
+    Raises:
+        Exception: If pypdfium2 is not installed or the PDF cannot be read.
+    """
+    if pdfium is None:
+        raise Exception("pypdfium2 is required for text layer extraction")
+
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        pages = parse_page_range(page_range, len(pdf))
+
+        page_texts = []
+        for index in pages:
+            page = pdf[index]
+            text_page = page.get_textpage()
+            try:
+                page_texts.append(text_page.get_text_range())
+            finally:
+                text_page.close()
+                page.close()
+    finally:
+        pdf.close()
+
+    markdown = text_to_markdown("\n\n".join(page_texts))
+    return markdown, {"page_count": len(pages)}
+
+
+def score_text_layer(markdown: str, page_count: int) -> Dict[str, Any]:
+    """
+    Score the quality of a text layer extraction.
+
+    The score combines the amount of text per page (scanned PDFs have little
+    or none), the share of unreadable characters (broken font encodings), and
+    the number of standard paper sections found.
+
+    Args:
+        markdown: The extracted markdown.
+        page_count: Number of pages the markdown was extracted from.
+
+    Returns:
+        A dictionary with the characters per page, the garbage character
+        ratio, the sections detected, and the overall score between 0 and 1.
+    """
+    text = "".join(markdown.split())
+    chars_per_page = len(text) / max(page_count, 1)
+
+    garbage = sum(
+        1 for c in text
+        if c == "\ufffd" or unicodedata.category(c) in ("Cc", "Co", "Cn")
+    )
+    garbage_ratio = garbage / len(text) if text else 1.0
+
+    sections = set()
+    for line in markdown.splitlines():
+        if line.startswith("#"):
+            heading = line.lstrip("#").strip().lower().rstrip(":")
+            heading = re.sub(r"^[\d.]+\s+", "", heading)
+            if SECTION_HEADINGS.get(heading):
+                sections.add(SECTION_HEADINGS[heading])
+
+    density_score = min(chars_per_page / TARGET_CHARS_PER_PAGE, 1.0)
+    garbage_score = max(1.0 - garbage_ratio / MAX_GARBAGE_RATIO, 0.0)
+    section_score = min(len(sections) / TARGET_SECTIONS, 1.0)
+
+    return {
+        "chars_per_page": round(chars_per_page, 1),
+        "garbage_ratio": round(garbage_ratio, 4),
+        "sections": sorted(sections),
+        "score": round(0.4 * density_score + 0.4 * garbage_score + 0.2 * section_score, 3)
+    }
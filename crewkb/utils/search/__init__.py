@@ -5,8 +5,19 @@ This module provides utilities for managing searches across multiple tools,
 including caching, error handling, and retry logic.
 """
 
-from crewkb.utils.search.coordinator import AsyncSearchCoordinator
+from crewkb.utils.search.coordinator import AsyncSearchCoordinator, SearchResults
 from crewkb.utils.search.cache import SearchCache
+from crewkb.utils.search.cache_store import DirectoryStore, SQLiteStore
+from crewkb.utils.search.providers import SearchProvider, ProviderRegistry
 from crewkb.utils.search.retry import RetryStrategy
 
-__all__ = ["AsyncSearchCoordinator", "SearchCache", "RetryStrategy"]
+__all__ = [
+    "AsyncSearchCoordinator",
+    "SearchResults",
+    "SearchCache",
+    "DirectoryStore",
+    "SQLiteStore",
+    "SearchProvider",
+    "ProviderRegistry",
+    "RetryStrategy"
+]
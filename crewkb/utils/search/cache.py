@@ -7,9 +7,52 @@ performance.
 
 import os
 import json
-import hashlib
+import time
+import logging
+import threading
+from collections import OrderedDict
 from pathlib import Path
-from typing import Optional, Any, Dict
+from typing import Optional, Any, Dict, List, NamedTuple, Union
+
+from crewkb.utils.search.cache_store import CacheRecord, DirectoryStore, SQLiteStore, migrate_store
+
+logger = logging.getLogger(__name__)
+
+# Namespace of entries cached without one
+DEFAULT_NAMESPACE = "default"
+
+# Default time to live of an entry, in seconds, so stale citation counts expire
+DEFAULT_TTL = 7 * 24 * 3600.0
+
+# Default limits of the in-memory tier
+DEFAULT_MAX_MEMORY_ENTRIES = 1024
+DEFAULT_MAX_MEMORY_BYTES = 64 * 1024 * 1024
+
+# Default limits of the on-disk tier
+DEFAULT_MAX_DISK_BYTES = 512 * 1024 * 1024
+DEFAULT_MAX_DISK_AGE = 30 * 24 * 3600.0
+
+# Fraction of max_disk_bytes the disk tier is trimmed to, so eviction doesn't
+# run again on the very next write
+DISK_LOW_WATER_MARK = 0.9
+
+# Persistent stores: "directory" keeps a JSON file per entry, "sqlite" keeps
+# every entry in one database, and "auto" moves from the first to the second
+# once the directory holds sqlite_threshold entries
+CACHE_BACKENDS = ("auto", "directory", "sqlite")
+
+# Default number of entries after which the "auto" backend switches to SQLite
+DEFAULT_SQLITE_THRESHOLD = 10000
+
+# Name of the SQLite database in the cache directory
+SQLITE_FILENAME = "search_cache.db"
+
+
+class _MemoryEntry(NamedTuple):
+    """An entry of the in-memory tier."""
+    value: Any
+    expires: Optional[float]
+    size: int
 
 
 class SearchCache:
@@ -17,37 +60,195 @@ class SearchCache:
     Cache for search results.
     
     This class provides a disk-based cache for search results to reduce API calls
-    and improve performance. It uses a simple key-value store with JSON files.
+    and improve performance. Entries are persisted in a store, a directory of
+    JSON files or a single SQLite database, fronted by an in-memory tier.
+    
+    This class provides:
+    - A least recently used memory tier bounded by entry count and size
+    - A time to live per entry, with defaults per namespace
+    - Eviction of the oldest and least recently used entries once the store
+      grows past its size limit
+    - A switch from the directory to SQLite once the directory holds too many
+      files, migrating the existing entries
+    - Lookup of entries by the search term they were cached for and by age
+    - Hit, miss and eviction counters
     """
     
-    def __init__(self, cache_dir: str = "cache/search"):
+    def __init__(
+        self,
+        cache_dir: str = "cache/search",
+        default_ttl: Optional[float] = DEFAULT_TTL,
+        namespace_ttls: Optional[Dict[str, Optional[float]]] = None,
+        max_memory_entries: Optional[int] = DEFAULT_MAX_MEMORY_ENTRIES,
+        max_memory_bytes: Optional[int] = DEFAULT_MAX_MEMORY_BYTES,
+        max_disk_bytes: Optional[int] = DEFAULT_MAX_DISK_BYTES,
+        max_disk_age: Optional[float] = DEFAULT_MAX_DISK_AGE,
+        backend: str = "auto",
+        sqlite_threshold: int = DEFAULT_SQLITE_THRESHOLD
+    ):
         """
         Initialize the cache.
         
         Args:
             cache_dir: The directory to store cache files.
+            default_ttl: Seconds an entry stays fresh unless its namespace or
+                         the entry itself says otherwise. None never expires.
+            namespace_ttls: Seconds entries stay fresh, by namespace.
+            max_memory_entries: Maximum number of entries kept in memory, or
+                                None for no limit.
+            max_memory_bytes: Maximum total serialized size of the entries kept
+                              in memory, or None for no limit.
+            max_disk_bytes: Maximum total size of the persisted entries, or
+                            None for no limit.
+            max_disk_age: Seconds after which persisted entries are deleted
+                          regardless of their time to live, or None for no limit.
+            backend: The persistent store ("auto", "directory" or "sqlite").
+            sqlite_threshold: Number of entries after which the "auto" backend
+                              migrates the directory to SQLite.
         """
+        if backend not in CACHE_BACKENDS:
+            raise ValueError(f"Unknown cache backend {backend}, expected one of {CACHE_BACKENDS}")
+        
         self.cache_dir = cache_dir
         self._ensure_cache_dir()
-        self._memory_cache: Dict[str, Any] = {}
+        
+        self.default_ttl = default_ttl
+        self.namespace_ttls = dict(namespace_ttls or {})
+        self.max_memory_entries = max_memory_entries
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.max_disk_age = max_disk_age
+        self.backend = backend
+        self.sqlite_threshold = sqlite_threshold
+        
+        self._lock = threading.Lock()
+        self._memory_cache: "OrderedDict[str, _MemoryEntry]" = OrderedDict()
+        self._memory_bytes = 0
+        
+        self.stats: Dict[str, int] = {
+            "hits": 0,
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "expirations": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+        
+        self.store: Union[DirectoryStore, SQLiteStore] = self._open_store()
+        
+        # Start within the disk limits
+        self.evict()
     
     def _ensure_cache_dir(self) -> None:
         """Ensure the cache directory exists."""
         Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
     
-    def _get_cache_path(self, key: str) -> str:
+    def _get_sqlite_path(self) -> str:
+        """
+        Get the path to the SQLite database.
+        
+        Returns:
+            The path to the database.
+        """
+        return os.path.join(self.cache_dir, SQLITE_FILENAME)
+    
+    def _open_store(self) -> Union[DirectoryStore, SQLiteStore]:
+        """
+        Open the persistent store, migrating the directory to SQLite if needed.
+        
+        Returns:
+            The store.
+        """
+        directory = DirectoryStore(self.cache_dir, legacy_ttl=self.get_ttl())
+        
+        use_sqlite = self.backend == "sqlite" or (
+            self.backend == "auto" and (
+                os.path.exists(self._get_sqlite_path())
+                or directory.count() >= self.sqlite_threshold
+            )
+        )
+        if not use_sqlite:
+            return directory
+        
+        store = SQLiteStore(self._get_sqlite_path())
+        
+        # Pick up files written before the switch, or by older versions
+        if directory.count():
+            migrate_store(directory, store)
+        
+        return store
+    
+    def migrate(self) -> int:
+        """
+        Move the cache from the directory of JSON files to SQLite.
+        
+        Returns:
+            The number of entries migrated.
+        """
+        if isinstance(self.store, SQLiteStore):
+            return 0
+        
+        directory = self.store
+        store = SQLiteStore(self._get_sqlite_path())
+        migrated = migrate_store(directory, store)
+        self.store = store
+        
+        return migrated
+    
+    def get_ttl(self, namespace: str = DEFAULT_NAMESPACE) -> Optional[float]:
         """
-        Get the path to the cache file for a key.
+        Get the default time to live of entries in a namespace.
         
         Args:
-            key: The cache key.
-            
+            namespace: The namespace.
+        
         Returns:
-            The path to the cache file.
+            The time to live in seconds, or None if entries never expire.
         """
-        # Create a hash of the key to use as the filename
-        key_hash = hashlib.md5(key.encode()).hexdigest()
-        return os.path.join(self.cache_dir, f"{key_hash}.json")
+        return self.namespace_ttls.get(namespace, self.default_ttl)
+    
+    def _remember(self, key: str, value: Any, expires: Optional[float], size: int) -> None:
+        """
+        Put an entry in the memory tier, evicting least recently used entries.
+        
+        Must be called with the lock held.
+        
+        Args:
+            key: The cache key.
+            value: The value.
+            expires: The expiry time, or None if the entry never expires.
+            size: The serialized size of the value.
+        """
+        self._forget(key)
+        
+        # Entries too large for the memory tier are only kept on disk
+        if self.max_memory_bytes is not None and size > self.max_memory_bytes:
+            return
+        
+        self._memory_cache[key] = _MemoryEntry(value, expires, size)
+        self._memory_bytes += size
+        
+        while self._memory_cache and (
+            (self.max_memory_entries is not None and len(self._memory_cache) > self.max_memory_entries)
+            or (self.max_memory_bytes is not None and self._memory_bytes > self.max_memory_bytes)
+        ):
+            _, evicted = self._memory_cache.popitem(last=False)
+            self._memory_bytes -= evicted.size
+            self.stats["memory_evictions"] += 1
+    
+    def _forget(self, key: str) -> None:
+        """
+        Remove an entry from the memory tier.
+        
+        Must be called with the lock held.
+        
+        Args:
+            key: The cache key.
+        """
+        entry = self._memory_cache.pop(key, None)
+        if entry is not None:
+            self._memory_bytes -= entry.size
     
     def get(self, key: str) -> Optional[Any]:
         """
@@ -55,49 +256,176 @@ class SearchCache:
         
         Args:
             key: The cache key.
-            
+        
         Returns:
-            The cached result, or None if not found.
+            The cached result, or None if not found or expired.
         """
+        now = time.time()
+        
         # Check memory cache first
-        if key in self._memory_cache:
-            return self._memory_cache[key]
-        
-        # Check disk cache
-        cache_path = self._get_cache_path(key)
-        if os.path.exists(cache_path):
-            try:
-                with open(cache_path, "r") as f:
-                    result = json.load(f)
-                
-                # Store in memory cache for faster access next time
-                self._memory_cache[key] = result
-                return result
-            except (json.JSONDecodeError, IOError):
-                # If there's an error reading the cache, return None
-                return None
-        
-        return None
-    
-    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            entry = self._memory_cache.get(key)
+            if entry is not None:
+                if entry.expires is None or now < entry.expires:
+                    self._memory_cache.move_to_end(key)
+                    self.stats["hits"] += 1
+                    self.stats["memory_hits"] += 1
+                    return entry.value
+                self._forget(key)
+        
+        # Check the persistent store
+        record = self.store.get(key)
+        if record is None:
+            with self._lock:
+                self.stats["misses"] += 1
+            return None
+        
+        if record.expires is not None and now >= record.expires:
+            self.store.delete(key)
+            with self._lock:
+                self.stats["expirations"] += 1
+                self.stats["misses"] += 1
+            return None
+        
+        # Record the access, which orders eviction of the store
+        self.store.touch(key, now)
+        
+        # Store in memory cache for faster access next time
+        with self._lock:
+            self._remember(key, record.value, record.expires, record.size)
+            self.stats["hits"] += 1
+            self.stats["disk_hits"] += 1
+        
+        return record.value
+    
+    def set(
+        self,
+        key: str,
+        value: Any,
+        namespace: str = DEFAULT_NAMESPACE,
+        ttl: Optional[float] = None,
+        term: Optional[str] = None,
+        params: Optional[Dict[str, Any]] = None
+    ) -> None:
         """
         Set a cached result.
         
         Args:
             key: The cache key.
             value: The value to cache.
+            namespace: The namespace of the entry, which sets its default TTL.
+            ttl: Seconds the entry stays fresh. If None, the namespace's default
+                 is used.
+            term: The search term the result is for, used to find the entry.
+            params: The other search parameters the result is for.
         """
+        now = time.time()
+        ttl = ttl if ttl is not None else self.get_ttl(namespace)
+        expires = now + ttl if ttl is not None else None
+        size = len(json.dumps(value))
+        
         # Store in memory cache
-        self._memory_cache[key] = value
+        with self._lock:
+            self._remember(key, value, expires, size)
         
-        # Store on disk
-        cache_path = self._get_cache_path(key)
+        # Store persistently
         try:
-            with open(cache_path, "w") as f:
-                json.dump(value, f)
-        except IOError:
+            self.store.put(CacheRecord(key, value, namespace, now, expires, size, term, params))
+        except Exception as e:
             # If there's an error writing to the cache, just log it and continue
-            print(f"Error writing to cache: {cache_path}")
+            logger.error(f"Error writing to cache: {str(e)}")
+            return
+        
+        if (
+            self.backend == "auto"
+            and isinstance(self.store, DirectoryStore)
+            and self.store.count() >= self.sqlite_threshold
+        ):
+            self.migrate()
+        
+        if self.max_disk_bytes is not None and self.store.total_bytes() > self.max_disk_bytes:
+            self.evict()
+    
+    def get_record(self, key: str) -> Optional[CacheRecord]:
+        """
+        Get a persisted entry with its metadata, without counting a hit or miss.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The record, or None if there is none.
+        """
+        return self.store.get(key)
+    
+    def replace(self, key: str, value: Any) -> bool:
+        """
+        Replace the value of an entry, keeping its metadata and expiry time.
+        
+        Args:
+            key: The cache key.
+            value: The new value.
+        
+        Returns:
+            True if the entry was replaced, False if there is no such entry.
+        """
+        record = self.store.get(key)
+        if record is None:
+            return False
+        
+        size = len(json.dumps(value))
+        self.store.put(record._replace(value=value, size=size))
+        
+        with self._lock:
+            self._remember(key, value, record.expires, size)
+        
+        return True
+    
+    def find(self, term: Optional[str] = None, older_than: Optional[float] = None) -> List[str]:
+        """
+        Find the keys of entries by search term and age.
+        
+        Entries cached without a term are only found when no term is given.
+        
+        Args:
+            term: Only return entries cached for this search term.
+            older_than: Only return entries created more than this many seconds ago.
+        
+        Returns:
+            The keys of the matching entries.
+        """
+        created_before = time.time() - older_than if older_than is not None else None
+        return self.store.find_keys(term=term, created_before=created_before)
+    
+    def evict(self, now: Optional[float] = None) -> int:
+        """
+        Apply the disk limits.
+        
+        Expired entries and entries older than max_disk_age are deleted first.
+        If the store is still larger than max_disk_bytes, the least recently
+        used entries are deleted until it is comfortably below the limit. This
+        runs on startup and when the size limit is hit rather than on every write.
+        
+        Args:
+            now: The current time. If None, the system time is used.
+        
+        Returns:
+            The number of entries deleted.
+        """
+        now = now if now is not None else time.time()
+        
+        target_bytes = None
+        if self.max_disk_bytes is not None:
+            target_bytes = self.max_disk_bytes * DISK_LOW_WATER_MARK
+        
+        evicted = self.store.evict(now, self.max_disk_age, self.max_disk_bytes, target_bytes)
+        
+        if evicted:
+            with self._lock:
+                self.stats["disk_evictions"] += evicted
+            logger.info(f"Evicted {evicted} entries from search cache {self.cache_dir}")
+        
+        return evicted
     
     def clear(self, key: Optional[str] = None) -> None:
         """
@@ -108,25 +436,17 @@ class SearchCache:
         """
         if key is not None:
             # Clear specific key
-            if key in self._memory_cache:
-                del self._memory_cache[key]
+            with self._lock:
+                self._forget(key)
             
-            cache_path = self._get_cache_path(key)
-            if os.path.exists(cache_path):
-                try:
-                    os.remove(cache_path)
-                except IOError:
-                    print(f"Error removing cache file: {cache_path}")
+            self.store.delete(key)
         else:
             # Clear all
-            self._memory_cache = {}
+            with self._lock:
+                self._memory_cache = OrderedDict()
+                self._memory_bytes = 0
             
-            try:
-                for file in os.listdir(self.cache_dir):
-                    if file.endswith(".json"):
-                        os.remove(os.path.join(self.cache_dir, file))
-            except IOError:
-                print(f"Error clearing cache directory: {self.cache_dir}")
+            self.store.clear()
     
     def get_size(self) -> int:
         """
@@ -135,7 +455,26 @@ class SearchCache:
         Returns:
             The number of items in the cache.
         """
-        try:
-            return len([f for f in os.listdir(self.cache_dir) if f.endswith(".json")])
-        except IOError:
-            return 0
+        return self.store.count()
+    
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Get the cache counters.
+        
+        Returns:
+            A dictionary with the hit, miss, expiration and eviction counts,
+            and the current number of entries and bytes in memory and on disk.
+        """
+        with self._lock:
+            stats = dict(self.stats)
+            stats["memory_entries"] = len(self._memory_cache)
+            stats["memory_bytes"] = self._memory_bytes
+        stats["disk_bytes"] = self.store.total_bytes()
+        
+        return stats
+    
+    def close(self) -> None:
+        """
+        Close the persistent store.
+        """
+        self.store.close()
@@ -0,0 +1,786 @@
+"""
+Search cache stores for CrewKB.
+
+This module provides the persistent stores behind the SearchCache: a directory
+of JSON files, and a single SQLite file for caches too large for a directory.
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Optional, Any, Dict, Set, Tuple, Iterable, Iterator, List, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+# Marks cache files that wrap their value with metadata
+ENTRY_FORMAT = "search-cache/1"
+
+# Number of entries written per transaction when migrating between stores
+MIGRATION_BATCH_SIZE = 1000
+
+
+class CacheRecord(NamedTuple):
+    """A cached value with its metadata."""
+    key: str
+    value: Any
+    namespace: str
+    created: float
+    expires: Optional[float]
+    size: int
+    term: Optional[str] = None
+    params: Optional[Dict[str, Any]] = None
+
+
+class DirectoryStore:
+    """
+    Store that keeps each entry in its own JSON file.
+    
+    Files are named after the hash of their key and written atomically. The
+    modification time of a file records when it was last accessed. The first
+    lookup by term or age reads every file to build an index, which is kept
+    current from then on.
+    """
+    
+    def __init__(self, cache_dir: str, legacy_ttl: Optional[float] = None):
+        """
+        Initialize the DirectoryStore.
+        
+        Args:
+            cache_dir: The directory to store cache files.
+            legacy_ttl: Time to live of files written before entries carried
+                        metadata, counted from their modification time.
+        """
+        self.cache_dir = cache_dir
+        Path(self.cache_dir).mkdir(parents=True, exist_ok=True)
+        self.legacy_ttl = legacy_ttl
+        
+        self._lock = threading.Lock()
+        self._count = 0
+        self._bytes = 0
+        self._scan()
+        
+        # Key, term and creation time by file path, and file paths by term
+        self._index: Optional[Dict[str, Tuple[str, Optional[str], float]]] = None
+        self._terms: Dict[str, Set[str]] = {}
+    
+    def _scan(self) -> List[os.DirEntry]:
+        """
+        List the cache files, refreshing the tracked count and size.
+        
+        Returns:
+            The cache files.
+        """
+        try:
+            files = [
+                entry for entry in os.scandir(self.cache_dir)
+                if entry.is_file() and entry.name.endswith(".json")
+            ]
+        except OSError:
+            logger.error(f"Error scanning cache directory: {self.cache_dir}")
+            return []
+        
+        with self._lock:
+            self._count = len(files)
+            self._bytes = sum(entry.stat().st_size for entry in files)
+        
+        return files
+    
+    def _get_path(self, key: str) -> str:
+        """
+        Get the path to the cache file for a key.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The path to the cache file.
+        """
+        # Create a hash of the key to use as the filename
+        key_hash = hashlib.md5(key.encode()).hexdigest()
+        return os.path.join(self.cache_dir, f"{key_hash}.json")
+    
+    def _read(self, path: str, key: Optional[str] = None) -> CacheRecord:
+        """
+        Read a cache file.
+        
+        Files written before entries carried metadata hold the bare value; they
+        date from their modification time and use the legacy TTL.
+        
+        Args:
+            path: The path to the cache file.
+            key: The key of the file, if known.
+        
+        Returns:
+            The record. Its key is empty if the file holds a bare value and no
+            key was given.
+        """
+        with open(path, "r") as f:
+            data = f.read()
+        entry = json.loads(data)
+        
+        if isinstance(entry, dict) and entry.get("format") == ENTRY_FORMAT:
+            return CacheRecord(
+                entry["key"],
+                entry["value"],
+                entry["namespace"],
+                entry["created"],
+                entry.get("expires"),
+                len(data),
+                entry.get("term"),
+                entry.get("params")
+            )
+        
+        created = os.path.getmtime(path)
+        expires = created + self.legacy_ttl if self.legacy_ttl is not None else None
+        return CacheRecord(key or "", entry, "default", created, expires, len(data))
+    
+    def get(self, key: str) -> Optional[CacheRecord]:
+        """
+        Get the record for a key.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The record, or None if there is none or it can't be read.
+        """
+        path = self._get_path(key)
+        if not os.path.exists(path):
+            return None
+        
+        try:
+            return self._read(path, key)
+        except (json.JSONDecodeError, KeyError, IOError):
+            return None
+    
+    def put(self, record: CacheRecord) -> None:
+        """
+        Store a record.
+        
+        Args:
+            record: The record. Its size is ignored in favour of the file size.
+        """
+        path = self._get_path(record.key)
+        data = json.dumps({
+            "format": ENTRY_FORMAT,
+            "key": record.key,
+            "namespace": record.namespace,
+            "created": record.created,
+            "expires": record.expires,
+            "term": record.term,
+            "params": record.params,
+            "value": record.value
+        })
+        
+        # Write atomically so readers never see a partial file
+        temp_path = f"{path}.{uuid.uuid4().hex}.part"
+        try:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else None
+            with open(temp_path, "w") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except (IOError, OSError):
+            logger.error(f"Error writing to cache: {path}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        
+        with self._lock:
+            self._count += previous_size is None
+            self._bytes += len(data) - (previous_size or 0)
+            if self._index is not None:
+                self._unindex(path)
+                self._add_to_index(path, record)
+    
+    def touch(self, key: str, now: float) -> None:
+        """
+        Record an access to a key.
+        
+        Args:
+            key: The cache key.
+            now: The time of the access.
+        """
+        try:
+            os.utime(self._get_path(key), (now, now))
+        except OSError:
+            pass
+    
+    def _remove(self, path: str) -> bool:
+        """
+        Delete a cache file, keeping the tracked count and size current.
+        
+        Args:
+            path: The path to the cache file.
+        
+        Returns:
+            True if the file was deleted, False otherwise.
+        """
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return False
+        
+        with self._lock:
+            self._count = max(self._count - 1, 0)
+            self._bytes = max(self._bytes - size, 0)
+            if self._index is not None:
+                self._unindex(path)
+        
+        return True
+    
+    def _add_to_index(self, path: str, record: CacheRecord) -> None:
+        """
+        Add a file to the index.
+        
+        Must be called with the lock held.
+        
+        Args:
+            path: The path to the cache file.
+            record: The record in the file.
+        """
+        self._index[path] = (record.key, record.term, record.created)
+        if record.term is not None:
+            self._terms.setdefault(record.term, set()).add(path)
+    
+    def _unindex(self, path: str) -> None:
+        """
+        Remove a file from the index.
+        
+        Must be called with the lock held.
+        
+        Args:
+            path: The path to the cache file.
+        """
+        entry = self._index.pop(path, None)
+        if entry is not None and entry[1] is not None:
+            paths = self._terms.get(entry[1])
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self._terms[entry[1]]
+    
+    def _build_index(self) -> None:
+        """
+        Read every cache file into the index, unless the index is built.
+        """
+        if self._index is not None:
+            return
+        
+        index = {}
+        for entry in self._scan():
+            try:
+                record = self._read(entry.path)
+            except (json.JSONDecodeError, KeyError, IOError):
+                continue
+            if record.key:
+                index[entry.path] = record
+        
+        with self._lock:
+            self._index = {}
+            self._terms = {}
+            for path, record in index.items():
+                self._add_to_index(path, record)
+    
+    def find_keys(
+        self,
+        term: Optional[str] = None,
+        created_before: Optional[float] = None
+    ) -> List[str]:
+        """
+        Find the keys of records by search term and age.
+        
+        Args:
+            term: Only return records cached for this search term.
+            created_before: Only return records created before this time.
+        
+        Returns:
+            The keys of the matching records.
+        """
+        self._build_index()
+        
+        with self._lock:
+            paths = self._terms.get(term, set()) if term is not None else self._index.keys()
+            return [
+                self._index[path][0] for path in paths
+                if created_before is None or self._index[path][2] < created_before
+            ]
+    
+    def delete(self, key: str) -> bool:
+        """
+        Delete the record for a key.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            True if a record was deleted, False otherwise.
+        """
+        return self._remove(self._get_path(key))
+    
+    def clear(self) -> None:
+        """
+        Delete every record.
+        """
+        try:
+            for file in os.listdir(self.cache_dir):
+                if file.endswith(".json"):
+                    os.remove(os.path.join(self.cache_dir, file))
+        except IOError:
+            logger.error(f"Error clearing cache directory: {self.cache_dir}")
+        
+        self._scan()
+        with self._lock:
+            self._index = {}
+            self._terms = {}
+    
+    def count(self) -> int:
+        """
+        Get the number of records.
+        
+        Returns:
+            The number of records.
+        """
+        with self._lock:
+            return self._count
+    
+    def total_bytes(self) -> int:
+        """
+        Get the total size of the records.
+        
+        Returns:
+            The size in bytes.
+        """
+        with self._lock:
+            return self._bytes
+    
+    def records(self) -> Iterator[CacheRecord]:
+        """
+        Iterate over the records whose key is known.
+        
+        Files holding a bare value don't record their key, so they are skipped.
+        
+        Yields:
+            The records.
+        """
+        for entry in self._scan():
+            try:
+                record = self._read(entry.path)
+            except (json.JSONDecodeError, KeyError, IOError):
+                continue
+            if record.key:
+                yield record
+    
+    def evict(
+        self,
+        now: float,
+        max_age: Optional[float],
+        max_bytes: Optional[int],
+        target_bytes: Optional[float]
+    ) -> int:
+        """
+        Delete expired, old and least recently used records.
+        
+        Every file is read, so this is meant for startup and for when the size
+        limit is hit rather than for every write.
+        
+        Args:
+            now: The current time.
+            max_age: Seconds after which records are deleted regardless of
+                     their expiry time, or None for no limit.
+            max_bytes: Size above which least recently used records are
+                       deleted, or None for no limit.
+            target_bytes: Size to trim the store to once max_bytes is exceeded.
+        
+        Returns:
+            The number of records deleted.
+        """
+        evicted = 0
+        
+        # Expired, too old and unreadable files go first
+        kept = []
+        for entry in self._scan():
+            try:
+                record = self._read(entry.path)
+                stale = (record.expires is not None and now >= record.expires) or (
+                    max_age is not None and now - record.created >= max_age
+                )
+            except (json.JSONDecodeError, KeyError, IOError, OSError):
+                stale = True
+            
+            if stale:
+                evicted += self._remove(entry.path)
+            else:
+                kept.append(entry)
+        
+        # Then the least recently used files, until under the target size
+        if max_bytes is not None and self.total_bytes() > max_bytes:
+            target = target_bytes if target_bytes is not None else max_bytes
+            for entry in sorted(kept, key=lambda entry: entry.stat().st_mtime):
+                if self.total_bytes() <= target:
+                    break
+                evicted += self._remove(entry.path)
+        
+        return evicted
+    
+    def close(self) -> None:
+        """
+        Release the store's resources.
+        """
+
+
+class SQLiteStore:
+    """
+    Store that keeps every entry in a single SQLite database.
+    
+    The database runs in write-ahead logging mode, so readers don't block the
+    writer and a crash never leaves a partially written entry behind.
+    """
+    
+    def __init__(self, path: str):
+        """
+        Initialize the SQLiteStore.
+        
+        Args:
+            path: Path of the database file.
+        """
+        self.path = path
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                namespace TEXT NOT NULL,
+                created REAL NOT NULL,
+                last_access REAL NOT NULL,
+                expires REAL,
+                size INTEGER NOT NULL,
+                term TEXT,
+                params TEXT
+            )
+            """
+        )
+        
+        # Databases created before entries recorded their search term
+        columns = {row[1] for row in self._connection.execute("PRAGMA table_info(entries)")}
+        for column in ("term", "params"):
+            if column not in columns:
+                self._connection.execute(f"ALTER TABLE entries ADD COLUMN {column} TEXT")
+        
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_access ON entries (last_access)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_namespace ON entries (namespace)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_term ON entries (term)"
+        )
+        self._connection.execute(
+            "CREATE INDEX IF NOT EXISTS entries_created ON entries (created)"
+        )
+        
+        self._bytes = self._query_bytes()
+    
+    def _query_bytes(self) -> int:
+        """
+        Query the total size of the records.
+        
+        Returns:
+            The size in bytes.
+        """
+        with self._lock:
+            row = self._connection.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()
+        return row[0]
+    
+    def get(self, key: str) -> Optional[CacheRecord]:
+        """
+        Get the record for a key.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            The record, or None if there is none or it can't be read.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, namespace, created, expires, size, term, params "
+                "FROM entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        
+        if row is None:
+            return None
+        
+        try:
+            value = json.loads(row[0])
+            params = json.loads(row[6]) if row[6] is not None else None
+        except json.JSONDecodeError:
+            return None
+        
+        return CacheRecord(key, value, row[1], row[2], row[3], row[4], row[5], params)
+    
+    def put(self, record: CacheRecord) -> None:
+        """
+        Store a record.
+        
+        Args:
+            record: The record. Its size is ignored in favour of the stored size.
+        """
+        self.put_many([record])
+    
+    def put_many(self, records: Iterable[CacheRecord], replace: bool = True) -> int:
+        """
+        Store records in a single transaction.
+        
+        Args:
+            records: The records.
+            replace: Whether records replace existing records with the same
+                     key. If False, existing records are kept.
+        
+        Returns:
+            The number of records written.
+        """
+        rows = []
+        for record in records:
+            value = json.dumps(record.value)
+            params = json.dumps(record.params) if record.params is not None else None
+            rows.append((
+                record.key, value, record.namespace, record.created,
+                time.time(), record.expires, len(value), record.term, params
+            ))
+        
+        if not rows:
+            return 0
+        
+        written = 0
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for row in rows:
+                    previous = self._connection.execute(
+                        "SELECT size FROM entries WHERE key = ?", (row[0],)
+                    ).fetchone()
+                    if previous is not None and not replace:
+                        continue
+                    
+                    self._connection.execute(
+                        "INSERT OR REPLACE INTO entries "
+                        "(key, value, namespace, created, last_access, expires, size, term, params) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        row
+                    )
+                    self._bytes += row[6] - (previous[0] if previous is not None else 0)
+                    written += 1
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                # The rolled back writes were already counted
+                self._bytes = self._connection.execute(
+                    "SELECT COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()[0]
+                raise
+        
+        return written
+    
+    def touch(self, key: str, now: float) -> None:
+        """
+        Record an access to a key.
+        
+        Args:
+            key: The cache key.
+            now: The time of the access.
+        """
+        with self._lock:
+            self._connection.execute("UPDATE entries SET last_access = ? WHERE key = ?", (now, key))
+    
+    def delete(self, key: str) -> bool:
+        """
+        Delete the record for a key.
+        
+        Args:
+            key: The cache key.
+        
+        Returns:
+            True if a record was deleted, False otherwise.
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT size FROM entries WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return False
+            
+            self._connection.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._bytes = max(self._bytes - row[0], 0)
+        
+        return True
+    
+    def clear(self) -> None:
+        """
+        Delete every record.
+        """
+        with self._lock:
+            self._connection.execute("DELETE FROM entries")
+            self._bytes = 0
+    
+    def count(self) -> int:
+        """
+        Get the number of records.
+        
+        Returns:
+            The number of records.
+        """
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+    
+    def find_keys(
+        self,
+        term: Optional[str] = None,
+        created_before: Optional[float] = None
+    ) -> List[str]:
+        """
+        Find the keys of records by search term and age.
+        
+        Args:
+            term: Only return records cached for this search term.
+            created_before: Only return records created before this time.
+        
+        Returns:
+            The keys of the matching records.
+        """
+        conditions = []
+        arguments: List[Any] = []
+        if term is not None:
+            conditions.append("term = ?")
+            arguments.append(term)
+        if created_before is not None:
+            conditions.append("created < ?")
+            arguments.append(created_before)
+        
+        query = "SELECT key FROM entries"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        
+        with self._lock:
+            return [row[0] for row in self._connection.execute(query, arguments)]
+    
+    def total_bytes(self) -> int:
+        """
+        Get the total size of the records.
+        
+        Returns:
+            The size in bytes.
+        """
+        return self._bytes
+    
+    def evict(
+        self,
+        now: float,
+        max_age: Optional[float],
+        max_bytes: Optional[int],
+        target_bytes: Optional[float]
+    ) -> int:
+        """
+        Delete expired, old and least recently used records.
+        
+        Args:
+            now: The current time.
+            max_age: Seconds after which records are deleted regardless of
+                     their expiry time, or None for no limit.
+            max_bytes: Size above which least recently used records are
+                       deleted, or None for no limit.
+            target_bytes: Size to trim the store to once max_bytes is exceeded.
+        
+        Returns:
+            The number of records deleted.
+        """
+        oldest = now - max_age if max_age is not None else float("-inf")
+        
+        with self._lock:
+            evicted = self._connection.execute(
+                "DELETE FROM entries WHERE expires <= ? OR created <= ?", (now, oldest)
+            ).rowcount
+        self._bytes = self._query_bytes()
+        
+        # Then the least recently used records, until under the target size
+        if max_bytes is not None and self._bytes > max_bytes:
+            excess = self._bytes - (target_bytes if target_bytes is not None else max_bytes)
+            
+            keys = []
+            with self._lock:
+                cursor = self._connection.execute(
+                    "SELECT key, size FROM entries ORDER BY last_access"
+                )
+                for key, size in cursor:
+                    if excess <= 0:
+                        break
+                    keys.append((key,))
+                    excess -= size
+                cursor.close()
+                
+                self._connection.execute("BEGIN IMMEDIATE")
+                try:
+                    self._connection.executemany("DELETE FROM entries WHERE key = ?", keys)
+                    self._connection.execute("COMMIT")
+                except Exception:
+                    self._connection.execute("ROLLBACK")
+                    raise
+            
+            evicted += len(keys)
+            self._bytes = self._query_bytes()
+        
+        return evicted
+    
+    def close(self) -> None:
+        """
+        Close the database connection.
+        """
+        with self._lock:
+            self._connection.close()
+
+
+def migrate_store(source: DirectoryStore, destination: SQLiteStore) -> int:
+    """
+    Move the records of a directory store into a SQLite store.
+    
+    Records are copied in batches, one transaction each, and the directory is
+    only cleared once every batch is committed, so an interrupted migration
+    can simply be run again. Records already in the database are newer than
+    the files, so they are kept. Files holding a bare value don't record their
+    key and are dropped.
+    
+    Args:
+        source: The directory store.
+        destination: The SQLite store.
+    
+    Returns:
+        The number of records migrated.
+    """
+    migrated = 0
+    batch: List[CacheRecord] = []
+    
+    for record in source.records():
+        batch.append(record)
+        if len(batch) >= MIGRATION_BATCH_SIZE:
+            migrated += destination.put_many(batch, replace=False)
+            batch = []
+    migrated += destination.put_many(batch, replace=False)
+    
+    source.clear()
+    logger.info(f"Migrated {migrated} search cache entries from {source.cache_dir} to {destination.path}")
+    
+    return migrated
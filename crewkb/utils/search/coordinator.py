@@ -5,19 +5,80 @@ This module provides a coordinator for managing searches across multiple tools
 with caching and error handling.
 """
 
+import os
 import asyncio
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from collections import deque
+from typing import (
+    Dict, List, Optional, Any, Tuple, Set, Deque, AsyncIterator,
+    NamedTuple, TYPE_CHECKING
+)
 
 from crewkb.models.knowledge.paper import PaperSource
 from crewkb.tools.search.direct_google_scholar_tool import DirectGoogleScholarTool
 from crewkb.tools.search.semantic_scholar_tool import SemanticScholarTool
+from crewkb.tools.search.pubmed_search_tool import PubMedSearchTool
+from crewkb.tools.search.serper_google_scholar_tool import SerperGoogleScholarTool
 from crewkb.utils.search.cache import SearchCache
+from crewkb.utils.search.providers import SearchProvider, ProviderRegistry
 from crewkb.utils.search.retry import RetryStrategy
 
+# The PDF package imports the retry strategy from this package
+if TYPE_CHECKING:
+    from crewkb.utils.pdf import PDFProcessor
+
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# The PDFProcessorTool's cache, so prefetched PDFs are cache hits for the tool
+DEFAULT_PDF_CACHE_DIR = "cache/pdf_processor"
+
+# Default maximum number of seconds a provider's search may take
+DEFAULT_PROVIDER_TIMEOUT = 120.0
+
+# Default prefetch budgets for the lifetime of a coordinator
+DEFAULT_PREFETCH_MAX_DOWNLOADS = 20
+DEFAULT_PREFETCH_MAX_BYTES = 200 * 1024 * 1024
+
+
+class SearchResults(dict):
+    """
+    Search results by source, with the provenance of each source's results.
+    
+    The provenance of a source is "cached", "ok", "failed" or "timeout"; a
+    source that timed out has no results.
+    """
+    
+    def __init__(
+        self,
+        results: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        provenance: Optional[Dict[str, str]] = None
+    ):
+        """
+        Initialize the SearchResults.
+        
+        Args:
+            results: The results by source.
+            provenance: The provenance by source.
+        """
+        super().__init__(results or {})
+        self.provenance: Dict[str, str] = dict(provenance or {})
+    
+    @property
+    def timed_out(self) -> List[str]:
+        """The sources that did not finish in time."""
+        return [source for source, status in self.provenance.items() if status == "timeout"]
+
+
+class _SearchFlight(NamedTuple):
+    """A search in progress, shared by concurrent identical searches."""
+    
+    # The results and provenance of each source, resolved as each provider finishes
+    sources: Dict[str, asyncio.Future]
+    
+    # Resolved once every provider has finished and the results are cached
+    finished: asyncio.Future
+
 
 class AsyncSearchCoordinator:
     """
@@ -26,13 +87,33 @@ class AsyncSearchCoordinator:
     This class coordinates searches across multiple tools with caching and
     error handling. It provides a unified interface for searching across
     different sources and combines the results.
+    
+    The sources are the enabled providers of a ProviderRegistry. By default,
+    Google Scholar and Semantic Scholar are enabled, and PubMed and Serper's
+    Google Scholar endpoint are enabled when their credentials are set. With a
+    deadline, a search returns the results that have arrived when it expires
+    and reports the providers that timed out in its provenance.
+    
+    With prefetching enabled, the PDFs of the papers found are downloaded (and
+    optionally triaged) in the background while the crew carries on, so later
+    PDFProcessorTool calls are cache hits. Prefetches run one after another on
+    a single task, so each starts with what the earlier ones left of the
+    budgets. The task belongs to the running event loop; await
+    wait_for_prefetch() before a short-lived loop ends.
     """
     
     def __init__(
         self,
         cache_dir: str = "cache/search",
         max_retries: int = 3,
-        backoff_factor: float = 1.5
+        backoff_factor: float = 1.5,
+        prefetch: bool = False,
+        prefetch_triage: bool = False,
+        prefetch_max_downloads: Optional[int] = DEFAULT_PREFETCH_MAX_DOWNLOADS,
+        prefetch_max_bytes: Optional[int] = DEFAULT_PREFETCH_MAX_BYTES,
+        pdf_processor: Optional["PDFProcessor"] = None,
+        providers: Optional[ProviderRegistry] = None,
+        deadline: Optional[float] = None
     ):
         """
         Initialize the search coordinator.
@@ -41,6 +122,20 @@ class AsyncSearchCoordinator:
             cache_dir: The directory to store cache files.
             max_retries: The maximum number of retries for failed API calls.
             backoff_factor: The factor to multiply the delay by after each retry.
+            prefetch: Whether search_and_create_papers prefetches the PDFs of
+                      the papers it returns by default.
+            prefetch_triage: Whether prefetched PDFs are also parsed in triage mode.
+            prefetch_max_downloads: Maximum number of PDFs prefetched over the
+                                    coordinator's lifetime, or None for no limit.
+            prefetch_max_bytes: Maximum total size in bytes of the PDFs prefetched
+                                over the coordinator's lifetime, or None for no limit.
+            pdf_processor: The PDFProcessor used for prefetching. If None, one
+                           sharing the PDFProcessorTool's cache is created on
+                           the first prefetch.
+            providers: The providers to search. If None, the default providers
+                       are registered.
+            deadline: Default maximum number of seconds a search waits for
+                      its providers, or None for no limit.
         """
         self.cache = SearchCache(cache_dir)
         self.retry_strategy = RetryStrategy(
@@ -51,6 +146,64 @@ class AsyncSearchCoordinator:
         # Initialize search tools
         self.google_scholar_tool = DirectGoogleScholarTool()
         self.semantic_scholar_tool = SemanticScholarTool()
+        self.pubmed_tool = PubMedSearchTool()
+        self.serper_scholar_tool = SerperGoogleScholarTool()
+        
+        # Search providers
+        self.providers = providers if providers is not None else self._create_default_providers()
+        self.deadline = deadline
+        
+        # Prefetching
+        self.prefetch = prefetch
+        self.prefetch_triage = prefetch_triage
+        self.prefetch_max_downloads = prefetch_max_downloads
+        self.prefetch_max_bytes = prefetch_max_bytes
+        self.pdf_processor = pdf_processor
+        self.prefetch_tasks: Set[asyncio.Task] = set()
+        self.prefetch_stats = {"downloads": 0, "bytes": 0, "triaged": 0}
+        self._prefetched_ids: Set[str] = set()
+        self._prefetch_queue: Deque[List[PaperSource]] = deque()
+        self._prefetch_worker: Optional[asyncio.Task] = None
+        
+        # Searches in progress, shared by concurrent identical searches
+        self._in_flight: Dict[Tuple[str, bool, Tuple[str, ...]], _SearchFlight] = {}
+    
+    def _create_default_providers(self) -> ProviderRegistry:
+        """
+        Create the registry of the default providers.
+        
+        Returns:
+            The registry.
+        """
+        return ProviderRegistry([
+            SearchProvider(
+                "google_scholar",
+                lambda term, max_results, min_citation_count, year_range:
+                    self._search_google_scholar(term, max_results),
+                create_paper=PaperSource.from_google_scholar,
+                timeout=DEFAULT_PROVIDER_TIMEOUT
+            ),
+            SearchProvider(
+                "semantic_scholar",
+                self._search_semantic_scholar,
+                create_paper=PaperSource.from_semantic_scholar,
+                timeout=DEFAULT_PROVIDER_TIMEOUT
+            ),
+            SearchProvider(
+                "pubmed",
+                lambda term, max_results, min_citation_count, year_range:
+                    self._search_pubmed(term, max_results),
+                timeout=DEFAULT_PROVIDER_TIMEOUT,
+                enabled=bool(os.getenv("ENTREZ_EMAIL"))
+            ),
+            SearchProvider(
+                "serper_google_scholar",
+                lambda term, max_results, min_citation_count, year_range:
+                    self._search_serper_google_scholar(term, max_results),
+                timeout=DEFAULT_PROVIDER_TIMEOUT,
+                enabled=bool(os.getenv("SERPER_API_KEY"))
+            )
+        ])
     
     async def search(
         self,
@@ -58,61 +211,351 @@ class AsyncSearchCoordinator:
         max_results: int = 10,
         use_cache: bool = True,
         min_citation_count: Optional[int] = None,
-        year_range: Optional[Tuple[int, int]] = None
-    ) -> Dict[str, List[Dict[str, Any]]]:
+        year_range: Optional[Tuple[int, int]] = None,
+        deadline: Optional[float] = None
+    ) -> SearchResults:
         """
         Search across multiple tools and combine results.
         
+        Concurrent searches for the same normalized term and parameters share
+        a single round of API calls. Providers still searching when the
+        deadline expires carry on in the background and cache their results,
+        so a later search picks them up.
+        
         Args:
             term: The search term.
             max_results: Maximum number of results per tool.
             use_cache: Whether to use cached results.
             min_citation_count: Minimum citation count for filtering results.
             year_range: Year range for filtering results (min_year, max_year).
+            deadline: Maximum number of seconds to wait for the providers. If
+                      None, the coordinator's deadline is used.
             
         Returns:
-            Combined search results from all tools.
+            Combined search results from all enabled providers, heaviest first,
+            with the provenance of each provider's results.
         """
+        providers = self.providers.enabled()
+        cache_key = self._get_cache_key(term, max_results, min_citation_count, year_range)
+        
         # Check cache first if enabled
-        if use_cache:
-            cache_key = f"{term}_{max_results}_{min_citation_count}_{year_range}"
-            cached_results = self.cache.get(cache_key)
-            if cached_results:
-                logger.info(f"Using cached results for '{term}'")
-                return cached_results
-        
-        # Run searches in parallel
-        tasks = [
-            self._search_google_scholar(term, max_results),
-            self._search_semantic_scholar(term, max_results, min_citation_count, year_range)
-        ]
+        cached_results = self.cache.get(cache_key) if use_cache else None
+        if cached_results and all(provider.name in cached_results for provider in providers):
+            logger.info(f"Using cached results for '{term}'")
+            return SearchResults(
+                {provider.name: cached_results[provider.name] for provider in providers},
+                {provider.name: "cached" for provider in providers}
+            )
         
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        flight = self._get_flight(
+            term, cache_key, cached_results, use_cache, providers,
+            max_results, min_citation_count, year_range
+        )
         
-        # Process results
-        combined_results: Dict[str, List[Dict[str, Any]]] = {
-            "google_scholar": [],
-            "semantic_scholar": []
-        }
+        if deadline is None:
+            deadline = self.deadline
         
-        # Handle Google Scholar results
-        if isinstance(results[0], list):
-            combined_results["google_scholar"] = results[0]
-        else:
-            logger.error(f"Google Scholar search failed: {str(results[0])}")
+        # Waiting does not cancel the searches, so other callers keep sharing them
+        await asyncio.wait([flight.finished], timeout=deadline)
         
-        # Handle Semantic Scholar results
-        if isinstance(results[1], list):
-            combined_results["semantic_scholar"] = results[1]
-        else:
-            logger.error(f"Semantic Scholar search failed: {str(results[1])}")
+        results = SearchResults()
+        for name, future in flight.sources.items():
+            if future.done():
+                results[name], results.provenance[name] = future.result()
+            else:
+                results[name], results.provenance[name] = [], "timeout"
         
-        # Cache results if enabled
-        if use_cache:
-            cache_key = f"{term}_{max_results}_{min_citation_count}_{year_range}"
-            self.cache.set(cache_key, combined_results)
+        if results.timed_out:
+            logger.warning(
+                f"Search for '{term}' returned partial results after {deadline}s; "
+                f"timed out: {', '.join(results.timed_out)}"
+            )
         
-        return combined_results
+        return results
+    
+    async def search_stream(
+        self,
+        term: str,
+        max_results: int = 10,
+        use_cache: bool = True,
+        min_citation_count: Optional[int] = None,
+        year_range: Optional[Tuple[int, int]] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[Tuple[str, List[Dict[str, Any]]]]:
+        """
+        Search across multiple tools, yielding each tool's results as soon as it finishes.
+        
+        Cached results are yielded first. A failed tool yields an empty list.
+        Leaving the loop early does not cancel the tools still searching; their
+        results are cached as usual.
+        
+        Args:
+            term: The search term.
+            max_results: Maximum number of results per tool.
+            use_cache: Whether to use cached results.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            deadline: Maximum number of seconds to wait for the providers; the
+                      providers that have not finished by then are skipped.
+                      If None, the coordinator's deadline is used.
+            
+        Yields:
+            Tuples of the source name and its results, in completion order.
+        """
+        providers = self.providers.enabled()
+        cache_key = self._get_cache_key(term, max_results, min_citation_count, year_range)
+        
+        # Check cache first if enabled
+        cached_results = self.cache.get(cache_key) if use_cache else None
+        if cached_results and all(provider.name in cached_results for provider in providers):
+            logger.info(f"Using cached results for '{term}'")
+            for provider in providers:
+                yield provider.name, cached_results[provider.name]
+            return
+        
+        flight = self._get_flight(
+            term, cache_key, cached_results, use_cache, providers,
+            max_results, min_citation_count, year_range
+        )
+        order = list(flight.sources)
+        sources = {future: source for source, future in flight.sources.items()}
+        
+        if deadline is None:
+            deadline = self.deadline
+        loop = asyncio.get_running_loop()
+        expires = loop.time() + deadline if deadline is not None else None
+        
+        # Waiting does not cancel the searches, so other callers keep sharing them
+        pending = set(sources)
+        while pending:
+            timeout = max(expires - loop.time(), 0) if expires is not None else None
+            done, pending = await asyncio.wait(
+                pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+            )
+            if not done:
+                logger.warning(
+                    f"Search for '{term}' stopped after {deadline}s; timed out: "
+                    f"{', '.join(sorted((sources[future] for future in pending), key=order.index))}"
+                )
+                return
+            
+            for future in sorted(done, key=lambda done_future: order.index(sources[done_future])):
+                yield sources[future], future.result()[0]
+    
+    def _get_flight(
+        self,
+        term: str,
+        cache_key: str,
+        cached_results: Optional[Dict[str, List[Dict[str, Any]]]],
+        use_cache: bool,
+        providers: List[SearchProvider],
+        max_results: int,
+        min_citation_count: Optional[int],
+        year_range: Optional[Tuple[int, int]]
+    ) -> _SearchFlight:
+        """
+        Join an identical search that is already running, or start a new one.
+        
+        Args:
+            term: The search term.
+            cache_key: The cache key of the search.
+            cached_results: The cached results, if any.
+            use_cache: Whether to cache the results.
+            providers: The providers to search, heaviest first.
+            max_results: Maximum number of results per tool.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            
+        Returns:
+            The search in progress.
+        """
+        flight_key = (cache_key, use_cache, tuple(provider.name for provider in providers))
+        flight = self._in_flight.get(flight_key)
+        if flight is not None:
+            logger.info(f"Joining the search for '{term}' already in progress")
+            return flight
+        
+        # Sources cleared from a cached entry are searched again on their own
+        sources: Dict[str, asyncio.Future] = {}
+        for provider in providers:
+            if cached_results and provider.name in cached_results:
+                sources[provider.name] = asyncio.get_running_loop().create_future()
+                sources[provider.name].set_result((cached_results[provider.name], "cached"))
+            else:
+                sources[provider.name] = asyncio.ensure_future(self._search_provider(
+                    provider, term, max_results, min_citation_count, year_range
+                ))
+        
+        finished = asyncio.ensure_future(self._cache_results(
+            term, cache_key, cached_results, sources, use_cache,
+            max_results, min_citation_count, year_range
+        ))
+        flight = _SearchFlight(sources, finished)
+        self._in_flight[flight_key] = flight
+        finished.add_done_callback(lambda done: self._end_flight(flight_key, flight))
+        
+        return flight
+    
+    def _end_flight(
+        self,
+        flight_key: Tuple[str, bool, Tuple[str, ...]],
+        flight: _SearchFlight
+    ) -> None:
+        """
+        Forget a finished search.
+        
+        Args:
+            flight_key: The cache key, cache setting and providers of the search.
+            flight: The finished search.
+        """
+        if self._in_flight.get(flight_key) is flight:
+            del self._in_flight[flight_key]
+        
+        if not flight.finished.cancelled() and flight.finished.exception() is not None:
+            logger.error(f"Failed to cache search results: {str(flight.finished.exception())}")
+    
+    async def _search_provider(
+        self,
+        provider: SearchProvider,
+        term: str,
+        max_results: int,
+        min_citation_count: Optional[int],
+        year_range: Optional[Tuple[int, int]]
+    ) -> Tuple[List[Dict[str, Any]], str]:
+        """
+        Search a single provider within its timeout, logging failures.
+        
+        Args:
+            provider: The provider.
+            term: The search term.
+            max_results: Maximum number of results.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            
+        Returns:
+            The provider's results and their provenance: "ok", or "failed" or
+            "timeout" with an empty list.
+        """
+        label = provider.name.replace('_', ' ').title()
+        
+        try:
+            result = await asyncio.wait_for(
+                provider.search(term, max_results, min_citation_count, year_range),
+                provider.timeout
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"{label} search timed out after {provider.timeout}s")
+            return [], "timeout"
+        except Exception as e:
+            result = e
+        
+        if not isinstance(result, list):
+            logger.error(f"{label} search failed: {str(result)}")
+            return [], "failed"
+        
+        return result, "ok"
+    
+    async def _cache_results(
+        self,
+        term: str,
+        cache_key: str,
+        cached_results: Optional[Dict[str, List[Dict[str, Any]]]],
+        sources: Dict[str, asyncio.Future],
+        use_cache: bool,
+        max_results: int,
+        min_citation_count: Optional[int],
+        year_range: Optional[Tuple[int, int]]
+    ) -> None:
+        """
+        Wait for every provider of a search and cache the combined results.
+        
+        Providers that timed out are left out, so the next search queries
+        them again.
+        
+        Args:
+            term: The search term.
+            cache_key: The cache key of the search.
+            cached_results: The cached results, if any.
+            sources: The results of each source, cached or still searching.
+            use_cache: Whether to cache the results.
+            max_results: Maximum number of results per tool.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+        """
+        await asyncio.wait(list(sources.values()))
+        
+        searched: Dict[str, List[Dict[str, Any]]] = {}
+        for source, future in sources.items():
+            results, status = future.result()
+            if status in ("ok", "failed"):
+                searched[source] = results
+        
+        # Cache results if enabled, keeping the cached results of other providers
+        if use_cache and searched:
+            self.cache.set(
+                cache_key,
+                {**(cached_results or {}), **searched},
+                namespace="search",
+                term=self._normalize_term(term),
+                params=self._get_cache_params(max_results, min_citation_count, year_range)
+            )
+    
+    def _normalize_term(self, term: str) -> str:
+        """
+        Normalize a search term, so searches differing only in case or
+        whitespace share cache entries.
+        
+        Args:
+            term: The search term.
+            
+        Returns:
+            The normalized term.
+        """
+        return " ".join(term.split()).lower()
+    
+    def _get_cache_key(
+        self,
+        term: str,
+        max_results: int,
+        min_citation_count: Optional[int],
+        year_range: Optional[Tuple[int, int]]
+    ) -> str:
+        """
+        Get the cache key for a search.
+        
+        Args:
+            term: The search term.
+            max_results: Maximum number of results per tool.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            
+        Returns:
+            The cache key.
+        """
+        return f"{self._normalize_term(term)}_{max_results}_{min_citation_count}_{year_range}"
+    
+    def _get_cache_params(
+        self,
+        max_results: int,
+        min_citation_count: Optional[int],
+        year_range: Optional[Tuple[int, int]]
+    ) -> Dict[str, Any]:
+        """
+        Get the search parameters recorded next to a cached search.
+        
+        Args:
+            max_results: Maximum number of results per tool.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            
+        Returns:
+            The parameters.
+        """
+        return {
+            "max_results": max_results,
+            "min_citation_count": min_citation_count,
+            "year_range": list(year_range) if year_range is not None else None
+        }
     
     async def _search_google_scholar(
         self,
@@ -191,13 +634,75 @@ class AsyncSearchCoordinator:
         
         return await self.retry_strategy.execute(_search)
     
+    async def _search_pubmed(
+        self,
+        term: str,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Search PubMed with error handling.
+        
+        Args:
+            term: The search term.
+            max_results: Maximum number of results.
+            
+        Returns:
+            Search results from PubMed.
+        """
+        async def _search():
+            try:
+                # The PubMedSearchTool.search_papers method is synchronous
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None,
+                    lambda: self.pubmed_tool.search_papers(term, max_results)
+                )
+                return results
+            except Exception as e:
+                logger.error(f"Error searching PubMed: {str(e)}")
+                raise
+        
+        return await self.retry_strategy.execute(_search)
+    
+    async def _search_serper_google_scholar(
+        self,
+        term: str,
+        max_results: int
+    ) -> List[Dict[str, Any]]:
+        """
+        Search Google Scholar through the Serper API with error handling.
+        
+        Args:
+            term: The search term.
+            max_results: Maximum number of results.
+            
+        Returns:
+            Search results from Serper's Google Scholar endpoint.
+        """
+        async def _search():
+            try:
+                # The SerperGoogleScholarTool.search_papers method is synchronous
+                loop = asyncio.get_event_loop()
+                results = await loop.run_in_executor(
+                    None,
+                    lambda: self.serper_scholar_tool.search_papers(term, max_results)
+                )
+                return results
+            except Exception as e:
+                logger.error(f"Error searching Serper Google Scholar: {str(e)}")
+                raise
+        
+        return await self.retry_strategy.execute(_search)
+    
     async def search_and_create_papers(
         self,
         term: str,
         max_results: int = 10,
         use_cache: bool = True,
         min_citation_count: Optional[int] = None,
-        year_range: Optional[Tuple[int, int]] = None
+        year_range: Optional[Tuple[int, int]] = None,
+        prefetch: Optional[bool] = None,
+        deadline: Optional[float] = None
     ) -> Dict[str, List[PaperSource]]:
         """
         Search and create PaperSource objects from the results.
@@ -208,51 +713,333 @@ class AsyncSearchCoordinator:
             use_cache: Whether to use cached results.
             min_citation_count: Minimum citation count for filtering results.
             year_range: Year range for filtering results (min_year, max_year).
+            prefetch: Whether to prefetch the papers' PDFs in the background.
+                      If None, the coordinator's prefetch setting is used.
+            deadline: Maximum number of seconds to wait for the providers. If
+                      None, the coordinator's deadline is used.
             
         Returns:
-            Dictionary of PaperSource objects by source.
+            Dictionary of PaperSource objects by source, heaviest provider first.
         """
         results = await self.search(
-            term, max_results, use_cache, min_citation_count, year_range
+            term, max_results, use_cache, min_citation_count, year_range, deadline
         )
         
         papers: Dict[str, List[PaperSource]] = {
-            "google_scholar": [],
-            "semantic_scholar": []
+            source: self._create_papers(source, source_results, term)
+            for source, source_results in results.items()
         }
         
-        # Convert Google Scholar results to PaperSource objects
-        for result in results["google_scholar"]:
-            try:
-                paper = PaperSource.from_google_scholar(result, term)
-                papers["google_scholar"].append(paper)
-            except Exception as e:
-                logger.error(f"Error creating PaperSource from Google Scholar result: {str(e)}")
+        if prefetch if prefetch is not None else self.prefetch:
+            self.start_prefetch([paper for source in papers.values() for paper in source])
+        
+        return papers
+    
+    async def search_and_create_papers_stream(
+        self,
+        term: str,
+        max_results: int = 10,
+        use_cache: bool = True,
+        min_citation_count: Optional[int] = None,
+        year_range: Optional[Tuple[int, int]] = None,
+        prefetch: Optional[bool] = None,
+        deadline: Optional[float] = None
+    ) -> AsyncIterator[PaperSource]:
+        """
+        Search and yield PaperSource objects as each tool finishes.
+        
+        The papers of the fastest tool can be triaged while slower tools are
+        still searching. With prefetching enabled, each tool's papers are
+        prefetched as soon as they arrive.
+        
+        Args:
+            term: The search term.
+            max_results: Maximum number of results per tool.
+            use_cache: Whether to use cached results.
+            min_citation_count: Minimum citation count for filtering results.
+            year_range: Year range for filtering results (min_year, max_year).
+            prefetch: Whether to prefetch the papers' PDFs in the background.
+                      If None, the coordinator's prefetch setting is used.
+            deadline: Maximum number of seconds to wait for the providers. If
+                      None, the coordinator's deadline is used.
+            
+        Yields:
+            PaperSource objects, grouped by source in completion order.
+        """
+        if prefetch is None:
+            prefetch = self.prefetch
+        
+        async for source, results in self.search_stream(
+            term, max_results, use_cache, min_citation_count, year_range, deadline
+        ):
+            papers = self._create_papers(source, results, term)
+            if prefetch:
+                self.start_prefetch(papers)
+            
+            for paper in papers:
+                yield paper
+    
+    def _create_papers(
+        self,
+        source: str,
+        results: List[Dict[str, Any]],
+        term: str
+    ) -> List[PaperSource]:
+        """
+        Create PaperSource objects from a tool's results.
         
-        # Convert Semantic Scholar results to PaperSource objects
-        for result in results["semantic_scholar"]:
+        Args:
+            source: The source name.
+            results: The tool's results.
+            term: The search term.
+            
+        Returns:
+            The PaperSource objects; results that cannot be converted are logged and skipped.
+        """
+        create_paper = self.providers.get(source).create_paper
+        
+        papers = []
+        for result in results:
             try:
-                paper = PaperSource.from_semantic_scholar(result, term)
-                papers["semantic_scholar"].append(paper)
+                papers.append(create_paper(result, term))
             except Exception as e:
-                logger.error(f"Error creating PaperSource from Semantic Scholar result: {str(e)}")
+                logger.error(
+                    f"Error creating PaperSource from {source.replace('_', ' ').title()} result: {str(e)}"
+                )
         
         return papers
     
-    def clear_cache(self, term: Optional[str] = None) -> None:
+    def _get_pdf_processor(self) -> "PDFProcessor":
+        """
+        Get the PDFProcessor used for prefetching, creating it if needed.
+        
+        The created processor shares the PDFProcessorTool's cache directory.
+        The two coordinate through the blob store index and failure ledger on
+        disk, so the tool finds prefetched PDFs without downloading them
+        again. Processors are not shared directly, because the tool's download
+        session lives in a short-lived event loop of its own.
+        
+        Returns:
+            The PDFProcessor.
+        """
+        if self.pdf_processor is None:
+            from crewkb.utils.pdf import PDFProcessor
+            
+            self.pdf_processor = PDFProcessor(cache_dir=DEFAULT_PDF_CACHE_DIR)
+        
+        return self.pdf_processor
+    
+    def _get_remaining_budget(self) -> Tuple[Optional[int], Optional[int]]:
+        """
+        Get what is left of the prefetch budgets.
+        
+        Returns:
+            A tuple containing the number of PDFs and the number of bytes that
+            may still be prefetched, each None if unlimited.
+        """
+        max_downloads = None
+        if self.prefetch_max_downloads is not None:
+            max_downloads = max(self.prefetch_max_downloads - self.prefetch_stats["downloads"], 0)
+        
+        max_bytes = None
+        if self.prefetch_max_bytes is not None:
+            max_bytes = max(self.prefetch_max_bytes - self.prefetch_stats["bytes"], 0)
+        
+        return max_downloads, max_bytes
+    
+    def start_prefetch(self, papers: List[PaperSource]) -> Optional[asyncio.Task]:
+        """
+        Start prefetching the PDFs of papers in the background.
+        
+        The papers are queued behind earlier prefetches, and are downloaded
+        most valuable first until the prefetch budgets run out. The budgets
+        only change when a prefetch finishes, so prefetches run one at a time
+        and overlapping calls cannot each spend the whole budget. Papers
+        without a URL or already prefetched are skipped. Prefetch failures are
+        logged, never raised.
+        
+        Args:
+            papers: The papers to prefetch.
+            
+        Returns:
+            The prefetch task, which finishes once the queue is drained, or None
+            if there is nothing to prefetch.
+        """
+        papers = [
+            paper for paper in {paper.id: paper for paper in papers}.values()
+            if (paper.pdf_url or paper.url) and paper.id not in self._prefetched_ids
+        ]
+        if not papers:
+            return None
+        
+        max_downloads, max_bytes = self._get_remaining_budget()
+        if max_downloads == 0 or max_bytes == 0:
+            logger.info(f"Prefetch budget exhausted; not prefetching {len(papers)} papers")
+            return None
+        
+        self._prefetched_ids.update(paper.id for paper in papers)
+        self._prefetch_queue.append(papers)
+        
+        # A worker left behind by an earlier event loop never runs again
+        worker = self._prefetch_worker
+        if worker is not None and worker.get_loop() is not asyncio.get_running_loop():
+            self.prefetch_tasks.discard(worker)
+            worker = None
+        
+        if worker is None or worker.done():
+            worker = asyncio.create_task(self._drain_prefetch_queue())
+            self._prefetch_worker = worker
+            self.prefetch_tasks.add(worker)
+            worker.add_done_callback(self.prefetch_tasks.discard)
+        
+        return worker
+    
+    async def _drain_prefetch_queue(self) -> None:
+        """
+        Prefetch the queued papers, one start_prefetch call at a time.
+        """
+        while self._prefetch_queue:
+            papers = self._prefetch_queue.popleft()
+            
+            max_downloads, max_bytes = self._get_remaining_budget()
+            if max_downloads == 0 or max_bytes == 0:
+                logger.info(f"Prefetch budget exhausted; not prefetching {len(papers)} papers")
+                self._prefetched_ids.difference_update(paper.id for paper in papers)
+                continue
+            
+            await self._prefetch(papers, max_downloads, max_bytes)
+    
+    async def _prefetch(
+        self,
+        papers: List[PaperSource],
+        max_downloads: Optional[int],
+        max_bytes: Optional[int]
+    ) -> None:
+        """
+        Download, and optionally triage, the PDFs of papers.
+        
+        Args:
+            papers: The papers to prefetch.
+            max_downloads: Maximum number of PDFs to download, or None for no limit.
+            max_bytes: Maximum total size in bytes to download, or None for no limit.
+        """
+        downloaded = []
+        try:
+            processor = self._get_pdf_processor()
+            
+            paths = await processor.download_manager.download_papers(
+                papers,
+                max_downloads=max_downloads,
+                max_bytes=max_bytes
+            )
+            
+            for paper in papers:
+                path = paths.get(paper.id)
+                if path:
+                    downloaded.append(paper)
+                    self.prefetch_stats["downloads"] += 1
+                    self.prefetch_stats["bytes"] += os.path.getsize(path)
+            
+            logger.info(f"Prefetched {len(downloaded)} of {len(papers)} PDFs")
+            
+            if self.prefetch_triage and downloaded:
+                async for _, (markdown_path, _) in processor.process_papers(downloaded, mode="triage"):
+                    if markdown_path:
+                        self.prefetch_stats["triaged"] += 1
+        except Exception as e:
+            logger.error(f"Error prefetching PDFs: {str(e)}")
+        finally:
+            # Papers that were not fetched may be prefetched by a later search
+            fetched = {paper.id for paper in downloaded}
+            self._prefetched_ids.difference_update(
+                paper.id for paper in papers if paper.id not in fetched
+            )
+    
+    async def wait_for_prefetch(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait for the running prefetch tasks to finish.
+        
+        Args:
+            timeout: Maximum number of seconds to wait, or None to wait until done.
+            
+        Returns:
+            True if every prefetch task finished, False if the timeout expired.
+        """
+        if not self.prefetch_tasks:
+            return True
+        
+        _, pending = await asyncio.wait(set(self.prefetch_tasks), timeout=timeout)
+        return not pending
+    
+    async def cancel_prefetch(self) -> None:
+        """
+        Cancel the running prefetch tasks.
+        """
+        tasks = list(self.prefetch_tasks)
+        for task in tasks:
+            task.cancel()
+        
+        await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Queued papers may be prefetched by a later search
+        while self._prefetch_queue:
+            self._prefetched_ids.difference_update(
+                paper.id for paper in self._prefetch_queue.popleft()
+            )
+    
+    def clear_cache(
+        self,
+        term: Optional[str] = None,
+        source: Optional[str] = None,
+        older_than: Optional[float] = None
+    ) -> int:
         """
         Clear the search cache.
         
+        Cached searches are found through the search term and creation time
+        stored with them, so only matching entries are touched. Clearing a
+        source drops only that source's results from the matching entries; the
+        next search for them queries that source again.
+        
         Args:
-            term: The search term to clear, or None to clear all.
+            term: The search term to clear, or None for every term.
+            source: The name of the provider to clear, or None for every source.
+            older_than: Only clear searches cached more than this many seconds
+                        ago, or None for every age.
+            
+        Returns:
+            The number of cached searches cleared or updated.
         """
-        if term is not None:
-            # Clear specific term
-            for max_results in [10, 20, 50]:  # Common max_results values
-                for min_citation_count in [None, 10, 50, 100]:  # Common min_citation_count values
-                    for year_range in [None, (2010, 2023), (2015, 2023), (2020, 2023)]:  # Common year_range values
-                        cache_key = f"{term}_{max_results}_{min_citation_count}_{year_range}"
-                        self.cache.clear(cache_key)
-        else:
+        if source is not None:
+            # Raises a ValueError for unknown providers
+            self.providers.get(source)
+        
+        if term is None and source is None and older_than is None:
             # Clear all
+            cleared = self.cache.get_size()
             self.cache.clear()
+            return cleared
+        
+        if term is not None:
+            term = self._normalize_term(term)
+        
+        cleared = 0
+        for cache_key in self.cache.find(term=term, older_than=older_than):
+            if source is None:
+                self.cache.clear(cache_key)
+                cleared += 1
+                continue
+            
+            record = self.cache.get_record(cache_key)
+            if record is None or not isinstance(record.value, dict) or source not in record.value:
+                continue
+            
+            results = {name: value for name, value in record.value.items() if name != source}
+            if results:
+                self.cache.replace(cache_key, results)
+            else:
+                self.cache.clear(cache_key)
+            cleared += 1
+        
+        logger.info(f"Cleared {cleared} cached searches")
+        return cleared
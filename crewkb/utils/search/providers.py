@@ -0,0 +1,203 @@
+"""
+Search providers for CrewKB.
+
+This module provides the registry of search providers queried by the
+AsyncSearchCoordinator. Each provider has a weight, which orders its results
+relative to the other providers, a timeout and an enable flag.
+"""
+
+from typing import Dict, List, Optional, Any, Tuple, Callable, Awaitable, Iterator
+
+from crewkb.models.knowledge.paper import PaperSource
+
+# Searches a provider given the term, maximum number of results, minimum
+# citation count and year range
+SearchFunction = Callable[
+    [str, int, Optional[int], Optional[Tuple[int, int]]],
+    Awaitable[List[Dict[str, Any]]]
+]
+
+# Creates a PaperSource from a provider's result and the search term
+PaperFactory = Callable[[Dict[str, Any], str], PaperSource]
+
+
+def create_paper_from_result(result: Dict[str, Any], term: str, source_tool: str) -> PaperSource:
+    """
+    Create a PaperSource from a result using PaperSource's field names.
+    
+    Args:
+        result: The result, with at least a title.
+        term: The search term.
+        source_tool: The name of the provider that found the result.
+        
+    Returns:
+        The PaperSource.
+    """
+    return PaperSource(
+        title=result["title"],
+        authors=result.get("authors") or [],
+        year=result.get("year"),
+        journal=result.get("journal"),
+        url=result.get("url"),
+        pdf_url=result.get("pdf_url"),
+        citation_count=result.get("citation_count"),
+        abstract=result.get("abstract"),
+        source_tool=source_tool,
+        search_term=term
+    )
+
+
+class SearchProvider:
+    """
+    A search source queried by the AsyncSearchCoordinator.
+    
+    The weight, timeout and enable flag can be changed between searches.
+    """
+    
+    def __init__(
+        self,
+        name: str,
+        search: SearchFunction,
+        create_paper: Optional[PaperFactory] = None,
+        weight: float = 1.0,
+        timeout: Optional[float] = None,
+        enabled: bool = True
+    ):
+        """
+        Initialize the SearchProvider.
+        
+        Args:
+            name: The provider's name, used as its key in search results.
+            search: The function searching the provider.
+            create_paper: The function creating a PaperSource from one of the
+                          provider's results. If None, the results must use
+                          PaperSource's field names.
+            weight: The provider's weight; results of heavier providers are
+                    listed, and so triaged and prefetched, first.
+            timeout: Maximum number of seconds a search may take, or None for
+                     no limit.
+            enabled: Whether the provider is searched.
+        """
+        if weight < 0:
+            raise ValueError(f"Weight of provider {name} must not be negative, got {weight}")
+        
+        self.name = name
+        self.search = search
+        self.create_paper = create_paper or (
+            lambda result, term: create_paper_from_result(result, term, name)
+        )
+        self.weight = weight
+        self.timeout = timeout
+        self.enabled = enabled
+    
+    def __repr__(self) -> str:
+        return (
+            f"SearchProvider({self.name!r}, weight={self.weight}, "
+            f"timeout={self.timeout}, enabled={self.enabled})"
+        )
+
+
+class ProviderRegistry:
+    """
+    Registry of search providers.
+    
+    Providers are kept in registration order, which breaks ties between
+    providers of equal weight.
+    """
+    
+    def __init__(self, providers: Optional[List[SearchProvider]] = None):
+        """
+        Initialize the ProviderRegistry.
+        
+        Args:
+            providers: The providers to register.
+        """
+        self._providers: Dict[str, SearchProvider] = {}
+        for provider in providers or []:
+            self.register(provider)
+    
+    def register(self, provider: SearchProvider, replace: bool = False) -> None:
+        """
+        Register a provider.
+        
+        Args:
+            provider: The provider.
+            replace: Whether to replace a provider registered under the same name.
+            
+        Raises:
+            ValueError: If a provider with the same name is registered and
+                        replace is False.
+        """
+        if provider.name in self._providers and not replace:
+            raise ValueError(f"Provider {provider.name} is already registered")
+        
+        self._providers[provider.name] = provider
+    
+    def unregister(self, name: str) -> SearchProvider:
+        """
+        Unregister a provider.
+        
+        Args:
+            name: The provider's name.
+            
+        Returns:
+            The unregistered provider.
+        """
+        provider = self.get(name)
+        del self._providers[name]
+        return provider
+    
+    def get(self, name: str) -> SearchProvider:
+        """
+        Get a provider.
+        
+        Args:
+            name: The provider's name.
+            
+        Returns:
+            The provider.
+            
+        Raises:
+            ValueError: If no provider is registered under the name.
+        """
+        if name not in self._providers:
+            raise ValueError(f"Unknown provider {name}, expected one of {tuple(self._providers)}")
+        
+        return self._providers[name]
+    
+    def enable(self, name: str) -> None:
+        """
+        Enable a provider.
+        
+        Args:
+            name: The provider's name.
+        """
+        self.get(name).enabled = True
+    
+    def disable(self, name: str) -> None:
+        """
+        Disable a provider.
+        
+        Args:
+            name: The provider's name.
+        """
+        self.get(name).enabled = False
+    
+    def enabled(self) -> List[SearchProvider]:
+        """
+        Get the enabled providers.
+        
+        Returns:
+            The enabled providers, heaviest first.
+        """
+        providers = [provider for provider in self._providers.values() if provider.enabled]
+        return sorted(providers, key=lambda provider: -provider.weight)
+    
+    def __contains__(self, name: object) -> bool:
+        return name in self._providers
+    
+    def __iter__(self) -> Iterator[SearchProvider]:
+        return iter(list(self._providers.values()))
+    
+    def __len__(self) -> int:
+        return len(self._providers)
@@ -0,0 +1,267 @@
+"""
+Section indexing for CrewKB.
+
+This module provides a single-pass engine that splits markdown into sections.
+The section markers are compiled once into a combined regular expression, the
+text is scanned once for heading lines, and sections are returned as offsets
+into the text so callers only copy the sections they use.
+"""
+
+import re
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+# Heading patterns are matched at the start of each line and must not match
+# across newlines
+
+# Lines starting with "#", e.g. "## Methods"
+MARKDOWN_HEADING_PATTERN = r"#[^\n]*"
+
+# Level 1 and 2 headings only, optionally indented, e.g. "# Overview"
+TOP_HEADING_PATTERN = r"[^\S\n]*#{1,2} [^\S\n]*\S[^\n]*"
+
+# Standard paper sections and the headings that introduce them, in priority
+# order: a heading matching several sections belongs to the first one
+PAPER_SECTION_MARKERS = {
+    "abstract": ["abstract", "summary"],
+    "introduction": ["introduction", "background"],
+    "methods": ["methods", "methodology", "materials and methods"],
+    "results": ["results", "findings"],
+    "discussion": ["discussion"],
+    "conclusion": ["conclusion", "conclusions"],
+    "references": ["references", "bibliography"]
+}
+
+
+class SectionSpan(NamedTuple):
+    """
+    Location of a section within a text.
+
+    The heading line spans ``start`` to ``body_start`` and the section ends at
+    ``end``, just before the newline preceding the next section.
+    """
+
+    name: str
+    start: int
+    body_start: int
+    end: int
+
+
+class SectionIndexer:
+    """
+    Splits text into sections in a single pass.
+
+    A section starts at a heading line and runs until the next heading line
+    that starts a section. Heading lines are found either with a heading
+    pattern or, if no pattern is given, as any line containing a marker.
+
+    This class provides:
+    - Section markers compiled once into a combined regular expression
+    - Marker priorities, so a heading matching several sections belongs to
+      the first section listed
+    - Section offsets, with helpers to copy out sections on demand
+    """
+
+    def __init__(
+        self,
+        section_markers: Optional[Dict[str, Sequence[str]]] = None,
+        heading_pattern: Optional[str] = MARKDOWN_HEADING_PATTERN
+    ):
+        """
+        Initialize the SectionIndexer.
+
+        Args:
+            section_markers: A dictionary mapping section names to the
+                             substrings that identify their headings, matched
+                             case-insensitively. If None, every heading starts
+                             a section named after the heading text.
+            heading_pattern: A regular expression matching heading lines from
+                             their first character. If None, every line
+                             containing a marker is a heading.
+        """
+        if section_markers is None and heading_pattern is None:
+            raise ValueError("Either section markers or a heading pattern is required")
+
+        # Headings are searched for after a newline rather than with a
+        # multiline "^", which lets the regex engine skip ahead to each newline
+        self.first_heading_regex = None
+        self.heading_regex = None
+        if heading_pattern:
+            self.first_heading_regex = re.compile(heading_pattern)
+            self.heading_regex = re.compile(f"\n(?:{heading_pattern})")
+
+        # One capturing group per section, in priority order. The lookahead
+        # makes the scan report matches at every position, including ones
+        # that overlap a lower-priority marker.
+        self.section_names: List[str] = []
+        self.marker_regex = None
+        if section_markers is not None:
+            groups = []
+            for name, markers in section_markers.items():
+                if not markers:
+                    continue
+                self.section_names.append(name)
+                alternatives = sorted(markers, key=len, reverse=True)
+                groups.append("(" + "|".join(re.escape(marker) for marker in alternatives) + ")")
+
+            if groups:
+                self.marker_regex = re.compile(
+                    "(?=" + "|".join(groups) + ")", re.IGNORECASE
+                )
+
+    def _match_section(self, text: str, pos: int = 0, endpos: Optional[int] = None) -> Optional[str]:
+        """
+        Find the highest-priority section whose marker occurs in part of a text.
+
+        Args:
+            text: The text to search.
+            pos: The position to start searching at.
+            endpos: The position to stop searching at. If None, the end of the text.
+
+        Returns:
+            The section name, or None if no marker occurs.
+        """
+        if self.marker_regex is None:
+            return None
+
+        if endpos is None:
+            endpos = len(text)
+
+        best = None
+        for match in self.marker_regex.finditer(text, pos, endpos):
+            if best is None or match.lastindex < best:
+                best = match.lastindex
+                if best == 1:
+                    break
+
+        return self.section_names[best - 1] if best is not None else None
+
+    def _headings(self, text: str):
+        """
+        Find the heading lines that start sections.
+
+        Args:
+            text: The text to scan.
+
+        Yields:
+            Tuples of the section name and the start and end of the heading line.
+        """
+        if self.heading_regex is not None:
+            first = self.first_heading_regex.match(text)
+            matches = self.heading_regex.finditer(text)
+
+            for match in ([first] if first else []) + list(matches):
+                # Skip the newline the match starts with
+                start = match.start() if match is first else match.start() + 1
+
+                title = text[start:match.end()].strip().lstrip("#").strip()
+                if self.marker_regex is None:
+                    name = title
+                else:
+                    name = self._match_section(title)
+                if name is not None:
+                    yield name, start, match.end()
+            return
+
+        if self.marker_regex is None:
+            return
+
+        # Without a heading pattern, scan for markers and expand each match to its line
+        pos = 0
+        while True:
+            match = self.marker_regex.search(text, pos)
+            if match is None:
+                return
+
+            line_start = text.rfind("\n", 0, match.start()) + 1
+            line_end = text.find("\n", match.start())
+            if line_end == -1:
+                line_end = len(text)
+
+            yield self._match_section(text, match.start(), line_end), line_start, line_end
+            pos = line_end + 1
+
+    def index(self, text: str) -> List[SectionSpan]:
+        """
+        Locate the sections of a text.
+
+        Text before the first heading does not belong to any section.
+
+        Args:
+            text: The text to index.
+
+        Returns:
+            The sections in the order they appear.
+        """
+        headings = list(self._headings(text))
+
+        spans = []
+        for i, (name, start, line_end) in enumerate(headings):
+            end = headings[i + 1][1] - 1 if i + 1 < len(headings) else len(text)
+            body_start = min(line_end + 1, len(text))
+            spans.append(SectionSpan(name, start, body_start, end))
+
+        return spans
+
+    def extract(self, text: str, include_heading: bool = True) -> Dict[str, str]:
+        """
+        Split a text into sections.
+
+        Args:
+            text: The text to split.
+            include_heading: Whether each section's content starts with its heading line.
+
+        Returns:
+            A dictionary mapping section names to section content. If a section
+            occurs more than once, its last occurrence is kept.
+        """
+        sections = {}
+        for span in self.index(text):
+            start = span.start if include_heading else span.body_start
+            sections[span.name] = text[start:span.end]
+
+        return sections
+
+
+@lru_cache(maxsize=32)
+def _cached_indexer(
+    section_markers: Optional[Tuple[Tuple[str, Tuple[str, ...]], ...]],
+    heading_pattern: Optional[str]
+) -> SectionIndexer:
+    """
+    Build a SectionIndexer from hashable settings.
+
+    Args:
+        section_markers: The section markers as a tuple of (name, markers) pairs.
+        heading_pattern: The heading pattern.
+
+    Returns:
+        The SectionIndexer.
+    """
+    markers = None
+    if section_markers is not None:
+        markers = {name: list(values) for name, values in section_markers}
+    return SectionIndexer(markers, heading_pattern)
+
+
+def get_section_indexer(
+    section_markers: Optional[Dict[str, Sequence[str]]] = None,
+    heading_pattern: Optional[str] = MARKDOWN_HEADING_PATTERN
+) -> SectionIndexer:
+    """
+    Get a compiled SectionIndexer, reusing one built for the same settings.
+
+    Args:
+        section_markers: A dictionary mapping section names to the substrings
+                         that identify their headings. If None, every heading
+                         starts a section named after the heading text.
+        heading_pattern: A regular expression matching heading lines. If None,
+                         every line containing a marker is a heading.
+
+    Returns:
+        The SectionIndexer.
+    """
+    key = None
+    if section_markers is not None:
+        key = tuple((name, tuple(markers)) for name, markers in section_markers.items())
+    return _cached_indexer(key, heading_pattern)
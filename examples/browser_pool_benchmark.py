@@ -0,0 +1,127 @@
+"""
+Example script comparing cold-launch and warm-pool page latency.
+
+This script crawls the same URLs twice: once launching a fresh
+AsyncWebCrawler per page (how the crawl4ai-based tools used to work) and once
+leasing warm browsers from the shared BrowserPool.
+"""
+
+import asyncio
+import logging
+import statistics
+import sys
+import time
+from typing import List
+
+from crawl4ai import AsyncWebCrawler
+from crawl4ai.async_configs import BrowserConfig, CrawlerRunConfig, CacheMode
+
+from crewkb.utils.browser_pool import BrowserPool
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DEFAULT_URLS = [
+    "https://example.com",
+    "https://www.iana.org/help/example-domains",
+]
+
+
+async def cold_latencies(urls: List[str], rounds: int) -> List[float]:
+    """
+    Measure page latency when every page launches its own browser.
+
+    Args:
+        urls: The URLs to crawl.
+        rounds: How many times to crawl each URL.
+
+    Returns:
+        The per-page latencies in seconds.
+    """
+    browser_config = BrowserConfig(headless=True)
+    run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    latencies = []
+    for _ in range(rounds):
+        for url in urls:
+            start_time = time.perf_counter()
+            async with AsyncWebCrawler(config=browser_config) as crawler:
+                await crawler.arun(url=url, config=run_config)
+            latencies.append(time.perf_counter() - start_time)
+
+    return latencies
+
+
+async def warm_latencies(
+    pool: BrowserPool,
+    urls: List[str],
+    rounds: int
+) -> List[float]:
+    """
+    Measure page latency when pages are served by a warm browser pool.
+
+    Args:
+        pool: The warmed-up browser pool.
+        urls: The URLs to crawl.
+        rounds: How many times to crawl each URL.
+
+    Returns:
+        The per-page latencies in seconds.
+    """
+    run_config = CrawlerRunConfig(cache_mode=CacheMode.BYPASS)
+
+    latencies = []
+    for _ in range(rounds):
+        for url in urls:
+            start_time = time.perf_counter()
+            await pool.arun(url=url, config=run_config)
+            latencies.append(time.perf_counter() - start_time)
+
+    return latencies
+
+
+def summarize(label: str, latencies: List[float]) -> None:
+    """
+    Log a latency summary.
+
+    Args:
+        label: The label for the measurement.
+        latencies: The per-page latencies in seconds.
+    """
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    logger.info(
+        f"{label}: n={len(latencies)} "
+        f"mean={statistics.mean(latencies):.3f}s "
+        f"median={statistics.median(latencies):.3f}s "
+        f"p95={p95:.3f}s"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    urls = sys.argv[1:] or DEFAULT_URLS
+    rounds = 3
+
+    summarize("cold launch", asyncio.run(cold_latencies(urls, rounds)))
+
+    pool = BrowserPool(size=1, browser_config=BrowserConfig(headless=True))
+    try:
+        pool.warmup()
+        summarize("warm pool", asyncio.run(warm_latencies(pool, urls, rounds)))
+        stats = pool.get_stats()
+        logger.info(
+            f"Pool launches={stats['launches']} "
+            f"avg_launch={stats['avg_launch_seconds']:.3f}s "
+            f"avg_page={stats['avg_page_seconds']:.3f}s"
+        )
+    finally:
+        pool.close()
+
+
+if __name__ == "__main__":
+    main()
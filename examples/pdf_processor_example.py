@@ -26,15 +26,13 @@ async def test_pdf_download_manager():
     # Create the cache directory if it doesn't exist
     os.makedirs("examples/pdf_cache", exist_ok=True)
     
-    # Create a download manager
-    download_manager = PDFDownloadManager(cache_dir="examples/pdf_cache/downloads")
-    
     # Define a PDF URL to download
     pdf_url = "https://arxiv.org/pdf/2303.08774.pdf"  # "GPT-4 Technical Report"
     
-    # Download the PDF
-    logger.info(f"Downloading PDF from {pdf_url}...")
-    pdf_path = await download_manager.download(pdf_url)
+    # Download the PDF, sharing one pooled session for the manager's lifetime
+    async with PDFDownloadManager(cache_dir="examples/pdf_cache/downloads") as download_manager:
+        logger.info(f"Downloading PDF from {pdf_url}...")
+        pdf_path = await download_manager.download(pdf_url)
     
     if pdf_path:
         logger.info(f"Downloaded PDF to {pdf_path}")
@@ -148,14 +146,15 @@ async def test_batch_processing():
     
     # Process the papers
     logger.info(f"Processing {len(papers)} papers...")
-    results = await processor.process_papers(
+    results = {}
+    
+    # Print the results as each paper finishes
+    async for paper_id, (markdown_path, sections) in processor.process_papers(
         papers,
         output_dir="examples/pdf_cache/papers",
         max_concurrent=2
-    )
-    
-    # Print the results
-    for paper_id, (markdown_path, sections) in results.items():
+    ):
+        results[paper_id] = (markdown_path, sections)
         if markdown_path:
             logger.info(f"Processed paper {paper_id} to {markdown_path}")
             logger.info(f"Extracted {len(sections)} sections")
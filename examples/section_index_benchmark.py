@@ -0,0 +1,157 @@
+"""
+Example script comparing line-by-line and single-pass section extraction.
+
+This script splits synthetic 1 MB markdown papers into sections twice: once
+with the line-by-line loop MarkerWrapper.extract_sections used to run, which
+checks every marker against every heading, and once with the compiled
+SectionIndexer.
+"""
+
+import logging
+import random
+import statistics
+import time
+from typing import Callable, Dict, List
+
+from crewkb.utils.section_index import PAPER_SECTION_MARKERS, get_section_indexer
+
+# Set up logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+)
+logger = logging.getLogger(__name__)
+
+DOCUMENT_BYTES = 1024 * 1024
+
+HEADINGS = [
+    "## Abstract", "## Introduction", "### Study population", "## Materials and Methods",
+    "### Statistical analysis", "## Results", "### Table 2", "## Discussion",
+    "### Limitations", "## Conclusions", "## References"
+]
+
+
+def make_document(rng: random.Random, size: int = DOCUMENT_BYTES) -> str:
+    """
+    Build a synthetic markdown paper.
+
+    Args:
+        rng: The random number generator.
+        size: The approximate size of the document in characters.
+
+    Returns:
+        The markdown.
+    """
+    words = ["patients", "results", "the", "biomarker", "significant", "of", "methods", "cohort"]
+    lines = []
+    length = 0
+    while length < size:
+        if rng.random() < 0.02:
+            line = rng.choice(HEADINGS)
+        else:
+            line = " ".join(rng.choice(words) for _ in range(rng.randint(5, 20)))
+        lines.append(line)
+        length += len(line) + 1
+
+    return "\n".join(lines)
+
+
+def line_by_line_sections(markdown: str) -> Dict[str, str]:
+    """
+    Split markdown into sections with the former line-by-line loop.
+
+    Args:
+        markdown: The markdown.
+
+    Returns:
+        A dictionary mapping section names to section content.
+    """
+    sections = {}
+    current_section = None
+    current_content = []
+
+    for line in markdown.split("\n"):
+        if line.startswith("#"):
+            heading_text = line.lstrip("#").strip().lower()
+
+            matched_section = None
+            for section, markers in PAPER_SECTION_MARKERS.items():
+                if any(marker in heading_text for marker in markers):
+                    matched_section = section
+                    break
+
+            if matched_section:
+                if current_section:
+                    sections[current_section] = "\n".join(current_content)
+                current_section = matched_section
+                current_content = [line]
+            elif current_section:
+                current_content.append(line)
+        elif current_section:
+            current_content.append(line)
+
+    if current_section:
+        sections[current_section] = "\n".join(current_content)
+
+    return sections
+
+
+def measure(extract: Callable[[str], object], documents: List[str], rounds: int) -> List[float]:
+    """
+    Measure extraction latency.
+
+    Args:
+        extract: The extraction function.
+        documents: The documents to split.
+        rounds: How many times to split each document.
+
+    Returns:
+        The per-document latencies in seconds.
+    """
+    latencies = []
+    for _ in range(rounds):
+        for document in documents:
+            start_time = time.perf_counter()
+            extract(document)
+            latencies.append(time.perf_counter() - start_time)
+
+    return latencies
+
+
+def summarize(label: str, latencies: List[float]) -> None:
+    """
+    Log a latency summary.
+
+    Args:
+        label: The label for the measurement.
+        latencies: The per-document latencies in seconds.
+    """
+    ordered = sorted(latencies)
+    p95 = ordered[max(0, int(len(ordered) * 0.95) - 1)]
+    logger.info(
+        f"{label}: n={len(latencies)} "
+        f"mean={statistics.mean(latencies) * 1000:.2f}ms "
+        f"median={statistics.median(latencies) * 1000:.2f}ms "
+        f"p95={p95 * 1000:.2f}ms"
+    )
+
+
+def main() -> None:
+    """Run the benchmark."""
+    rng = random.Random(0)
+    documents = [make_document(rng) for _ in range(5)]
+    rounds = 5
+
+    indexer = get_section_indexer(PAPER_SECTION_MARKERS)
+
+    # Both implementations must agree before their timings mean anything
+    for document in documents:
+        assert indexer.extract(document) == line_by_line_sections(document)
+
+    summarize("line by line", measure(line_by_line_sections, documents, rounds))
+    summarize("single pass, extract", measure(indexer.extract, documents, rounds))
+    summarize("single pass, offsets only", measure(indexer.index, documents, rounds))
+
+
+if __name__ == "__main__":
+    main()